@@ -0,0 +1,29 @@
+"""
+Standalone benchmarks for Tick.
+
+Run them from the `tick_project` directory with the same environment as the
+app (SECRET_KEY must be set), for example:
+
+    python -m benchmarks.cache --processes 4
+"""
+import os
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tick_project.settings")
+    import django
+    django.setup()
+
+def percentile(values, percent):
+    """Return the `percent` percentile of `values` (nearest-rank)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def print_table(headers, rows):
+    widths = [max(len(str(value)) for value in column) for column in zip(headers, *rows)]
+    line = "  ".join(f"{{:>{width}}}" for width in widths)
+    print(line.format(*headers))
+    for row in rows:
+        print(line.format(*row))
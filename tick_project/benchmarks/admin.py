@@ -0,0 +1,98 @@
+"""
+Admin changelists on large tables.
+
+Builds an in-memory SQLite database with SESSIONS sessions spread over three
+years (tasks of 100 sessions, projects of 100 tasks) and a staff user, then
+times GET requests for the session and task changelists with Django's test
+client. For comparison it also times the queries Django's default changelist
+would run for the session list: the full COUNT(*) and the distinct years of
+the date hierarchy.
+
+    python -m benchmarks.admin
+    python -m benchmarks.admin --sessions 1000000
+"""
+import argparse
+import time
+from datetime import timedelta
+
+from . import percentile, print_table, setup_django
+
+def create_database(sessions):
+    from django.contrib.auth import get_user_model
+    from django.db import connection, transaction
+    from django.utils import timezone
+    from tracker.models import Project, Session, Task
+
+    connection.creation.create_test_db(verbosity=0)
+    now = timezone.now()
+    step = timedelta(days=3 * 365) / sessions
+    with transaction.atomic():
+        staff = get_user_model().objects.create_superuser(email="admin@example.com", password="benchmark")
+        user = get_user_model().objects.create_user(email="admin-benchmark@example.com", password="benchmark")
+        projects = Project.objects.bulk_create(Project(user=user, name=f"Project {number}") for number in range(sessions // 10000 + 1))
+        tasks = Task.objects.bulk_create(
+            (Task(project=projects[number // 100], name=f"Task {number}", is_done=number % 3 == 0) for number in range(sessions // 100 + 1)),
+            batch_size=5000,
+        )
+        Session.objects.bulk_create(
+            (Session(task=tasks[number // 100], start_time=now - step * number, end_time=now - step * number + step / 2) for number in range(sessions)),
+            batch_size=5000,
+        )
+    return staff
+
+def timed(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=300000)
+    parser.add_argument("--repeat", type=int, default=10)
+    options = parser.parse_args()
+    setup_django()
+
+    from django.db.models.functions import TruncYear
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+    from django.utils import timezone
+    from tracker.models import Session
+
+    setup_test_environment()
+    staff = create_database(options.sessions)
+    client = Client()
+    client.force_login(staff)
+    sessions = reverse("admin:tracker_session_changelist")
+    year = timezone.now().year - 1
+    pages = {
+        "sessions": (sessions, {}),
+        "sessions, page 50": (sessions, {"p": 50}),
+        "sessions, one year": (sessions, {"start_time__year": year}),
+        "sessions, one month": (sessions, {"start_time__year": year, "start_time__month": 6}),
+        "sessions, running": (sessions, {"running": "yes"}),
+        "tasks": (reverse("admin:tracker_task_changelist"), {}),
+        "tasks, done": (reverse("admin:tracker_task_changelist"), {"is_done__exact": 1}),
+    }
+    rows = []
+    for name, (url, params) in pages.items():
+        client.get(url, params)
+        timings = timed(lambda: client.get(url, params), options.repeat)
+        rows.append((name, f"{percentile(timings, 50) * 1000:.1f}", f"{percentile(timings, 95) * 1000:.1f}"))
+
+    default_queries = {
+        "default: COUNT(*)": lambda: Session.objects.count(),
+        "default: distinct years": lambda: list(Session.objects.annotate(year=TruncYear("start_time")).values("year").distinct()),
+    }
+    for name, query in default_queries.items():
+        timings = timed(query, options.repeat)
+        rows.append((name, f"{percentile(timings, 50) * 1000:.1f}", f"{percentile(timings, 95) * 1000:.1f}"))
+
+    print(f"{options.sessions} sessions\n")
+    print_table(("", "p50 ms", "p95 ms"), rows)
+
+if __name__ == "__main__":
+    main()
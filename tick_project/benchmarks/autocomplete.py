@@ -0,0 +1,110 @@
+"""
+Task autocomplete latency.
+
+Builds an in-memory SQLite database with one user holding TASKS pending tasks
+in 20 projects and SESSIONS sessions, then reports:
+  - build: building the user's index from the database (first lookup)
+  - lookup: `autocomplete.suggest` on a built index, per query length
+  - endpoint: GET tracker:task-autocomplete through the whole middleware
+    stack with Django's test client, logged in as the user
+
+    python -m benchmarks.autocomplete
+    python -m benchmarks.autocomplete --tasks 20000 --sessions 500000
+"""
+import argparse
+import random
+import time
+from datetime import timedelta
+
+from . import percentile, print_table, setup_django
+from .search import vocabulary
+
+def create_user(tasks, sessions, rng):
+    from django.contrib.auth import get_user_model
+    from django.db import connection, transaction
+    from django.utils import timezone
+    from tracker.models import Project, Session, Task
+
+    connection.creation.create_test_db(verbosity=0)
+    words = vocabulary(rng, 2000)
+    now = timezone.now()
+    with transaction.atomic():
+        user = get_user_model().objects.create_user(email="autocomplete@example.com", password="benchmark")
+        projects = Project.objects.bulk_create(Project(user=user, name=" ".join(rng.sample(words, 2))) for _ in range(20))
+        task_list = Task.objects.bulk_create(
+            (Task(project=projects[number % 20], name=" ".join(rng.sample(words, rng.randint(2, 4)))) for number in range(tasks)),
+            batch_size=5000,
+        )
+        Session.objects.bulk_create(
+            (Session(
+                task=rng.choice(task_list),
+                start_time=now - timedelta(minutes=30 * number + 20),
+                end_time=now - timedelta(minutes=30 * number),
+            ) for number in range(sessions)),
+            batch_size=5000,
+        )
+    return user, words
+
+def timed(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def row(name, timings):
+    return (name, f"{percentile(timings, 50) * 1000:.2f}", f"{percentile(timings, 99) * 1000:.2f}", len(timings))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--sessions", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=200)
+    options = parser.parse_args()
+    setup_django()
+
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+    from tracker import autocomplete
+
+    setup_test_environment()
+    rng = random.Random(0)
+    user, words = create_user(options.tasks, options.sessions, rng)
+
+    def build():
+        autocomplete.clear()
+        autocomplete.suggest(user, "")
+    rows = [row("build", timed(build, 5))]
+
+    queries = [word[:length] for word in rng.sample(words, options.repeat) for length in (1, 3)]
+    queries += [f"{rng.choice(words)[:4]} {rng.choice(words)[:2]}" for _ in range(options.repeat)]
+    for name, selected in (
+        ("lookup, 1 letter", [query for query in queries if len(query) == 1]),
+        ("lookup, 3 letters", [query for query in queries if len(query) == 3]),
+        ("lookup, two words", [query for query in queries if " " in query]),
+    ):
+        timings = []
+        for query in selected:
+            started = time.perf_counter()
+            autocomplete.suggest(user, query)
+            timings.append(time.perf_counter() - started)
+        rows.append(row(name, timings))
+
+    client = Client()
+    client.force_login(user)
+    url = reverse("tracker:task-autocomplete")
+    client.get(url)
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        client.get(url, {"q": query})
+        timings.append(time.perf_counter() - started)
+    rows.append(row("endpoint", timings))
+
+    print(f"{options.tasks} tasks, {options.sessions} sessions\n")
+    print_table(("", "p50 ms", "p99 ms", "n"), rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Cross-process latency of the shared SQLite cache backend.
+
+Several processes read and write the same cache file at once, the way gunicorn
+workers on one host do. LocMemCache (not shared between processes) is measured
+in a single process for reference.
+
+    python -m benchmarks.cache --processes 4 --ops 5000
+"""
+import argparse
+import multiprocessing
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.cache.backends.locmem import LocMemCache
+
+from tick_project.cache import SQLiteCache
+from . import percentile, print_table
+
+def run_worker(backend, location, ops, keys, value_size, write_ratio, start_at):
+    if backend == "sqlite":
+        cache = SQLiteCache(location, {"OPTIONS": {"MAX_BYTES": 256 * 1024 * 1024}})
+    else:
+        cache = LocMemCache(location, {"OPTIONS": {"MAX_ENTRIES": keys * 2}})
+    value = "x" * value_size
+    rng = random.Random()
+    latencies = {"get": [], "set": []}
+
+    # start every process at the same moment so their operations overlap
+    time.sleep(max(0, start_at - time.time()))
+    for _ in range(ops):
+        key = f"key-{rng.randrange(keys)}"
+        if rng.random() < write_ratio:
+            started = time.perf_counter()
+            cache.set(key, value)
+            latencies["set"].append(time.perf_counter() - started)
+        else:
+            started = time.perf_counter()
+            cache.get(key)
+            latencies["get"].append(time.perf_counter() - started)
+    return latencies
+
+def measure(backend, location, processes, options):
+    args = (backend, location, options.ops, options.keys, options.value_size, options.write_ratio, time.time() + 0.5)
+    with multiprocessing.get_context("fork").Pool(processes) as pool:
+        started = time.perf_counter()
+        results = pool.starmap(run_worker, [args] * processes)
+        elapsed = time.perf_counter() - started - 0.5
+
+    rows = []
+    for operation in ("get", "set"):
+        latencies = [latency for result in results for latency in result[operation]]
+        rows.append((
+            backend,
+            processes,
+            operation,
+            len(latencies),
+            f"{len(latencies) / elapsed:,.0f}",
+            f"{percentile(latencies, 50) * 1e6:.0f}",
+            f"{percentile(latencies, 95) * 1e6:.0f}",
+            f"{percentile(latencies, 99) * 1e6:.0f}",
+        ))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=5000, help="operations per process")
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--value-size", type=int, default=1024, help="bytes per cached value")
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        location = str(Path(tmp_dir) / "cache.sqlite3")
+        rows = measure("locmem", "benchmark", 1, options)
+        rows += measure("sqlite", location, 1, options)
+        rows += measure("sqlite", location, options.processes, options)
+
+    print_table(("backend", "procs", "op", "count", "ops/s", "p50 µs", "p95 µs", "p99 µs"), rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Dashboard time to first byte and time to interactive, against a running server.
+
+Seeds a user with 10 projects of 10 tasks sharing SESSIONS past sessions, logs
+in and loads the dashboard RUNS times, measuring:
+  - ttfb: until the response headers arrive
+  - shell: until the page is fully downloaded
+  - interactive: until the page and every fragment it loads
+    (`data-fragment-url`) have arrived, fetching the fragments in parallel
+    the way the browser does
+
+With --cold the user's cached data is invalidated before every load, as if
+they had just edited something.
+
+    python -m benchmarks.dashboard --url http://127.0.0.1:8000 --runs 50 --sessions 20000
+"""
+import argparse
+import random
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from html import unescape
+
+from . import percentile, print_table, setup_django
+from .loadtest import PASSWORD, VirtualUser
+
+FRAGMENT_URL = re.compile(r'data-fragment-url="([^"]+)"')
+
+def seed_user(sessions):
+    """Create (or reuse) the account for `sessions` and return its email."""
+    from django.contrib.auth import get_user_model
+    from django.db import transaction
+    from django.utils import timezone
+    from tracker.models import Project, Session, Task
+
+    User = get_user_model()
+    email = f"dashboard-{sessions}@example.com"
+    if User.objects.filter(email=email).exists():
+        return email
+    now = timezone.now()
+    with transaction.atomic():
+        user = User.objects.create_user(email=email, password=PASSWORD)
+        tasks = [
+            Task.objects.create(project=project, name=f"Task {number}")
+            for project in (Project.objects.create(user=user, name=f"Project {index}") for index in range(10))
+            for number in range(10)
+        ]
+        Session.objects.bulk_create(
+            Session(
+                task=tasks[number % len(tasks)],
+                start_time=now - timedelta(minutes=30 * (number + 1)),
+                end_time=now - timedelta(minutes=30 * number + 10),
+            )
+            for number in range(sessions)
+        )
+    return email
+
+def load_dashboard(user, url, pool, invalidate=None):
+    if invalidate is not None:
+        invalidate()
+    started = time.perf_counter()
+    with user.opener.open(user.base_url + url, timeout=30) as response:
+        ttfb = time.perf_counter() - started
+        body = response.read().decode()
+    shell = time.perf_counter() - started
+
+    def fetch(path):
+        with user.opener.open(user.base_url + path, timeout=30) as response:
+            response.read()
+
+    list(pool.map(fetch, [unescape(path) for path in FRAGMENT_URL.findall(body)]))
+    interactive = time.perf_counter() - started
+    return ttfb, shell, interactive
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=20000, help="past sessions seeded for the user")
+    parser.add_argument("--cold", action="store_true", help="invalidate the user's cached data before each load")
+    options = parser.parse_args()
+    setup_django()
+
+    from django.contrib.auth import get_user_model
+    from django.urls import reverse
+    from tracker.cache import bump_data_version
+
+    email = seed_user(options.sessions)
+    user = VirtualUser(options.url, email, None, {"login": reverse("users:login")}, random.Random(0))
+    user.login()
+
+    url = reverse("tracker:dashboard")
+    invalidate = None
+    if options.cold:
+        user_pk = get_user_model().objects.get(email=email).pk
+        invalidate = lambda: bump_data_version(user_pk)
+    timings = []
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        load_dashboard(user, url, pool)
+        for _ in range(options.runs):
+            timings.append(load_dashboard(user, url, pool, invalidate))
+
+    rows = []
+    for index, name in enumerate(("ttfb", "shell", "interactive")):
+        values = [timing[index] for timing in timings]
+        rows.append((name, f"{percentile(values, 50) * 1000:.1f}", f"{percentile(values, 95) * 1000:.1f}"))
+    print_table(("", "p50 ms", "p95 ms"), rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Concurrent load test against a running server.
+
+Seeds USERS accounts in the database the server uses (each with a project, a
+few tasks and a month of past sessions), logs each of them in from its own
+thread and replays a mix of requests until DURATION has passed:
+
+  - dashboard                                       (weight 5)
+  - start a timer, stop it and review the session   (weight 2)
+  - weekly and monthly summaries                    (weight 2 each)
+
+Every request is timed on its own (redirects are not followed). The report
+gives throughput and p50/p95/p99 latency per endpoint, the requests rejected
+by the rate limits (429) or shed under database overload (503), the other
+failed requests, and how many were SQLite "database is locked" errors. The
+rejections come back fast, so the latency percentiles only count the 2xx and
+3xx responses; a run with many of them measures the limits, not the app. Lock
+errors are recognised in the response body when the server runs with
+DEBUG=True, or in the server's error log when --server-log points at it
+(e.g. gunicorn --error-logfile).
+
+    gunicorn tick_project.wsgi -w 4 --error-logfile server.log &
+    python -m benchmarks.loadtest --users 16 --duration 60 --server-log server.log
+
+To measure the app rather than its limits, start the server with overload
+shedding off and bursts larger than the run sends:
+
+    OVERLOAD_DB_LATENCY_MS=0 RATE_LIMIT_WRITE_BURST=1000000 \\
+    RATE_LIMIT_SUMMARY_BURST=1000000 gunicorn tick_project.wsgi -w 4 ...
+"""
+import argparse
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from datetime import timedelta
+from http.cookiejar import CookieJar
+
+from . import percentile, print_table, setup_django
+
+PASSWORD = "loadtest-password"
+LOCK_ERROR = b"database is locked"
+# answered by the rate limits and by overload shedding (see tick_project/throttling.py)
+RATE_LIMITED = 429
+SHED = 503
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+class VirtualUser:
+    """One logged in browser: its own cookies, timings and scenario."""
+
+    def __init__(self, base_url, email, task_pk, urls, rng):
+        self.base_url = base_url.rstrip("/")
+        self.email = email
+        self.task_pk = task_pk
+        self.urls = urls
+        self.rng = rng
+        self.cookies = CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies), NoRedirect)
+        # endpoint -> list of (seconds, status, locked)
+        self.results = defaultdict(list)
+
+    def csrf_token(self):
+        for cookie in self.cookies:
+            if cookie.name == "csrftoken":
+                return cookie.value
+        return ""
+
+    def request(self, endpoint, path, data=None):
+        """Send one request and return (status, location header)."""
+        if data is not None:
+            data = urllib.parse.urlencode({"csrfmiddlewaretoken": self.csrf_token(), **data}).encode()
+        request = urllib.request.Request(self.base_url + path, data=data)
+        started = time.perf_counter()
+        try:
+            with self.opener.open(request, timeout=30) as response:
+                response.read()
+                status, location, body = response.status, None, b""
+        except urllib.error.HTTPError as error:
+            status, location, body = error.code, error.headers.get("Location"), error.read()
+        except OSError:
+            status, location, body = 0, None, b""
+        elapsed = time.perf_counter() - started
+        self.results[endpoint].append((elapsed, status, LOCK_ERROR in body))
+        return status, location
+
+    def login(self):
+        self.request("login (get)", self.urls["login"])
+        status, _ = self.request("login", self.urls["login"], {"username": self.email, "password": PASSWORD})
+        if status != 302:
+            raise RuntimeError(f"Could not log in as {self.email} (status {status})")
+
+    def track_session(self):
+        status, location = self.request("session start", self.urls["session-start"], {})
+        if status != 302 or not location:
+            return
+        # the active session page: stopping the timer redirects to the review form
+        session_path = urllib.parse.urlparse(location).path
+        status, location = self.request("session stop", session_path, {})
+        if status != 302 or not location:
+            return
+        review_path = urllib.parse.urlparse(location).path
+        self.request("session review (get)", review_path)
+        self.request("session review", review_path, {
+            "task_name": "Load test task",
+            "duration_minutes": self.rng.randint(5, 90),
+        })
+
+    def run(self, deadline):
+        scenarios = [
+            (lambda: self.request("dashboard", self.urls["dashboard"]), 5),
+            (self.track_session, 2),
+            (lambda: self.request("weekly", self.urls["weekly"]), 2),
+            (lambda: self.request("monthly", self.urls["monthly"]), 2),
+        ]
+        actions = [action for action, _ in scenarios]
+        weights = [weight for _, weight in scenarios]
+        self.login()
+        while time.monotonic() < deadline:
+            self.rng.choices(actions, weights)[0]()
+
+def seed_users(count, sessions_per_user):
+    """Create (or reuse) the load test accounts and return [(email, task pk)]."""
+    from django.contrib.auth import get_user_model
+    from django.db import transaction
+    from django.utils import timezone
+    from tracker.models import Project, Session, Task
+
+    User = get_user_model()
+    accounts = []
+    now = timezone.now()
+    for index in range(count):
+        email = f"loadtest-{index}@example.com"
+        with transaction.atomic():
+            user = User.objects.filter(email=email).first()
+            if user is None:
+                user = User.objects.create_user(email=email, password=PASSWORD)
+                project = Project.objects.create(user=user, name="Load test")
+                tasks = [Task.objects.create(project=project, name=f"Task {number}") for number in range(5)]
+                Session.objects.bulk_create(
+                    Session(
+                        task=tasks[number % len(tasks)],
+                        start_time=now - timedelta(days=30) + timedelta(hours=7 * number),
+                        end_time=now - timedelta(days=30) + timedelta(hours=7 * number, minutes=40),
+                    )
+                    for number in range(sessions_per_user)
+                )
+            task = Task.objects.filter(project__user=user).order_by("pk").first()
+            # a session left running by an interrupted run would block new timers
+            Session.objects.end_current_session(user)
+        accounts.append((email, task.pk))
+    return accounts
+
+def count_lock_errors(path, offset):
+    if not path:
+        return None
+    with open(path, "rb") as log:
+        log.seek(offset)
+        return log.read().count(LOCK_ERROR)
+
+def log_size(path):
+    if not path:
+        return 0
+    try:
+        with open(path, "rb") as log:
+            return log.seek(0, 2)
+    except FileNotFoundError:
+        return 0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=8, help="concurrent logged in users, one thread each")
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--sessions", type=int, default=100, help="past sessions seeded per user")
+    parser.add_argument("--server-log", help="server error log to count lock errors in")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the request mix")
+    options = parser.parse_args()
+    setup_django()
+
+    from django.urls import reverse
+
+    accounts = seed_users(options.users, options.sessions)
+    log_offset = log_size(options.server_log)
+
+    virtual_users = []
+    for index, (email, task_pk) in enumerate(accounts):
+        urls = {
+            "login": reverse("users:login"),
+            "dashboard": reverse("tracker:dashboard"),
+            "session-start": reverse("tracker:session-start", kwargs={"pk": task_pk}),
+            "weekly": reverse("tracker:weekly", kwargs={"weeks_ago": 0}),
+            "monthly": reverse("tracker:monthly", kwargs={"months_ago": 0}),
+        }
+        virtual_users.append(VirtualUser(options.url, email, task_pk, urls, random.Random(options.seed + index)))
+
+    deadline = time.monotonic() + options.duration
+    started = time.perf_counter()
+    threads = [threading.Thread(target=user.run, args=(deadline,)) for user in virtual_users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    results = defaultdict(list)
+    for user in virtual_users:
+        for endpoint, timings in user.results.items():
+            results[endpoint].extend(timings)
+
+    rows = []
+    counts = defaultdict(int)
+    for endpoint, timings in sorted(results.items()):
+        # rejected and failed requests are counted but left out of the latencies
+        latencies = [seconds for seconds, status, _ in timings if 200 <= status < 400]
+        rate_limited = sum(1 for _, status, _ in timings if status == RATE_LIMITED)
+        shed = sum(1 for _, status, _ in timings if status == SHED)
+        errors = len(timings) - len(latencies) - rate_limited - shed
+        counts[RATE_LIMITED] += rate_limited
+        counts[SHED] += shed
+        rows.append((
+            endpoint,
+            len(timings),
+            f"{len(timings) / elapsed:,.1f}",
+            f"{percentile(latencies, 50) * 1000:.1f}",
+            f"{percentile(latencies, 95) * 1000:.1f}",
+            f"{percentile(latencies, 99) * 1000:.1f}",
+            rate_limited,
+            shed,
+            errors,
+        ))
+    print_table(("endpoint", "count", "req/s", "p50 ms", "p95 ms", "p99 ms", "429", "503", "errors"), rows)
+
+    total = sum(len(timings) for timings in results.values())
+    locked = sum(locked for timings in results.values() for _, _, locked in timings)
+    logged = count_lock_errors(options.server_log, log_offset)
+    print(f"\n{total} requests in {elapsed:.1f}s ({total / elapsed:,.1f} req/s) from {options.users} users")
+    print(f"Rejected: {counts[RATE_LIMITED]} rate limited (429), {counts[SHED]} shed under overload (503)")
+    if counts[RATE_LIMITED] or counts[SHED]:
+        print("The limits answered these; see the module docstring to run the server without them.")
+    print(f"SQLite lock errors: {locked} in responses" + (f", {logged} in server log" if logged is not None else ""))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Bytes on the wire per page view, against a running server.
+
+Seeds a user with a project of 300 done tasks and a month of sessions, logs in
+and loads each page the way a browser would: the HTML, the fragments it loads
+(`data-fragment-url`) and the static files it links to. Each page is loaded
+with Accept-Encoding identity, gzip and br, and reported as
+  - first: with nothing cached
+  - repeat: with the static files cached, for as long as their Cache-Control allows
+
+Sizes are response headers plus body, in KiB. The server needs
+`python manage.py collectstatic` first.
+
+    python -m benchmarks.page_weight --url http://127.0.0.1:8000
+"""
+import argparse
+import gzip
+import random
+import re
+import urllib.request
+from datetime import timedelta
+from html import unescape
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from . import print_table, setup_django
+from .loadtest import PASSWORD, VirtualUser
+
+ENCODINGS = ("identity", "gzip", "br")
+ASSET_URL = re.compile(r'(?:href|src)="(/static/[^"]+)"')
+FRAGMENT_URL = re.compile(r'data-fragment-url="([^"]+)"')
+MAX_AGE = re.compile(r"max-age=(\d+)")
+# assets cached for at least this long count as free on a repeat view
+CACHED_FOR = 60 * 60 * 24
+
+def seed_user():
+    """Create (or reuse) the benchmark account and return (email, project pk)."""
+    from django.contrib.auth import get_user_model
+    from django.db import transaction
+    from django.utils import timezone
+    from tracker.models import Project, Session, Task
+
+    User = get_user_model()
+    email = "page-weight@example.com"
+    user = User.objects.filter(email=email).first()
+    if user is not None:
+        return email, Project.objects.get(user=user, name="Big").pk
+    now = timezone.now()
+    with transaction.atomic():
+        user = User.objects.create_user(email=email, password=PASSWORD)
+        project = Project.objects.create(user=user, name="Big")
+        done = Task.objects.bulk_create(
+            Task(project=project, name=f"Done task {number}", is_done=True, done_at=now - timedelta(hours=number))
+            for number in range(300)
+        )
+        tasks = [Task.objects.create(project=project, name=f"Task {number}") for number in range(10)]
+        for index in range(10):
+            other = Project.objects.create(user=user, name=f"Project {index}")
+            tasks.append(Task.objects.create(project=other, name=f"Task of project {index}"))
+        Session.objects.bulk_create(
+            Session(
+                task=(tasks + done)[number % (len(tasks) + len(done))],
+                start_time=now - timedelta(hours=number + 1),
+                end_time=now - timedelta(hours=number, minutes=20),
+            )
+            for number in range(24 * 30)
+        )
+    return email, project.pk
+
+def fetch(user, path, encoding):
+    """Return (wire bytes, body, headers) of a GET as sent by the server."""
+    request = urllib.request.Request(user.base_url + path, headers={"Accept-Encoding": encoding})
+    with user.opener.open(request, timeout=30) as response:
+        body = response.read()
+        headers = response.headers
+    wire = len(body) + len(str(headers)) + len("HTTP/1.1 200 OK\r\n")
+    return wire, body, headers
+
+def decode(body, headers):
+    encoding = headers.get("Content-Encoding")
+    if encoding == "gzip":
+        return gzip.decompress(body).decode()
+    if encoding == "br":
+        return brotli.decompress(body).decode()
+    return body.decode()
+
+def page_view(user, path, encoding, asset_cache):
+    """Load a page and what it links to; return (first view bytes, repeat view bytes)."""
+    wire, body, headers = fetch(user, path, encoding)
+    first = repeat = wire
+    html = decode(body, headers)
+    for fragment in FRAGMENT_URL.findall(html):
+        wire, _, _ = fetch(user, unescape(fragment), encoding)
+        first += wire
+        repeat += wire
+    for asset in ASSET_URL.findall(html):
+        key = (asset, encoding)
+        if key not in asset_cache:
+            wire, _, headers = fetch(user, unescape(asset), encoding)
+            max_age = MAX_AGE.search(headers.get("Cache-Control", ""))
+            asset_cache[key] = (wire, int(max_age.group(1)) if max_age else 0, headers.get("Cache-Control", "-"))
+        wire, max_age, _ = asset_cache[key]
+        first += wire
+        if max_age < CACHED_FOR:
+            repeat += wire
+    return first, repeat
+
+def kib(size):
+    return f"{size / 1024:.1f}"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    options = parser.parse_args()
+    setup_django()
+
+    from django.urls import reverse
+
+    email, project_pk = seed_user()
+    user = VirtualUser(options.url, email, None, {"login": reverse("users:login")}, random.Random(0))
+    user.login()
+
+    pages = {
+        "dashboard": reverse("tracker:dashboard"),
+        "tasks": reverse("tracker:tasks"),
+        "projects": reverse("tracker:projects"),
+        "project detail": reverse("tracker:project-detail", kwargs={"pk": project_pk}),
+        "daily": reverse("tracker:daily", kwargs={"days_ago": 0}),
+        "weekly": reverse("tracker:weekly", kwargs={"weeks_ago": 0}),
+        "monthly": reverse("tracker:monthly", kwargs={"months_ago": 0}),
+    }
+    asset_cache = {}
+    rows = []
+    for name, path in pages.items():
+        views = [page_view(user, path, encoding, asset_cache) for encoding in ENCODINGS]
+        rows.append((name, *(kib(first) for first, _ in views), *(kib(repeat) for _, repeat in views)))
+    print_table(("page", *(f"first {e}" for e in ENCODINGS), *(f"repeat {e}" for e in ENCODINGS)), rows)
+    print()
+    print_table(
+        ("asset", "encoding", "KiB", "Cache-Control"),
+        [(asset, encoding, kib(wire), cache_control) for (asset, encoding), (wire, _, cache_control) in sorted(asset_cache.items())],
+    )
+
+if __name__ == "__main__":
+    main()
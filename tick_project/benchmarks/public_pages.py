@@ -0,0 +1,67 @@
+"""
+Requests per second for anonymous visitors of the public pages, against a
+running server.
+
+Each of CONCURRENCY threads requests the home, login and register pages in
+turn for DURATION seconds, without cookies, like first-time visitors. Run it
+against a server started with PAGE_CACHE_TIMEOUT=0 (page cache off) and one
+with the default to compare:
+
+    PAGE_CACHE_TIMEOUT=0 python manage.py runserver 8000 --noreload
+    python -m benchmarks.public_pages --url http://127.0.0.1:8000
+"""
+import argparse
+import threading
+import time
+import urllib.request
+from itertools import cycle
+
+from . import percentile, print_table
+
+PAGES = ("/", "/users/login/", "/users/register/")
+
+def visitor(base_url, deadline, timings, lock):
+    opener = urllib.request.build_opener()
+    local = []
+    for page in cycle(PAGES):
+        if time.perf_counter() >= deadline:
+            break
+        started = time.perf_counter()
+        with opener.open(base_url + page) as response:
+            response.read()
+        local.append((page, time.perf_counter() - started))
+    with lock:
+        timings.extend(local)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10)
+    options = parser.parse_args()
+
+    # warm up, so the first requests don't count the cache fill
+    for page in PAGES:
+        urllib.request.urlopen(options.url + page).read()
+
+    timings = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + options.duration
+    threads = [
+        threading.Thread(target=visitor, args=(options.url, deadline, timings, lock))
+        for _ in range(options.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    rows = []
+    for page in PAGES:
+        page_timings = [seconds for name, seconds in timings if name == page]
+        rows.append((page, len(page_timings), f"{percentile(page_timings, 50) * 1000:.1f}", f"{percentile(page_timings, 95) * 1000:.1f}"))
+    print(f"{len(timings) / options.duration:.0f} requests/s with {options.concurrency} visitors\n")
+    print_table(("page", "requests", "p50 ms", "p95 ms"), rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Rendering of the long list pages.
+
+Builds an in-memory SQLite database for one user with ROWS projects and ROWS
+tasks in the first project (half of them pending, half done today, each with
+two sessions), then times GET requests with Django's test client for the pages
+listing them: the task list, the project list and the project's detail page.
+It also reports the number of queries each page runs and the size of the
+page, so runs before and after a template change can be compared:
+
+    python -m benchmarks.rendering
+    python -m benchmarks.rendering --rows 5000
+"""
+import argparse
+import time
+from datetime import timedelta
+
+from . import percentile, print_table, setup_django
+
+def create_database(rows):
+    from django.contrib.auth import get_user_model
+    from django.db import connection, transaction
+    from django.utils import timezone
+    from tracker.models import Project, Session, Task
+
+    connection.creation.create_test_db(verbosity=0)
+    now = timezone.now()
+    with transaction.atomic():
+        user = get_user_model().objects.create_user(email="rendering@example.com", password="benchmark")
+        projects = Project.objects.bulk_create(Project(user=user, name=f"Project {number}", active=number % 4 != 0) for number in range(rows))
+        tasks = Task.objects.bulk_create(
+            (
+                Task(project=projects[0], name=f"Task {number}", is_done=number % 2 == 1, done_at=now if number % 2 else None)
+                for number in range(rows)
+            ),
+            batch_size=5000,
+        )
+        Session.objects.bulk_create(
+            (
+                Session(task=task, start_time=now - timedelta(hours=hour + 1), end_time=now - timedelta(hours=hour, minutes=30))
+                for task in tasks for hour in range(2)
+            ),
+            batch_size=5000,
+        )
+    return user, projects[0]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=10)
+    options = parser.parse_args()
+    setup_django()
+
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext, setup_test_environment
+    from django.urls import reverse
+
+    setup_test_environment()
+    user, project = create_database(options.rows)
+    client = Client()
+    client.force_login(user)
+    pages = {
+        "task list": reverse("tracker:tasks"),
+        "project list": reverse("tracker:projects"),
+        "project detail": reverse("tracker:project-detail", args=[project.pk]),
+    }
+    rows = []
+    for name, url in pages.items():
+        # the first request compiles the templates
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        query_count = len(queries)
+        assert response.status_code == 200, response.status_code
+        timings = []
+        for _ in range(options.repeat):
+            started = time.perf_counter()
+            client.get(url)
+            timings.append(time.perf_counter() - started)
+        rows.append((
+            name, query_count, f"{len(response.content) / 1024:.0f}",
+            f"{percentile(timings, 50) * 1000:.1f}", f"{percentile(timings, 95) * 1000:.1f}",
+        ))
+
+    print(f"{options.rows} rows\n")
+    print_table(("page", "queries", "KiB", "p50 ms", "p95 ms"), rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Task and project search: the FTS5 index against `icontains` lookups.
+
+Builds an in-memory SQLite database with the test runner's migrations (so the
+index and its triggers are in place), holding TASKS tasks split evenly between
+USERS users, 20 projects each. Names are 2 to 5 words drawn from a generated
+vocabulary with a Zipf-like distribution, so some words are in most names and
+others in a handful. For each kind of query, reports the median and 95th
+percentile time of `services.search.search` (FTS5, ranked) and
+`services.search.icontains_search`, and how many results each returned.
+
+    python -m benchmarks.search
+    python -m benchmarks.search --tasks 100000 --users 5 --repeat 20
+"""
+import argparse
+import random
+import time
+
+from . import percentile, print_table, setup_django
+
+SYLLABLES = ["ba", "ko", "ri", "mel", "sun", "tra", "de", "vo", "lin", "pe", "qua", "zor", "fi", "nu", "sta", "gre"]
+
+def vocabulary(rng, size):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words, key=lambda word: rng.random())
+
+def task_names(rng, words, count):
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    for _ in range(count):
+        yield " ".join(rng.choices(words, weights, k=rng.randint(2, 5)))
+
+def create_database(options, rng, words):
+    from django.contrib.auth import get_user_model
+    from django.db import connection, transaction
+    from tracker.models import Project, Task
+
+    connection.creation.create_test_db(verbosity=0)
+    names = task_names(rng, words, options.tasks)
+    users = []
+    started = time.perf_counter()
+    for index in range(options.users):
+        with transaction.atomic():
+            user = get_user_model().objects.create_user(email=f"search-{index}@example.com", password="benchmark")
+            projects = Project.objects.bulk_create(
+                Project(user=user, name=" ".join(rng.sample(words[:500], 2))) for _ in range(20)
+            )
+            Task.objects.bulk_create(
+                (Task(project=projects[number % 20], name=next(names)) for number in range(options.tasks // options.users)),
+                batch_size=5000,
+            )
+        users.append(user)
+    return users, time.perf_counter() - started
+
+def timed(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+    return timings, len(result)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=10)
+    options = parser.parse_args()
+    setup_django()
+
+    from tracker.services.search import icontains_search, search
+
+    rng = random.Random(0)
+    words = vocabulary(rng, 5000)
+    users, build_seconds = create_database(options, rng, words)
+    print(f"{options.tasks} tasks for {options.users} users inserted and indexed in {build_seconds:.1f} s\n")
+
+    queries = {
+        "common word": words[0],
+        "mid word": words[100],
+        "rare word": words[1500],
+        "two words": f"{words[3]} {words[20]}",
+        "2 letters": words[50][:2],
+        "3 letters": words[50][:3],
+        "no match": "xyzzy",
+    }
+    rows = []
+    for name, query in queries.items():
+        row = [name, query]
+        for function in (search, icontains_search):
+            timings, found = timed(lambda: function(users[0], query), options.repeat)
+            row += [f"{percentile(timings, 50) * 1000:.1f}", f"{percentile(timings, 95) * 1000:.1f}", found]
+        rows.append(row)
+    print_table(("query", "text", "fts p50", "fts p95", "fts n", "icontains p50", "icontains p95", "icontains n"), rows)
+
+if __name__ == "__main__":
+    main()
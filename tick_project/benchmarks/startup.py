@@ -0,0 +1,100 @@
+"""
+Worker cold-start cost.
+
+Each run starts a fresh interpreter, the way a new gunicorn worker does, and
+measures:
+  - the import time reported by `python -X importtime`, grouped by top-level package
+  - the time to build the WSGI application
+  - the time to the first and second response for PATH (no database needed
+    for the default register page)
+
+    python -m benchmarks.startup --runs 5 --path /users/register/
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from . import print_table
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+# executed in a fresh interpreter: prints timings (in seconds) as json
+COLD_START_SCRIPT = """
+import time
+started = time.perf_counter()
+import io, json, os
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tick_project.settings")
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+ready = time.perf_counter()
+
+def request(path):
+    environ = {
+        "REQUEST_METHOD": "GET", "PATH_INFO": path, "QUERY_STRING": "",
+        "SERVER_NAME": "127.0.0.1", "SERVER_PORT": "80", "HTTP_HOST": "127.0.0.1",
+        "wsgi.input": io.BytesIO(), "wsgi.url_scheme": "http", "wsgi.errors": io.StringIO(),
+    }
+    status = []
+    body = b"".join(application(environ, lambda s, h, exc_info=None: status.append(s)))
+    return status[0], len(body)
+
+status, size = request(%(path)r)
+first = time.perf_counter()
+request(%(path)r)
+second = time.perf_counter()
+print(json.dumps({
+    "setup": ready - started, "first_response": first - started,
+    "second_response": second - first, "status": status, "bytes": size,
+}))
+"""
+
+def run(args):
+    return subprocess.run(
+        [sys.executable, *args], cwd=PROJECT_DIR, env=os.environ.copy(),
+        capture_output=True, text=True, check=True,
+    )
+
+def import_times():
+    """Return cumulative import time (µs) per top-level package for `django.setup()`."""
+    result = run(["-X", "importtime", "-c", (
+        "import os; os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tick_project.settings');"
+        "from django.core.wsgi import get_wsgi_application; get_wsgi_application()"
+    )])
+    by_package = defaultdict(int)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time: <self µs> | <cumulative µs> | <indented module name>"
+        self_us, _, name = line[len("import time:"):].split("|")
+        by_package[name.strip().split(".")[0]] += int(self_us)
+    return by_package
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/users/register/")
+    parser.add_argument("--top", type=int, default=10, help="number of packages listed by import time")
+    options = parser.parse_args()
+
+    by_package = import_times()
+    total = sum(by_package.values())
+    print(f"Import time (self time summed per top-level package), total {total / 1000:.1f} ms")
+    rows = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:options.top]
+    print_table(("package", "ms", "share"), [(name, f"{us / 1000:.1f}", f"{us / total:.0%}") for name, us in rows])
+    print()
+
+    samples = [json.loads(run(["-c", COLD_START_SCRIPT % {"path": options.path}]).stdout) for _ in range(options.runs)]
+    print(f"Cold start over {options.runs} runs: GET {options.path} -> {samples[0]['status']}, {samples[0]['bytes']} bytes")
+    rows = []
+    for metric in ("setup", "first_response", "second_response"):
+        values = [sample[metric] * 1000 for sample in samples]
+        rows.append((metric, f"{statistics.median(values):.1f}", f"{min(values):.1f}", f"{max(values):.1f}"))
+    print_table(("metric", "median ms", "min ms", "max ms"), rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Microbenchmarks for `tracker.services.summaries` and `tracker.helpers`.
+
+Synthetic sessions start every 97 minutes in a timezone with daylight saving
+time from the night before a DST switch, so every set includes 23 and 25 hour
+days and the larger ones span many switches. Each case
+reports operations per second (an operation is one full summary, or one call
+for the small helpers) and the peak memory allocated while it runs, measured
+with tracemalloc in a separate run.
+
+Cases:
+  - summarize: `summarize_sessions` over generated tuples (no database)
+  - summarize-db: the same rows read with `values_list(...).iterator()` from an
+    in-memory SQLite database built by the test runner's migrations
+  - models: the previous approach, grouping model instances (with --legacy)
+  - daily / projects: `build_daily_summary` for a month and
+    `build_annotated_project_summary` for the totals of each size
+  - timedelta_to_dict: one call
+
+Results are compared against a stored baseline (benchmarks/baselines/summaries.json);
+--save-baseline replaces it with the current run.
+
+    python -m benchmarks.summaries
+    python -m benchmarks.summaries --sizes 1000 100000 --db-sizes 1000 --save-baseline
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from . import print_table, setup_django
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "summaries.json"
+TIMEZONE = ZoneInfo("Europe/Berlin")
+# sessions start every 97 minutes, so their local start times drift across days and DST switches
+SESSION_SPACING = timedelta(minutes=97)
+SESSION_LENGTH = timedelta(minutes=45)
+FIRST_START = datetime(2024, 3, 30, 22, 0, tzinfo=TIMEZONE)
+
+def generate_rows(count, projects):
+    for index in range(count):
+        start_time = FIRST_START + SESSION_SPACING * index
+        project_pk = index % projects + 1
+        yield start_time, start_time + SESSION_LENGTH, project_pk, f"Project {project_pk}"
+
+def run_for(function, min_time):
+    """Call `function` repeatedly for at least `min_time` seconds and return calls per second."""
+    calls = 0
+    started = time.perf_counter()
+    while True:
+        function()
+        calls += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            return calls / elapsed
+
+def peak_allocated(function):
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+def summarize_models(count, projects):
+    """The approach replaced in the summary services: model instances grouped by project."""
+    from tracker.models import Project, Session, Task
+
+    sessions = []
+    for start_time, end_time, project_pk, name in generate_rows(count, projects):
+        project = Project(pk=project_pk, name=name)
+        sessions.append(Session(task=Task(pk=project_pk, project=project), start_time=start_time, end_time=end_time))
+
+    sessions_by_project = {}
+    for session in sessions:
+        sessions_by_project.setdefault(session.task.project, []).append(session)
+    for project, project_sessions in sessions_by_project.items():
+        project.total_seconds = sum(session.duration_in_seconds() for session in project_sessions)
+    return list(sessions_by_project)
+
+def create_database(sizes, projects):
+    """Create an in-memory database with one user per size, holding that many sessions."""
+    from django.contrib.auth import get_user_model
+    from django.db import connection, transaction
+    from tracker.models import Project, Session, Task
+
+    connection.creation.create_test_db(verbosity=0)
+    users = {}
+    for count in sizes:
+        with transaction.atomic():
+            user = get_user_model().objects.create_user(email=f"bench-{count}@example.com", password="benchmark")
+            tasks = []
+            for index in range(projects):
+                project = Project.objects.create(user=user, name=f"Project {index + 1}")
+                tasks.append(Task.objects.create(project=project, name="Task"))
+            Session.objects.bulk_create(
+                (Session(task=tasks[project_pk - 1], start_time=start_time, end_time=end_time)
+                 for start_time, end_time, project_pk, _ in generate_rows(count, projects)),
+                batch_size=5000,
+            )
+        users[count] = user
+    return users
+
+def build_cases(options):
+    from tracker.helpers import timedelta_to_dict
+    from tracker.models import Session
+    from tracker.services.summaries import (
+        SESSION_SUMMARY_FIELDS, build_annotated_project_summary, build_daily_summary, summarize_sessions,
+    )
+
+    cases = []
+    for count in options.sizes:
+        cases.append(("summarize", count, lambda count=count: summarize_sessions(generate_rows(count, options.projects))))
+        if options.legacy:
+            cases.append(("models", count, lambda count=count: summarize_models(count, options.projects)))
+
+    if options.db_sizes:
+        users = create_database(options.db_sizes, options.projects)
+        for count, user in users.items():
+            def summarize_db(user=user):
+                rows = Session.objects.filter(task__project__user=user).values_list(*SESSION_SUMMARY_FIELDS)
+                return summarize_sessions(rows.iterator(chunk_size=2000))
+            cases.append(("summarize-db", count, summarize_db))
+
+    # the month of the switch to summer time, in which one day has 23 hours
+    month_totals = summarize_sessions(generate_rows(31 * 24 * 60 // 97, options.projects))
+    cases.append(("daily", 31, lambda: build_daily_summary(month_totals.by_date, date(2024, 3, 30), date(2024, 4, 29), "%d")))
+    for count in options.sizes[:2]:
+        totals = summarize_sessions(generate_rows(count, options.projects))
+        cases.append(("projects", count, lambda totals=totals: build_annotated_project_summary(totals.by_project, totals.total_seconds)))
+    cases.append(("timedelta_to_dict", 1, lambda: timedelta_to_dict(timedelta(hours=25, minutes=7))))
+    return cases
+
+def load_baseline(path):
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+def compare(value, baseline):
+    if not baseline:
+        return "-"
+    return f"{(value - baseline) / baseline * 100:+.0f}%"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--db-sizes", type=int, nargs="*", default=[1000, 100000])
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds to repeat each case for")
+    parser.add_argument("--legacy", action="store_true", help="include the model-instance approach")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    options = parser.parse_args()
+    setup_django()
+
+    from django.utils import timezone
+
+    baseline = load_baseline(options.baseline)
+    results = {}
+    rows = []
+    with timezone.override(TIMEZONE):
+        for name, size, function in build_cases(options):
+            key = f"{name}:{size}"
+            ops = run_for(function, options.min_time)
+            peak = peak_allocated(function)
+            results[key] = {"ops_per_second": round(ops, 2), "peak_bytes": peak}
+            previous = baseline.get(key, {})
+            rows.append((
+                name,
+                f"{size:,}",
+                f"{ops:,.1f}",
+                compare(ops, previous.get("ops_per_second")),
+                f"{peak / 1024:,.1f}",
+                compare(peak, previous.get("peak_bytes")),
+            ))
+
+    print_table(("case", "size", "ops/s", "vs base", "peak KiB", "vs base"), rows)
+
+    if options.save_baseline:
+        options.baseline.parent.mkdir(parents=True, exist_ok=True)
+        options.baseline.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"Saved baseline to {options.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import Job
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("name", "user", "status", "attempts", "progress", "total", "created_at", "finished_at")
+    list_filter = ("status", "name")
+    raw_id_fields = ("user",)
@@ -0,0 +1,101 @@
+import os
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.models import Job
+from jobs.runner import run_claimed_job
+
+# seconds after which a job still marked as running is assumed to be orphaned
+STALE_AFTER = 60 * 10
+# seconds between renewing the claims of running jobs and requeueing stale ones
+MAINTENANCE_INTERVAL = 60
+
+def init_worker():
+    # spawned workers start from a fresh interpreter; forked ones must not share the parent's connections
+    django.setup()
+    connections.close_all()
+
+class Command(BaseCommand):
+    help = "Run background jobs in a pool of worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty.")
+
+    def handle(self, *args, **options):
+        processes = options["processes"]
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stdout.write(f"Running jobs with {processes} process(es) as {worker_id}")
+
+        in_flight = {}
+        pool = None
+        maintained_at = None
+        try:
+            while True:
+                if maintained_at is None or time.monotonic() - maintained_at >= MAINTENANCE_INTERVAL:
+                    self.maintain(worker_id, in_flight)
+                    maintained_at = time.monotonic()
+
+                if pool is None:
+                    # don't hand the pool a copy of our open connection
+                    connections.close_all()
+                    pool = ProcessPoolExecutor(max_workers=processes, initializer=init_worker)
+
+                while len(in_flight) < processes:
+                    job = Job.objects.claim_next(worker_id)
+                    if job is None:
+                        break
+                    in_flight[pool.submit(run_claimed_job, job.pk)] = job
+
+                if not in_flight:
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                done, _ = wait(in_flight, timeout=options["poll_interval"], return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    job = in_flight.pop(future)
+                    broken |= not self.report(job, future)
+                if broken:
+                    # a worker process died, which breaks the whole pool and its other
+                    # jobs: they are requeued once stale, and a new pool is started
+                    for job in in_flight.values():
+                        self.stderr.write(f"{job.name} #{job.pk}: worker pool broken")
+                    in_flight.clear()
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = None
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping, waiting for running jobs to finish")
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+
+    def maintain(self, worker_id, in_flight):
+        """Keep the claims of the jobs running here alive and requeue the jobs of workers that died."""
+        Job.objects.renew_claims(worker_id, [job.pk for job in in_flight.values()])
+        requeued = Job.objects.requeue_stale(STALE_AFTER)
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale job(s)")
+
+    def report(self, job, future):
+        """Report the outcome of a job. Returns False if its worker process died."""
+        try:
+            status = future.result()
+        except BrokenProcessPool:
+            # once stale (its claim isn't renewed anymore) the job is requeued, or failed if out of attempts
+            self.stderr.write(f"{job.name} #{job.pk}: worker process died")
+            return False
+        except Exception as error:
+            self.stderr.write(f"{job.name} #{job.pk}: worker error {error!r}")
+        else:
+            self.stdout.write(f"{job.name} #{job.pk}: {status}")
+        return True
@@ -0,0 +1,56 @@
+import logging
+from datetime import timedelta
+from django.db.models import F, Manager
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+class JobManager(Manager):
+    def enqueue(self, name, user=None, **kwargs):
+        """Create a pending job that runs the function registered as `name` with `kwargs`."""
+        return self.create(name=name, user=user, kwargs=kwargs)
+
+    def claim_next(self, worker_id):
+        """
+        Mark the oldest runnable job as running for `worker_id` and return it,
+        or None if there is nothing to run.
+
+        The claim is a conditional UPDATE, so when several workers race for the
+        same job only one of them changes the row (writes are serialized by SQLite).
+        """
+        while True:
+            now = timezone.now()
+            job = self.filter(status=self.model.PENDING, run_after__lte=now).order_by("run_after", "pk").first()
+            if job is None:
+                return None
+
+            claimed = self.filter(pk=job.pk, status=self.model.PENDING).update(
+                status=self.model.RUNNING,
+                claimed_by=worker_id,
+                claimed_at=now,
+                attempts=F("attempts") + 1,
+            )
+            if claimed:
+                return self.get(pk=job.pk)
+
+    def renew_claims(self, worker_id, job_ids):
+        """Mark the jobs `worker_id` is still running as alive, so `requeue_stale` leaves them alone."""
+        return self.filter(pk__in=job_ids, status=self.model.RUNNING, claimed_by=worker_id).update(claimed_at=timezone.now())
+
+    def requeue_stale(self, older_than):
+        """
+        Return jobs whose claim wasn't renewed for `older_than` seconds, left by
+        a worker that died, to the queue. Jobs that used up their attempts fail
+        instead: a job that kills its worker would otherwise crash one forever.
+        """
+        now = timezone.now()
+        stale = self.filter(status=self.model.RUNNING, claimed_at__lt=now - timedelta(seconds=older_than))
+        failed = stale.filter(attempts__gte=F("max_attempts")).update(
+            status=self.model.FAILED,
+            claimed_by="",
+            error="The worker running the job died.",
+            finished_at=now,
+        )
+        if failed:
+            logger.error("Failed %d stale job(s) that used up their attempts", failed)
+        return stale.update(status=self.model.PENDING, claimed_by="")
@@ -0,0 +1,34 @@
+"""
+Registry of the functions that background jobs can run.
+
+Apps register their job functions in a `jobs.py` module:
+
+    @register("tracker.purge_project", label="Deleting project")
+    def purge_project_job(job, project_id):
+        ...
+
+A job function receives the running `Job` (to report progress with
+`job.set_progress`) followed by the keyword arguments it was enqueued with.
+"""
+from dataclasses import dataclass
+from typing import Callable
+
+@dataclass(frozen=True)
+class JobType:
+    name: str
+    label: str
+    func: Callable
+
+_registry = {}
+
+def register(name, label=None):
+    def decorator(func):
+        _registry[name] = JobType(name=name, label=label or name, func=func)
+        return func
+    return decorator
+
+def get_job_type(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise LookupError(f"No job registered as '{name}'.")
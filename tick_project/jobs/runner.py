@@ -0,0 +1,51 @@
+import logging
+import traceback
+from datetime import timedelta
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_job_type
+
+logger = logging.getLogger(__name__)
+
+# seconds before the first retry of a failed job, doubled on every further attempt
+RETRY_DELAY = 10
+
+def run_job(job):
+    """Run a claimed job and record its outcome, retrying it later if attempts remain."""
+    try:
+        job_type = get_job_type(job.name)
+        job_type.func(job, **job.kwargs)
+    except Exception:
+        job.error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = Job.PENDING
+            job.run_after = timezone.now() + timedelta(seconds=RETRY_DELAY * 2 ** (job.attempts - 1))
+            logger.warning("Job %s failed (attempt %d/%d), retrying", job, job.attempts, job.max_attempts)
+        else:
+            job.status = Job.FAILED
+            job.finished_at = timezone.now()
+            logger.error("Job %s failed after %d attempts", job, job.attempts)
+    else:
+        job.status = Job.DONE
+        job.error = ""
+        job.finished_at = timezone.now()
+    job.save(update_fields=["status", "error", "run_after", "finished_at"])
+    return job
+
+def run_claimed_job(job_id):
+    """Entry point of worker processes."""
+    close_old_connections()
+    try:
+        return run_job(Job.objects.get(pk=job_id)).status
+    finally:
+        close_old_connections()
+
+def run_pending(worker_id="inline"):
+    """Run every runnable job in the current process. Returns the number of jobs run."""
+    count = 0
+    while (job := Job.objects.claim_next(worker_id)) is not None:
+        run_job(job)
+        count += 1
+    return count
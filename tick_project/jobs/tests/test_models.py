@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from datetime import timedelta
+
+from ..models import Job
+
+User = get_user_model()
+
+class JobManagerTest(TestCase):
+    def test_enqueue_creates_pending_job(self):
+        job = Job.objects.enqueue("test.job", value=1)
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertEqual(job.kwargs, {"value": 1})
+
+    def test_claim_next_claims_oldest_job_once(self):
+        first = Job.objects.enqueue("test.job")
+        second = Job.objects.enqueue("test.job")
+
+        claimed = Job.objects.claim_next("worker-1")
+        self.assertEqual(claimed, first)
+        self.assertEqual(claimed.status, Job.RUNNING)
+        self.assertEqual(claimed.claimed_by, "worker-1")
+        self.assertEqual(claimed.attempts, 1)
+
+        self.assertEqual(Job.objects.claim_next("worker-2"), second)
+        self.assertIsNone(Job.objects.claim_next("worker-3"))
+
+    def test_claim_next_skips_jobs_scheduled_later(self):
+        Job.objects.create(name="test.job", run_after=timezone.now() + timedelta(minutes=1))
+        self.assertIsNone(Job.objects.claim_next("worker-1"))
+
+    def test_requeue_stale_returns_orphaned_jobs_to_queue(self):
+        job = Job.objects.enqueue("test.job")
+        Job.objects.claim_next("worker-1")
+        Job.objects.filter(pk=job.pk).update(claimed_at=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(Job.objects.requeue_stale(60), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.PENDING)
+
+    def test_stale_job_out_of_attempts_fails_instead_of_being_requeued(self):
+        job = Job.objects.create(name="test.job", max_attempts=2)
+        for _ in range(2):
+            Job.objects.claim_next("worker-1")
+            Job.objects.filter(pk=job.pk).update(claimed_at=timezone.now() - timedelta(hours=1))
+            Job.objects.requeue_stale(60)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertIsNotNone(job.finished_at)
+        self.assertIsNone(Job.objects.claim_next("worker-1"))
+
+    def test_renewed_claims_are_not_requeued(self):
+        running = Job.objects.enqueue("test.job")
+        orphaned = Job.objects.enqueue("test.job")
+        Job.objects.claim_next("worker-1")
+        Job.objects.claim_next("worker-2")
+        Job.objects.update(claimed_at=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(Job.objects.renew_claims("worker-1", [running.pk, orphaned.pk]), 1)
+        self.assertEqual(Job.objects.requeue_stale(60), 1)
+        running.refresh_from_db()
+        orphaned.refresh_from_db()
+        self.assertEqual(running.status, Job.RUNNING)
+        self.assertEqual(orphaned.status, Job.PENDING)
+
+class JobModelTest(TestCase):
+    def test_set_progress_and_percentage(self):
+        job = Job.objects.enqueue("test.job")
+        job.set_progress(25, total=200)
+        job.refresh_from_db()
+        self.assertEqual((job.progress, job.total), (25, 200))
+        self.assertEqual(job.percentage(), 12)
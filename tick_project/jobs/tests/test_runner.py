@@ -0,0 +1,55 @@
+from django.test import TestCase
+
+from ..models import Job
+from ..registry import register
+from ..runner import run_pending
+
+calls = []
+
+@register("test.count", label="Counting")
+def count_job(job, items):
+    for item in range(1, items + 1):
+        job.set_progress(item, items)
+    calls.append(items)
+
+@register("test.fail")
+def failing_job(job):
+    raise RuntimeError("boom")
+
+class RunnerTest(TestCase):
+    def test_successful_job_is_done_with_progress(self):
+        job = Job.objects.enqueue("test.count", items=3)
+        self.assertEqual(run_pending(), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual(job.progress, 3)
+        self.assertEqual(job.percentage(), 100)
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(job.label, "Counting")
+
+    def test_failing_job_is_retried_later(self):
+        job = Job.objects.enqueue("test.fail")
+        run_pending()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertIn("boom", job.error)
+        # the retry waits for its delay
+        self.assertEqual(run_pending(), 0)
+
+    def test_job_fails_after_last_attempt(self):
+        job = Job.objects.enqueue("test.fail")
+        Job.objects.filter(pk=job.pk).update(attempts=job.max_attempts - 1)
+        run_pending()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, job.max_attempts)
+
+    def test_unknown_job_fails(self):
+        job = Job.objects.create(name="test.unknown", max_attempts=1)
+        run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
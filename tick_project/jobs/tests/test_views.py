@@ -0,0 +1,37 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Job
+
+User = get_user_model()
+
+class JobDetailViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="test@example.com", password="StrongPassword123")
+        self.client.force_login(self.user)
+        self.job = Job.objects.enqueue("tracker.purge_project", user=self.user, project_id=1)
+        self.url = reverse("jobs:detail", kwargs={"pk": self.job.pk})
+
+    def test_shows_progress_and_refreshes_while_running(self):
+        self.job.set_progress(1, 4)
+        response = self.client.get(self.url)
+        self.assertTemplateUsed(response, "jobs/job_detail.html")
+        self.assertContains(response, "Deleting project")
+        self.assertContains(response, 'value="25"')
+        self.assertContains(response, '<meta http-equiv="refresh" content="1">')
+
+    def test_finished_job_continues_to_next(self):
+        Job.objects.filter(pk=self.job.pk).update(status=Job.DONE)
+        response = self.client.get(f"{self.url}?next=/projects/")
+        self.assertContains(response, 'content="1;url=/projects/"')
+
+    def test_ignores_external_next(self):
+        Job.objects.filter(pk=self.job.pk).update(status=Job.DONE)
+        response = self.client.get(f"{self.url}?next=https://example.com/")
+        self.assertIsNone(response.context["next"])
+
+    def test_other_users_jobs_are_not_found(self):
+        other = User.objects.create_user(email="other@example.com", password="StrongPassword123")
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
@@ -0,0 +1,23 @@
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render, get_object_or_404
+from django.utils.http import url_has_allowed_host_and_scheme
+
+from .models import Job
+
+@login_required
+def job_detail(request, pk):
+    """
+    Show the progress of one of the user's background jobs. The page refreshes
+    itself until the job is finished, then continues to `next` if it is given.
+    """
+    job = get_object_or_404(Job, pk=pk, user=request.user)
+
+    next_url = request.GET.get("next")
+    if not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}, require_https=request.is_secure()):
+        next_url = None
+
+    context = {
+        "job": job,
+        "next": next_url,
+    }
+    return render(request, "jobs/job_detail.html", context)
@@ -0,0 +1,73 @@
+import json
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from monitoring.slow_queries import fingerprint
+
+class Command(BaseCommand):
+    help = (
+        "Summarise the slow query log by query fingerprint, slowest total first, "
+        "with the call sites that ran each query and its latest query plan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--log", default=settings.SLOW_QUERY_LOG, help="log file (rotated files are read too)")
+        parser.add_argument("--top", type=int, default=10, help="number of fingerprints to show")
+
+    def read_entries(self, path):
+        path = Path(path)
+        # oldest rotated file first: log.5, ..., log.1, log
+        files = sorted(path.parent.glob(f"{path.name}.*"), key=lambda file: -int(file.suffix[1:]) if file.suffix[1:].isdigit() else 0)
+        for file in files + [path]:
+            if not file.exists():
+                continue
+            with open(file, encoding="utf-8") as log:
+                for line in log:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+
+    def handle(self, *args, **options):
+        groups = {}
+        for entry in self.read_entries(options["log"]):
+            key, normalised = fingerprint(entry["sql"])
+            group = groups.setdefault(key, {
+                "sql": normalised,
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "call_sites": Counter(),
+                "views": Counter(),
+                "plan": None,
+            })
+            group["count"] += 1
+            group["total_ms"] += entry["duration_ms"]
+            group["max_ms"] = max(group["max_ms"], entry["duration_ms"])
+            group["call_sites"][entry.get("call_site") or "-"] += 1
+            group["views"][entry.get("view") or "-"] += 1
+            group["plan"] = entry.get("plan") or group["plan"]
+
+        if not groups:
+            self.stdout.write("No slow queries logged.")
+            return
+
+        ranked = sorted(groups.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        for key, group in ranked[:options["top"]]:
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{key}  {group['count']} queries, {group['total_ms']:.0f} ms total, "
+                f"{group['total_ms'] / group['count']:.1f} ms mean, {group['max_ms']:.1f} ms max"
+            ))
+            self.stdout.write(f"  {group['sql']}")
+            for call_site, count in group["call_sites"].most_common(3):
+                self.stdout.write(f"  from {call_site} ({count})")
+            for view, count in group["views"].most_common(3):
+                self.stdout.write(f"  view {view} ({count})")
+            for step in group["plan"] or []:
+                # a SCAN without an index reads the whole table
+                style = self.style.WARNING if step.startswith("SCAN") and "INDEX" not in step else str
+                self.stdout.write(style(f"  plan: {step}"))
+            self.stdout.write("")
@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from monitoring.tracing import find_trace
+
+BAR_WIDTH = 40
+
+class Command(BaseCommand):
+    help = (
+        "Print a flame-style breakdown of a traced request: each span with its "
+        "total and self time and a bar placing it on the request's timeline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("trace_id", nargs="?", help="trace id, from the X-Trace-Id response header")
+        parser.add_argument("--list", type=int, metavar="N", help="list the N most recent traces instead")
+        parser.add_argument("--min-ms", type=float, default=0, help="hide spans shorter than this")
+
+    def handle(self, *args, **options):
+        if options["list"]:
+            return self.list_traces(options["list"])
+        if not options["trace_id"]:
+            raise CommandError("Give a trace id, or --list N to see recent traces.")
+
+        spans = find_trace(options["trace_id"])
+        if spans is None:
+            raise CommandError(f"Trace {options['trace_id']} not found in {settings.TRACE_DIR}.")
+
+        children = {}
+        for span in spans:
+            span["start"] = int(span["startTimeUnixNano"])
+            span["end"] = int(span["endTimeUnixNano"])
+            children.setdefault(span.get("parentSpanId"), []).append(span)
+        for siblings in children.values():
+            siblings.sort(key=lambda span: span["start"])
+
+        roots = children.get(None, [])
+        if not roots:
+            raise CommandError("Trace has no root span.")
+        root = roots[0]
+        self.timeline = (root["start"], max(root["end"] - root["start"], 1))
+        self.children = children
+        self.min_ns = options["min_ms"] * 1e6
+
+        self.stdout.write(f"{'span':<60} {'total ms':>9} {'self ms':>9}  timeline")
+        for span in roots:
+            self.write_span(span, 0)
+
+    def write_span(self, span, depth):
+        duration = span["end"] - span["start"]
+        if duration < self.min_ns and depth:
+            return
+        children = self.children.get(span["spanId"], [])
+        own = duration - sum(child["end"] - child["start"] for child in children)
+
+        timeline_start, timeline_length = self.timeline
+        offset = min(round((span["start"] - timeline_start) / timeline_length * BAR_WIDTH), BAR_WIDTH - 1)
+        length = max(1, round(duration / timeline_length * BAR_WIDTH))
+        bar = " " * offset + "█" * min(length, BAR_WIDTH - offset)
+
+        name = ("  " * depth + span["name"].replace("\n", " "))[:60]
+        self.stdout.write(f"{name:<60} {duration / 1e6:>9.2f} {max(own, 0) / 1e6:>9.2f}  {bar}")
+        for child in children:
+            self.write_span(child, depth + 1)
+
+    def list_traces(self, count):
+        traces = []
+        for path in sorted(Path(settings.TRACE_DIR).glob("traces-*.jsonl"), reverse=True):
+            with open(path, encoding="utf-8") as file:
+                lines = file.readlines()
+            for line in reversed(lines):
+                spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+                root = next(span for span in spans if "parentSpanId" not in span)
+                duration = (int(root["endTimeUnixNano"]) - int(root["startTimeUnixNano"])) / 1e6
+                traces.append((root["traceId"], duration, root["name"]))
+                if len(traces) == count:
+                    break
+            if len(traces) == count:
+                break
+        for trace_id, duration, name in traces:
+            self.stdout.write(f"{trace_id}  {duration:>9.2f} ms  {name}")
@@ -0,0 +1,133 @@
+"""
+Metric definitions and their Prometheus text rendering.
+
+    REQUESTS.inc(view="tracker:dashboard", method="GET", status="200")
+    REQUEST_DURATION.observe(0.042, view="tracker:dashboard")
+
+Values are kept in the shared store (see `store.py`), so every worker process
+reports the same totals. Gauges that can be read from the database, such as
+the number of running timers, are computed when the metrics are rendered.
+"""
+import math
+
+from .store import get_store
+
+# seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+def render_labels(labels):
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    return ",".join(f'{name}="{escape(value)}"' for name, value in sorted(labels.items()))
+
+def format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+class Metric:
+    type = None
+    registry = []
+
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        Metric.registry.append(self)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+
+    def samples(self, values):
+        """Rendered sample lines for this metric from the stored `values`."""
+        return [
+            f"{name}{{{labels}}} {format_value(value)}" if labels else f"{name} {format_value(value)}"
+            for (name, labels), value in sorted(values.items())
+            if name == self.name
+        ]
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        get_store().add(self.name, render_labels(labels), amount)
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, buckets):
+        super().__init__(name, documentation)
+        self.buckets = tuple(buckets) + (math.inf,)
+
+    def observe(self, value, **labels):
+        store = get_store()
+        rendered = render_labels(labels)
+        # buckets are cumulative; every bucket is written so each series lists all of them
+        for bound in self.buckets:
+            bucket_labels = ",".join(filter(None, (rendered, f'le="{format_value(bound)}"')))
+            store.add(f"{self.name}_bucket", bucket_labels, 1 if value <= bound else 0)
+        store.add(f"{self.name}_sum", rendered, value)
+        store.add(f"{self.name}_count", rendered, 1)
+
+    def samples(self, values):
+        def sort_key(item):
+            (name, labels), _ = item
+            # `le` is the last label: group a series' buckets together, in increasing order of `le`
+            base, _, bound = labels.rpartition('le="')
+            return (base, float(bound.rstrip('"').replace("+Inf", "inf")))
+
+        buckets = sorted(
+            ((key, value) for key, value in values.items() if key[0] == f"{self.name}_bucket"),
+            key=sort_key,
+        )
+        lines = [f"{name}{{{labels}}} {format_value(value)}" for (name, labels), value in buckets]
+        for suffix in ("_sum", "_count"):
+            lines += [
+                f"{name}{{{labels}}} {format_value(value)}" if labels else f"{name} {format_value(value)}"
+                for (name, labels), value in sorted(values.items())
+                if name == self.name + suffix
+            ]
+        return lines
+
+class Gauge(Metric):
+    """A value computed from `collect()` when the metrics are rendered."""
+    type = "gauge"
+
+    def __init__(self, name, documentation, collect):
+        super().__init__(name, documentation)
+        self.collect = collect
+
+    def samples(self, values):
+        value = self.collect(values)
+        if value is None:
+            return []
+        return [f"{self.name} {format_value(value)}"]
+
+def active_timers(values):
+    from tracker.models import Session
+    return Session.objects.filter(end_time__isnull=True).count()
+
+def cache_hit_ratio(values):
+    hits = values.get(("tick_cache_requests_total", 'result="hit"'), 0)
+    misses = values.get(("tick_cache_requests_total", 'result="miss"'), 0)
+    if not hits + misses:
+        return None
+    return round(hits / (hits + misses), 4)
+
+REQUESTS = Counter("tick_requests_total", "Requests served, by view, method and status code.")
+REQUEST_DURATION = Histogram("tick_request_duration_seconds", "Time spent serving a request, by view.", LATENCY_BUCKETS)
+REQUEST_QUERIES = Histogram("tick_request_queries", "SQL queries run while serving a request, by view.", QUERY_COUNT_BUCKETS)
+REQUEST_QUERY_DURATION = Histogram("tick_request_query_seconds", "Time spent in SQL queries while serving a request, by view.", LATENCY_BUCKETS)
+CACHE_REQUESTS = Counter("tick_cache_requests_total", "Cache lookups, by result.")
+CACHE_HIT_RATIO = Gauge("tick_cache_hit_ratio", "Share of cache lookups that were hits.", cache_hit_ratio)
+SESSION_WRITES = Counter("tick_session_writes_total", "Tracked sessions written, by action.")
+ACTIVE_TIMERS = Gauge("tick_active_timers", "Sessions currently being timed.", active_timers)
+
+def render():
+    """Render every metric in the Prometheus text exposition format."""
+    values = get_store().values(prefix="tick_")
+    lines = []
+    for metric in Metric.registry:
+        lines += metric.header()
+        lines += metric.samples(values)
+    return "\n".join(lines) + "\n"
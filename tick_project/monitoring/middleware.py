@@ -0,0 +1,147 @@
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from .metrics import CACHE_REQUESTS, REQUESTS, REQUEST_DURATION, REQUEST_QUERIES, REQUEST_QUERY_DURATION
+from .slow_queries import SlowQueryLogger
+from .store import get_store
+from . import tracing
+
+class QueryTimer:
+    """Database execute wrapper counting the queries of one request and the time spent in them."""
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+class MetricsMiddleware:
+    """
+    Record the count, latency and SQL queries of every request by view name
+    (requests that don't resolve to a view are reported as "unresolved"), and
+    the hits and misses of the default cache.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        started = time.perf_counter()
+        status = "500"
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timer))
+                response = self.get_response(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            duration = time.perf_counter() - started
+            match = getattr(request, "resolver_match", None)
+            view = match.view_name if match else "unresolved"
+
+            REQUESTS.inc(view=view, method=request.method, status=status)
+            REQUEST_DURATION.observe(duration, view=view)
+            REQUEST_QUERIES.observe(timer.count, view=view)
+            REQUEST_QUERY_DURATION.observe(timer.seconds, view=view)
+            self.record_cache_counts()
+            get_store().flush()
+
+    def record_cache_counts(self):
+        # `cache` is this thread's own backend instance, so its counts are those of the thread's requests
+        take_counts = getattr(cache, "take_counts", None)
+        if take_counts is None:
+            return
+        hits, misses = take_counts()
+        if hits:
+            CACHE_REQUESTS.inc(hits, result="hit")
+        if misses:
+            CACHE_REQUESTS.inc(misses, result="miss")
+
+class SlowQueryMiddleware:
+    """Log the queries of each request slower than SLOW_QUERY_THRESHOLD_MS (see `slow_queries.py`)."""
+    def __init__(self, get_response):
+        if settings.SLOW_QUERY_THRESHOLD_MS is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        logger = SlowQueryLogger(request)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(logger))
+            return self.get_response(request)
+
+class TracingMiddleware:
+    """
+    Trace a sample of requests (see `tracing.py`). Should come first in
+    MIDDLEWARE, with TraceViewMiddleware last, so that the time spent in the
+    rest of the middleware chain is reported around the view.
+    """
+    def __init__(self, get_response):
+        if not settings.TRACE_SAMPLE_RATE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        tracing.instrument_templates()
+
+    def __call__(self, request):
+        if not tracing.should_sample():
+            return self.get_response(request)
+
+        with tracing.start_trace() as trace:
+            with tracing.span(f"{request.method} {request.path}", tracing.SERVER, **{
+                "http.method": request.method,
+                "http.target": request.get_full_path(),
+            }) as root, ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(tracing.query_span))
+                response = self.get_response(request)
+
+                match = getattr(request, "resolver_match", None)
+                if match:
+                    root.attributes["http.route"] = match.view_name
+                root.attributes["http.status_code"] = response.status_code
+
+            view = getattr(request, "_trace_view_span", None)
+            if view is not None:
+                trace.add_span("middleware (request)", root.start, view.start, root.span_id)
+                trace.add_span("middleware (response)", view.end, root.end, root.span_id)
+            tracing.export(trace)
+
+        response["X-Trace-Id"] = trace.trace_id
+        return response
+
+class TraceViewMiddleware:
+    """
+    Record the view of a traced request as a span. Must come last in
+    MIDDLEWARE, so the span opens just before Django calls the view and
+    closes as soon as its response (or exception) comes back.
+    """
+    def __init__(self, get_response):
+        if not settings.TRACE_SAMPLE_RATE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            view = getattr(request, "_trace_view_span", None)
+            if view is not None and view.end is None:
+                tracing.current_trace().end_span(view)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        trace = tracing.current_trace()
+        if trace is not None:
+            request._trace_view_span = trace.start_span(f"view {request.resolver_match.view_name}")
+        return None
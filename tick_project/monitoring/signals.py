@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from tracker.models import Session
+from .metrics import SESSION_WRITES
+
+@receiver(post_save, sender=Session)
+def session_saved(sender, instance, created, **kwargs):
+    SESSION_WRITES.inc(action="created" if created else "updated")
+
+@receiver(post_delete, sender=Session)
+def session_deleted(sender, instance, **kwargs):
+    SESSION_WRITES.inc(action="deleted")
@@ -0,0 +1,162 @@
+"""
+Log of queries slower than SLOW_QUERY_THRESHOLD_MS.
+
+Each entry is a JSON line with the SQL, the types of its parameters, the view
+and the innermost project call site that ran it, and SQLite's
+`EXPLAIN QUERY PLAN` for SELECT statements. The log rotates at
+SLOW_QUERY_LOG_MAX_BYTES; worker processes append to the same file, so an
+entry can occasionally be lost while a file is being rotated.
+
+`python manage.py slow_queries` groups the entries by query fingerprint.
+"""
+import hashlib
+import inspect
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from django.conf import settings
+
+# frames from this module, the rest of the instrumentation (query timers and
+# template spans) and the Python installation are not call sites worth reporting
+IGNORED_PATHS = (
+    __file__,
+    str(Path(__file__).with_name("middleware.py")),
+    str(Path(__file__).with_name("tracing.py")),
+    sys.prefix,
+    sys.base_prefix,
+)
+
+_logger = None
+_logger_lock = threading.Lock()
+
+def get_logger():
+    global _logger
+    if _logger is None:
+        with _logger_lock:
+            if _logger is None:
+                path = Path(settings.SLOW_QUERY_LOG)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                handler = RotatingFileHandler(
+                    path,
+                    maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+                    backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+                    encoding="utf-8",
+                )
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger = logging.getLogger(__name__)
+                logger.addHandler(handler)
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                _logger = logger
+    return _logger
+
+def fingerprint(sql):
+    """
+    Normalise `sql` so that queries differing only in literal values or the
+    length of an IN list share a fingerprint. Returns (fingerprint, normalised sql).
+    """
+    normalised = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    normalised = re.sub(r"\b\d+(?:\.\d+)?\b", "?", normalised)
+    normalised = normalised.replace("%s", "?")
+    normalised = re.sub(r"\(\s*\?(?:\s*,\s*\?)*\s*\)", "(...)", normalised)
+    normalised = re.sub(r"\s+", " ", normalised).strip()
+    return hashlib.sha1(normalised.encode()).hexdigest()[:12], normalised
+
+def params_shape(params, many):
+    if params is None:
+        return []
+    if many:
+        params = list(params)
+        return {"rows": len(params), "row": params_shape(params[0], False) if params else []}
+    if isinstance(params, dict):
+        return {name: type(value).__name__ for name, value in params.items()}
+    return [type(value).__name__ for value in params]
+
+def wrapper_code(wrapper):
+    """Return the code object run when the execute wrapper `wrapper` is called."""
+    function = wrapper if inspect.isfunction(wrapper) else getattr(type(wrapper), "__call__", None)
+    return getattr(function, "__code__", None)
+
+def call_site(wrappers=()):
+    """
+    Return the innermost frame outside Django, other libraries, the standard
+    library, the monitoring instrumentation and the execute wrappers
+    `wrappers`, which may run around this one (e.g. the database load of
+    `tick_project/throttling.py`).
+    """
+    skipped = {wrapper_code(wrapper) for wrapper in wrappers}
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (
+            frame.f_code not in skipped
+            and not filename.startswith(IGNORED_PATHS)
+            and "site-packages" not in filename
+            and not filename.startswith("<")
+        ):
+            try:
+                location = str(Path(filename).relative_to(settings.BASE_DIR))
+            except ValueError:
+                location = filename
+            return f"{location}:{frame.f_lineno} in {frame.f_code.co_qualname}"
+        frame = frame.f_back
+    return None
+
+def explain(connection, sql, params):
+    if connection.vendor != "sqlite" or not sql.lstrip().upper().startswith("SELECT"):
+        return None
+    # a raw cursor, so the EXPLAIN query does not go through the execute wrappers again
+    cursor = connection.create_cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+    except Exception as error:
+        return [f"EXPLAIN failed: {error}"]
+    finally:
+        cursor.close()
+
+class SlowQueryLogger:
+    """
+    Database execute wrapper logging the queries of one request that take
+    longer than `threshold` seconds.
+    """
+    def __init__(self, request=None, threshold=None):
+        self.request = request
+        if threshold is None:
+            threshold = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+        self.threshold = threshold
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - started
+        if duration >= self.threshold:
+            self.log(sql, params, many, context["connection"], duration)
+        return result
+
+    def view_name(self):
+        match = getattr(self.request, "resolver_match", None)
+        return match.view_name if match else None
+
+    def log(self, sql, params, many, connection, duration):
+        query_fingerprint, _ = fingerprint(sql)
+        entry = {
+            "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "duration_ms": round(duration * 1000, 2),
+            "fingerprint": query_fingerprint,
+            "sql": sql,
+            "params": params_shape(params, many),
+            "database": connection.alias,
+            "view": self.view_name(),
+            "path": getattr(self.request, "path", None),
+            "call_site": call_site(connection.execute_wrappers),
+            "plan": None if many else explain(connection, sql, params),
+        }
+        get_logger().info(json.dumps(entry, default=str))
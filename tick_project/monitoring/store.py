@@ -0,0 +1,88 @@
+"""
+Metric values shared by every worker process on the host.
+
+Each process adds to an in-memory buffer and periodically merges it into a
+local SQLite file (see `tick_project.sqlite_store`), so requests do not write
+to the file one by one. Values in the file are totals across all processes
+since the file was created.
+"""
+import atexit
+import threading
+import time
+
+from django.conf import settings
+
+from tick_project.sqlite_store import LocalConnection
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metric (
+    name TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (name, labels)
+);
+"""
+
+# seconds a process keeps its values buffered before merging them into the file
+FLUSH_INTERVAL = 1.0
+
+class MetricStore:
+    def __init__(self, path, flush_interval=FLUSH_INTERVAL):
+        self._connection = LocalConnection(path, SCHEMA)
+        self.flush_interval = flush_interval
+        self._buffer = {}
+        self._lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+
+    def add(self, name, labels, amount):
+        """Add `amount` to the series `name{labels}`, where labels is a rendered label string."""
+        key = (name, labels)
+        with self._lock:
+            self._buffer[key] = self._buffer.get(key, 0) + amount
+
+    def flush(self, force=False):
+        if not force and time.monotonic() - self._flushed_at < self.flush_interval:
+            return
+        with self._lock:
+            pending, self._buffer = self._buffer, {}
+            self._flushed_at = time.monotonic()
+        if not pending:
+            return
+        db = self._connection.get()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany(
+                "INSERT INTO metric (name, labels, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (name, labels) DO UPDATE SET value = value + excluded.value",
+                [(name, labels, value) for (name, labels), value in pending.items()],
+            )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def values(self, prefix=""):
+        """Return {(name, labels): value} for every stored series whose name starts with `prefix`."""
+        self.flush(force=True)
+        rows = self._connection.get().execute(
+            "SELECT name, labels, value FROM metric WHERE name LIKE ? ESCAPE '\\'",
+            (prefix.replace("_", "\\_") + "%",),
+        )
+        return {(name, labels): value for name, labels, value in rows}
+
+    def clear(self):
+        with self._lock:
+            self._buffer = {}
+        self._connection.get().execute("DELETE FROM metric")
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = MetricStore(settings.METRICS_LOCATION)
+                atexit.register(_store.flush, force=True)
+    return _store
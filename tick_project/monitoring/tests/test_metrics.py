@@ -0,0 +1,100 @@
+import tempfile
+import threading
+from pathlib import Path
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from ..metrics import Counter, Histogram, Metric, render_labels
+from ..middleware import MetricsMiddleware
+from ..store import MetricStore, get_store
+
+class MetricStoreTest(SimpleTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "metrics.sqlite3"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_values_are_summed_across_stores(self):
+        # two stores on one file stand in for two worker processes
+        first, second = MetricStore(self.path), MetricStore(self.path)
+        first.add("tick_test_total", 'view="a"', 2)
+        second.add("tick_test_total", 'view="a"', 3)
+        second.add("tick_test_total", 'view="b"', 1)
+        first.flush(force=True)
+        second.flush(force=True)
+
+        self.assertEqual(first.values(), {
+            ("tick_test_total", 'view="a"'): 5,
+            ("tick_test_total", 'view="b"'): 1,
+        })
+
+    def test_flush_waits_for_interval(self):
+        store = MetricStore(self.path, flush_interval=60)
+        other = MetricStore(self.path)
+        store.add("tick_test_total", "", 1)
+        store.flush()
+        self.assertEqual(other.values(), {})
+        store.flush(force=True)
+        self.assertEqual(other.values(), {("tick_test_total", ""): 1})
+
+class RenderTest(SimpleTestCase):
+    def setUp(self):
+        self.registry = Metric.registry[:]
+
+    def tearDown(self):
+        Metric.registry[:] = self.registry
+
+    def test_labels_are_sorted_and_escaped(self):
+        self.assertEqual(render_labels({"view": 'a"b', "method": "GET"}), 'method="GET",view="a\\"b"')
+
+    def test_histogram_samples_are_cumulative_and_ordered(self):
+        histogram = Histogram("tick_test_seconds", "Test.", buckets=(0.1, 1))
+        values = {}
+        for value in (0.05, 0.5, 2):
+            for bound, increment in (("+Inf", 1), (1, value <= 1), (0.1, value <= 0.1)):
+                key = ("tick_test_seconds_bucket", f'le="{bound}"')
+                values[key] = values.get(key, 0) + increment
+        values[("tick_test_seconds_sum", "")] = 2.55
+        values[("tick_test_seconds_count", "")] = 3
+
+        self.assertEqual(histogram.samples(values), [
+            'tick_test_seconds_bucket{le="0.1"} 1',
+            'tick_test_seconds_bucket{le="1"} 2',
+            'tick_test_seconds_bucket{le="+Inf"} 3',
+            "tick_test_seconds_sum 2.55",
+            "tick_test_seconds_count 3",
+        ])
+
+    def test_counter_samples(self):
+        counter = Counter("tick_test_total", "Test.")
+        values = {("tick_test_total", 'view="a"'): 2, ("tick_other_total", ""): 1}
+        self.assertEqual(counter.samples(values), ['tick_test_total{view="a"} 2'])
+
+class MetricsMiddlewareTest(SimpleTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        location = str(Path(self.tmp_dir.name) / "cache.sqlite3")
+        settings = override_settings(CACHES={"default": {"BACKEND": "tick_project.cache.SQLiteCache", "LOCATION": location}})
+        settings.enable()
+        self.addCleanup(settings.disable)
+        get_store().clear()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_cache_lookups_are_counted_in_every_thread(self):
+        def view(request):
+            cache.get("missing")
+            return HttpResponse()
+        middleware = MetricsMiddleware(view)
+
+        # each thread has its own cache backend instance, with its own counts
+        for _ in range(2):
+            thread = threading.Thread(target=middleware, args=(RequestFactory().get("/"),))
+            thread.start()
+            thread.join()
+
+        self.assertEqual(get_store().values("tick_cache_requests_total"), {("tick_cache_requests_total", 'result="miss"'): 2})
@@ -0,0 +1,85 @@
+import json
+import tempfile
+from datetime import date
+from io import StringIO
+from pathlib import Path
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from tracker.models import Project, Session, Task
+from .. import slow_queries
+from ..slow_queries import SlowQueryLogger, fingerprint
+
+User = get_user_model()
+
+class FingerprintTest(TestCase):
+    def test_literals_and_in_lists_are_normalised(self):
+        first, _ = fingerprint("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'a'")
+        second, normalised = fingerprint("SELECT *  FROM t WHERE id IN (%s) AND name = 'bb'")
+        self.assertEqual(first, second)
+        self.assertEqual(normalised, "SELECT * FROM t WHERE id IN (...) AND name = ?")
+
+class SlowQueryLoggerTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log = Path(self.tmp_dir.name) / "slow.jsonl"
+        self.settings_override = override_settings(SLOW_QUERY_LOG=str(self.log))
+        self.settings_override.enable()
+        slow_queries._logger = None
+        self.user = User.objects.create_user(email="test@example.com", password="StrongPassword123")
+
+    def tearDown(self):
+        for handler in slow_queries.get_logger().handlers[:]:
+            slow_queries.get_logger().removeHandler(handler)
+            handler.close()
+        slow_queries._logger = None
+        self.settings_override.disable()
+        self.tmp_dir.cleanup()
+
+    def entries(self):
+        return [json.loads(line) for line in self.log.read_text().splitlines()]
+
+    def test_logs_query_with_plan_and_call_site(self):
+        with connection.execute_wrapper(SlowQueryLogger(threshold=0)):
+            list(Session.objects.by_user_and_start_date_within(self.user, date=date.today()))
+
+        entry = self.entries()[0]
+        self.assertIn('FROM "tracker_session"', entry["sql"])
+        self.assertEqual(entry["params"], ["str", "str", "int"])
+        self.assertTrue(entry["call_site"].startswith("monitoring/tests/test_slow_queries.py"))
+        self.assertTrue(any("tracker_session" in step for step in entry["plan"]))
+
+    def test_call_site_skips_the_other_middleware_wrappers(self):
+        Task.objects.create(project=Project.objects.create(user=self.user, name="General"), name="Pending task")
+        # every middleware wrapping queries, as configured outside tests
+        with override_settings(
+            SLOW_QUERY_THRESHOLD_MS=0, TRACE_SAMPLE_RATE=1.0, TRACE_DIR=self.tmp_dir.name, OVERLOAD_DB_LATENCY_MS=200
+        ):
+            client = Client()
+            client.force_login(self.user)
+            client.get(reverse("tracker:tasks"))
+
+        entries = [entry for entry in self.entries() if entry["view"] == "tracker:tasks"]
+        self.assertTrue(entries)
+        for entry in entries:
+            self.assertFalse(entry["call_site"].startswith(("monitoring/", "tick_project/throttling.py")), entry["call_site"])
+        task_list = [entry for entry in entries if 'FROM "tracker_task"' in entry["sql"] and "NOT" in entry["sql"]]
+        self.assertTrue(task_list[0]["call_site"].startswith("tracker/views/tasks.py"), task_list[0]["call_site"])
+
+    def test_fast_queries_are_not_logged(self):
+        with connection.execute_wrapper(SlowQueryLogger(threshold=60)):
+            Project.objects.count()
+        self.assertFalse(self.log.exists() and self.log.read_text())
+
+    def test_command_groups_by_fingerprint(self):
+        with connection.execute_wrapper(SlowQueryLogger(threshold=0)):
+            Project.objects.filter(pk=1).exists()
+            Project.objects.filter(pk=2).exists()
+
+        out = StringIO()
+        call_command("slow_queries", log=str(self.log), stdout=out)
+        self.assertIn("2 queries", out.getvalue())
+        self.assertIn("test_command_groups_by_fingerprint", out.getvalue())
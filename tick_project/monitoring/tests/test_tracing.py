@@ -0,0 +1,118 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.http import Http404
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tracker.models import Project, Task, Session
+from .. import tracing
+
+User = get_user_model()
+
+class ExceptionRecorderMiddleware:
+    exceptions = []
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_exception(self, request, exception):
+        self.exceptions.append(type(exception))
+
+class SpanTest(TestCase):
+    def test_spans_are_nested(self):
+        with tracing.start_trace() as trace:
+            with tracing.span("outer") as outer:
+                with tracing.span("inner") as inner:
+                    pass
+        self.assertEqual([span.name for span in trace.spans], ["outer", "inner"])
+        self.assertIsNone(outer.parent_id)
+        self.assertEqual(inner.parent_id, outer.span_id)
+        self.assertGreaterEqual(inner.end, inner.start)
+
+    def test_no_spans_without_trace(self):
+        with tracing.span("ignored") as span:
+            self.assertIsNone(span)
+
+@override_settings(TRACE_SAMPLE_RATE=1.0, MIDDLEWARE=[
+    "monitoring.middleware.TracingMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "users.middleware.CachedAuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "users.middleware.TimezoneMiddleware",
+    "monitoring.middleware.TraceViewMiddleware",
+])
+class TracingMiddlewareTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(TRACE_DIR=self.tmp_dir.name)
+        self.settings_override.enable()
+        self.user = User.objects.create_user(email="test@example.com", password="StrongPassword123")
+        self.client.force_login(self.user)
+        task = Task.objects.create(project=Project.objects.create(user=self.user, name="Project"), name="Task")
+        Session.objects.create(task=task, start_time="2025-01-01T10:00:00Z", end_time="2025-01-01T11:00:00Z")
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.tmp_dir.cleanup()
+
+    def test_request_is_exported_as_otlp_json(self):
+        response = self.client.get(reverse("tracker:monthly", kwargs={"months_ago": 0}))
+        trace_id = response["X-Trace-Id"]
+
+        files = list(Path(self.tmp_dir.name).glob("traces-*.jsonl"))
+        data = json.loads(files[0].read_text())
+        resource = data["resourceSpans"][0]
+        self.assertEqual(resource["resource"]["attributes"][0]["value"]["stringValue"], "tick")
+
+        spans = tracing.find_trace(trace_id)
+        names = [span["name"] for span in spans]
+        self.assertEqual(names[0], "GET /monthly/0/")
+        self.assertIn("view tracker:monthly", names)
+        self.assertIn("middleware (request)", names)
+        self.assertIn("build_daily_summary", names)
+        self.assertIn("render tracker/partials/_summary_card.html", names)
+        self.assertIn("SELECT tracker_session", names)
+
+        by_name = {span["name"]: span for span in spans}
+        view = by_name["view tracker:monthly"]
+        self.assertEqual(by_name["build_daily_summary"]["traceId"], trace_id)
+        self.assertEqual(view["parentSpanId"], spans[0]["spanId"])
+
+    def test_view_is_called_by_django(self):
+        middleware = [*settings.MIDDLEWARE]
+        middleware.insert(-1, "monitoring.tests.test_tracing.ExceptionRecorderMiddleware")
+        ExceptionRecorderMiddleware.exceptions.clear()
+
+        with self.settings(MIDDLEWARE=middleware):
+            response = self.client.get(reverse("tracker:project-detail", kwargs={"pk": 0}))
+        self.assertEqual(response.status_code, 404)
+        # process_exception of the other middleware still sees the view's exceptions
+        self.assertEqual(ExceptionRecorderMiddleware.exceptions, [Http404])
+
+        spans = tracing.find_trace(response["X-Trace-Id"])
+        by_name = {span["name"]: span for span in spans}
+        view = by_name["view tracker:project-detail"]
+        self.assertEqual(view["parentSpanId"], spans[0]["spanId"])
+        self.assertEqual(by_name["SELECT tracker_project"]["parentSpanId"], view["spanId"])
+        self.assertIn("middleware (response)", by_name)
+
+    def test_trace_command_prints_breakdown(self):
+        response = self.client.get(reverse("tracker:monthly", kwargs={"months_ago": 0}))
+        out = StringIO()
+        call_command("trace", response["X-Trace-Id"], stdout=out)
+        output = out.getvalue()
+        self.assertIn("GET /monthly/0/", output)
+        self.assertIn("    summarize_sessions", output)
+
+        out = StringIO()
+        call_command("trace", list=5, stdout=out)
+        self.assertIn(response["X-Trace-Id"], out.getvalue())
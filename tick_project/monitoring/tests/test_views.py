@@ -0,0 +1,42 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tracker.models import Project, Task, Session
+from ..store import get_store
+
+User = get_user_model()
+
+class MetricsViewTest(TestCase):
+    def setUp(self):
+        get_store().clear()
+        self.url = reverse("monitoring:metrics")
+        self.user = User.objects.create_user(email="staff@example.com", password="StrongPassword123", is_staff=True)
+
+    def test_forbidden_for_anonymous_and_non_staff(self):
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        user = User.objects.create_user(email="user@example.com", password="StrongPassword123")
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    @override_settings(METRICS_ALLOWED_IPS=["127.0.0.1"])
+    def test_allowed_ip(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8")
+
+    def test_reports_requests_and_sessions(self):
+        self.client.force_login(self.user)
+        project = Project.objects.create(user=self.user, name="Project")
+        task = Task.objects.create(project=project, name="Task")
+        Session.objects.create(task=task, start_time=timezone.now())
+        self.client.get(reverse("tracker:dashboard"))
+
+        body = self.client.get(self.url).content.decode()
+        self.assertIn('tick_requests_total{method="GET",status="200",view="tracker:dashboard"} 1', body)
+        self.assertIn('tick_request_duration_seconds_count{view="tracker:dashboard"} 1', body)
+        self.assertIn('tick_request_queries_bucket{view="tracker:dashboard",le="+Inf"} 1', body)
+        self.assertIn('tick_session_writes_total{action="created"} 1', body)
+        self.assertIn("tick_active_timers 1", body)
+        self.assertIn("# TYPE tick_request_duration_seconds histogram", body)
@@ -0,0 +1,199 @@
+"""
+Lightweight request tracing.
+
+A sampled request (TRACE_SAMPLE_RATE) records nested spans for the middleware
+chain, the view, each SQL query, functions decorated with `traced` and each
+template render, including `{% include %}`d partials. When the request is done
+its spans are appended as one line of OTLP/JSON (the format of the
+OpenTelemetry file exporter) to a daily file in TRACE_DIR, and the trace id is
+returned in the X-Trace-Id response header.
+
+    python manage.py trace <trace id>
+
+prints a flame-style breakdown of one trace. Requests that are not sampled
+only pay for a context variable lookup per span.
+"""
+import json
+import os
+import random
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import wraps
+from pathlib import Path
+
+from django.conf import settings
+
+SERVICE_NAME = "tick"
+SCOPE_NAME = "tick.monitoring"
+
+# OTLP span kinds
+INTERNAL = 1
+SERVER = 2
+CLIENT = 3
+
+_current_trace = ContextVar("current_trace", default=None)
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "kind", "start", "end", "attributes")
+
+    def __init__(self, name, parent_id, kind, attributes):
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start = time.time_ns()
+        self.end = None
+        self.attributes = attributes
+
+class Trace:
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans = []
+        self.stack = []
+
+    def start_span(self, name, kind=INTERNAL, **attributes):
+        parent_id = self.stack[-1].span_id if self.stack else None
+        span = Span(name, parent_id, kind, attributes)
+        self.spans.append(span)
+        self.stack.append(span)
+        return span
+
+    def end_span(self, span):
+        span.end = time.time_ns()
+        self.stack.remove(span)
+
+    def add_span(self, name, start, end, parent_id, kind=INTERNAL, **attributes):
+        """Record a span whose times were measured elsewhere."""
+        span = Span(name, parent_id, kind, attributes)
+        span.start, span.end = start, end
+        self.spans.append(span)
+        return span
+
+def current_trace():
+    return _current_trace.get()
+
+def should_sample():
+    rate = settings.TRACE_SAMPLE_RATE
+    return rate > 0 and random.random() < rate
+
+@contextmanager
+def start_trace():
+    trace = Trace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+@contextmanager
+def span(name, kind=INTERNAL, **attributes):
+    """Record the enclosed block as a span of the current trace, if there is one."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    current = trace.start_span(name, kind, **attributes)
+    try:
+        yield current
+    finally:
+        trace.end_span(current)
+
+def traced(name=None):
+    """Decorator recording each call of a function as a span named `name` (default: its qualified name)."""
+    def decorator(function):
+        span_name = name or function.__qualname__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return function(*args, **kwargs)
+            with span(span_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def query_span(execute, sql, params, many, context):
+    """Database execute wrapper recording each query as a span named after its operation and first table."""
+    table = re.search(r'(?:FROM|INTO|UPDATE)\s+"?(\w+)', sql)
+    name = sql.split(" ", 1)[0].upper() + (f" {table.group(1)}" if table else "")
+    with span(name, CLIENT, **{"db.system": context["connection"].vendor, "db.statement": sql[:1000]}):
+        return execute(sql, params, many, context)
+
+def instrument_templates():
+    """Record every template render as a span, the way Django's test runner instruments them."""
+    from django.template.base import Template
+
+    if getattr(Template._render, "traced", False):
+        return
+    render = Template._render
+
+    def traced_render(self, context):
+        if _current_trace.get() is None:
+            return render(self, context)
+        with span(f"render {self.name or 'template'}"):
+            return render(self, context)
+    traced_render.traced = True
+    Template._render = traced_render
+
+def _attribute(key, value):
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+def to_otlp(trace):
+    """Return the trace as an OTLP/JSON `ExportTraceServiceRequest`."""
+    spans = []
+    for span in trace.spans:
+        data = {
+            "traceId": trace.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": span.kind,
+            "startTimeUnixNano": str(span.start),
+            "endTimeUnixNano": str(span.end or span.start),
+            "attributes": [_attribute(key, value) for key, value in span.attributes.items()],
+        }
+        if span.parent_id:
+            data["parentSpanId"] = span.parent_id
+        spans.append(data)
+    return {"resourceSpans": [{
+        "resource": {"attributes": [_attribute("service.name", SERVICE_NAME)]},
+        "scopeSpans": [{"scope": {"name": SCOPE_NAME}, "spans": spans}],
+    }]}
+
+def export(trace):
+    directory = Path(settings.TRACE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"traces-{datetime.now(timezone.utc):%Y-%m-%d}.jsonl"
+    line = (json.dumps(to_otlp(trace), separators=(",", ":")) + "\n").encode()
+    # a single O_APPEND write, so lines written by several workers don't interleave
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+def find_trace(trace_id):
+    """Return the spans of `trace_id` from the exported files as OTLP span dicts, or None."""
+    for path in sorted(Path(settings.TRACE_DIR).glob("traces-*.jsonl"), reverse=True):
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if trace_id not in line:
+                    continue
+                data = json.loads(line)
+                spans = [
+                    span
+                    for resource in data["resourceSpans"]
+                    for scope in resource["scopeSpans"]
+                    for span in scope["spans"]
+                ]
+                if spans and spans[0]["traceId"] == trace_id:
+                    return spans
+    return None
@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from .metrics import render
+
+def metrics(request):
+    """
+    Expose the collected metrics in the Prometheus text format to staff users
+    and to the addresses listed in METRICS_ALLOWED_IPS.
+    """
+    allowed = request.user.is_staff or request.META.get("REMOTE_ADDR") in settings.METRICS_ALLOWED_IPS
+    if not allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(render(), content_type="text/plain; version=0.0.4; charset=utf-8")
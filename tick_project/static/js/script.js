@@ -12,7 +12,10 @@
     setTimeout(() => hideMessages(messagesContainer), 5000);
   }
   
-  renderGraphs();
+  loadDatalistOptions();
+  loadFragments();
+  setupQuickStart();
+  setupBulkTaskForm();
 });
 
 function startTimer(initialTime){
@@ -33,64 +36,89 @@ function startTimer(initialTime){
     setInterval(updateTimer, 1000);
 }
 
-function renderGraphs(){
-    console.log("runing render_graphs function")
-    renderBars()
-    renderPieCharts()
-
+function loadDatalistOptions(){
+  // fill searchable inputs (e.g. the timezone picker) from their cached options url
+  document.querySelectorAll("datalist[data-options-url]").forEach(datalist => {
+    fetch(datalist.dataset.optionsUrl)
+      .then(response => response.json())
+      .then(options => {
+        const fragment = document.createDocumentFragment();
+        options.forEach(value => {
+          const option = document.createElement("option");
+          option.value = value;
+          fragment.appendChild(option);
+        });
+        datalist.appendChild(fragment);
+      });
+  });
 }
 
-function renderPieCharts() {
-  const charts = document.querySelectorAll('.pie-chart');
-
-  charts.forEach(container => {
-    const percentage = parseInt(container.dataset.percentage) || 0;
-    // Create SVG and its elements
-    const svg = document.createElementNS("http://www.w3.org/2000/svg", "svg");
-    svg.setAttribute("width", "21");
-    svg.setAttribute("height", "21");
-    svg.setAttribute("viewBox", "0 0 36 36");
-
-    const radius = 14;
-    const circumference = 2 * Math.PI * radius;
-    const visible = (percentage / 100) * circumference;
-    const invisible = circumference - visible;
-    const padding = 4
-
-    const bg = document.createElementNS("http://www.w3.org/2000/svg", "circle");
-    bg.setAttribute("cx", radius + padding);
-    bg.setAttribute("cy", radius + padding);
-    bg.setAttribute("r", radius);
-    bg.setAttribute("class", "bg")
-
-    const fg = document.createElementNS("http://www.w3.org/2000/svg", "circle");
-    fg.setAttribute("cx", radius + padding);
-    fg.setAttribute("cy", radius + padding);
-    fg.setAttribute("r", radius);
-    fg.setAttribute("stroke-dasharray", `${visible} ${invisible}`);
-    fg.setAttribute("class", "fg")
+function loadFragments(){
+  // fill deferred sections (e.g. the dashboard lists) with the html rendered at their fragment url
+  document.querySelectorAll("[data-fragment-url]").forEach(container => {
+    fetch(container.dataset.fragmentUrl)
+      .then(response => response.ok ? response.text() : Promise.reject(response.status))
+      .then(html => {
+        container.innerHTML = html;
+      })
+      .catch(() => {
+        container.querySelector(".muted").textContent = "could not load, refresh to try again.";
+      });
+  });
+}
 
-    svg.appendChild(bg);
-    svg.appendChild(fg);
+function setupQuickStart(){
+  // "type to start": suggest tasks as the user types, each button starts its timer
+  const form = document.querySelector("form[data-autocomplete-url]");
+  if (!form) return;
+  const input = form.querySelector("input[type=search]");
+  const results = form.querySelector(".quick-start-results");
+  let latest = 0;
+
+  function suggest(){
+    const request = ++latest;
+    fetch(`${form.dataset.autocompleteUrl}?q=${encodeURIComponent(input.value)}`)
+      .then(response => response.json())
+      .then(tasks => {
+        if (request !== latest) return; // a newer query already answered
+        results.replaceChildren(...tasks.map(task => {
+          const button = document.createElement("button");
+          button.type = "submit";
+          button.className = "card card-li";
+          button.formAction = task.start_url;
+          button.textContent = task.name;
+          const project = document.createElement("span");
+          project.className = "small muted";
+          project.textContent = ` ${task.project}`;
+          button.appendChild(project);
+          return button;
+        }));
+      });
+  }
 
-    // Clear and append
-    container.innerHTML = "";
-    container.appendChild(svg);
+  input.addEventListener("focus", suggest, {once: true});
+  input.addEventListener("input", suggest);
+  input.addEventListener("keydown", event => {
+    if (event.key !== "Enter") return;
+    event.preventDefault();
+    results.querySelector("button")?.click();
   });
 }
 
-function renderBars(){
-    const scale = 1 / 1600;
-    const bars = document.querySelectorAll('.duration-bar')
-      bars.forEach(bar => {
-        const duration = parseInt(bar.dataset.duration, 10) || 0;
-        const duration_in_rem = String(duration*scale) + "rem"
-        if (bar.classList.contains("vertical")){
-            bar.style.height = duration_in_rem
-        } else {
-            bar.style.width = duration_in_rem
-        }
-    });
+function setupBulkTaskForm(){
+  // the project select only applies to "move", and deleting asks first
+  const form = document.getElementById("bulk-tasks");
+  if (!form) return;
+  const action = form.elements["action"];
+  const project = form.elements["project"];
+  const toggleProject = () => { project.hidden = action.value !== "move"; };
+  toggleProject();
+  action.addEventListener("change", toggleProject);
+  form.addEventListener("submit", event => {
+    if (action.value === "delete" && !confirm("Delete the selected tasks and all their recorded sessions?")) {
+      event.preventDefault();
+    }
+  });
 }
 
 function displayMessages(container){
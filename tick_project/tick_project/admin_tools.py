@@ -0,0 +1,136 @@
+"""
+Admin changelists for large tables.
+
+Django's defaults read every row of a table at least once per changelist
+page: pagination counts the matching rows and the whole table, and the date
+hierarchy aggregates and groups the date field over the whole list. With
+`LargeTableAdmin` a page costs the same with a thousand rows or millions:
+
+  - rows are counted only up to EXACT_COUNT_LIMIT, past that the count is
+    estimated from the largest primary key (`EstimatedCountPaginator`)
+  - the date hierarchy reads the first and last value of its field in index
+    order (`IndexedDateQuerySet`), so the field should be indexed
+  - the CSV export (`export_csv`) is streamed, reading the rows in chunks of
+    EXPORT_CHUNK_SIZE in primary key order, one short query per chunk
+
+List filters and `ordering` should stay on indexed columns for the same reason.
+"""
+import csv
+import io
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db.models import F, Max, Min, QuerySet
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+EXACT_COUNT_LIMIT = 10000
+EXPORT_CHUNK_SIZE = 2000
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Counts at most `exact_count_limit` rows. Longer lists are given the number
+    of rows in the whole table, estimated from its largest primary key, so the
+    last pages of a filtered list may be empty.
+    """
+    exact_count_limit = EXACT_COUNT_LIMIT
+
+    @cached_property
+    def count(self):
+        limit = self.exact_count_limit
+        count = self.object_list.order_by()[:limit + 1].count()
+        if count <= limit:
+            return count
+        estimate = self.object_list.model._base_manager.aggregate(largest=Max("pk"))["largest"] or 0
+        return max(count, estimate)
+
+def is_min_or_max(aggregate):
+    return (
+        isinstance(aggregate, (Min, Max))
+        and aggregate.filter is None
+        and len(aggregate.source_expressions) == 1
+        and isinstance(aggregate.source_expressions[0], F)
+    )
+
+class IndexedDateQuerySet(QuerySet):
+    """
+    Answers the date hierarchy's queries from the first and last value of the
+    field: Min and Max, and the years or months of the list, which are those of
+    the calendar between the two, so one without rows may be listed. Days are
+    still read from the rows of the selected month.
+    """
+    def bounds(self, field_name):
+        values = self.filter(**{f"{field_name}__isnull": False}).values_list(field_name, flat=True)
+        return values.order_by(field_name).first(), values.order_by(f"-{field_name}").first()
+
+    def aggregate(self, *args, **kwargs):
+        if args or not kwargs or not all(is_min_or_max(aggregate) for aggregate in kwargs.values()):
+            return super().aggregate(*args, **kwargs)
+        bounds = {}
+        result = {}
+        for alias, aggregate in kwargs.items():
+            field_name = aggregate.source_expressions[0].name
+            if field_name not in bounds:
+                bounds[field_name] = self.bounds(field_name)
+            first, last = bounds[field_name]
+            result[alias] = first if isinstance(aggregate, Min) else last
+        return result
+
+    def datetimes(self, field_name, kind, order="ASC", tzinfo=None):
+        if kind not in ("year", "month"):
+            return super().datetimes(field_name, kind, order, tzinfo)
+        first, last = self.bounds(field_name)
+        if first is None:
+            return []
+        if settings.USE_TZ:
+            tzinfo = tzinfo or timezone.get_current_timezone()
+            first, last = first.astimezone(tzinfo), last.astimezone(tzinfo)
+        if kind == "year":
+            months = [(year, 1) for year in range(first.year, last.year + 1)]
+        else:
+            months = [
+                divmod(month, 12)
+                for month in range(first.year * 12 + first.month - 1, last.year * 12 + last.month)
+            ]
+            months = [(year, month + 1) for year, month in months]
+        dates = [datetime(year, month, 1, tzinfo=tzinfo) for year, month in months]
+        return dates if order == "ASC" else dates[::-1]
+
+def csv_chunks(queryset, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the CSV text of `fields` for the rows of `queryset`, a header and then a chunk at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    rows = queryset.order_by("pk").values_list("pk", *fields)
+    last_pk = None
+    while True:
+        chunk = list((rows if last_pk is None else rows.filter(pk__gt=last_pk))[:chunk_size])
+        writer.writerows(row[1:] for row in chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        if len(chunk) < chunk_size:
+            return
+        last_pk = chunk[-1][0]
+
+def export_csv(*fields):
+    """An admin action streaming `fields` of the selected rows as a CSV file."""
+    @admin.action(description="Export selected %(verbose_name_plural)s as CSV")
+    def export(modeladmin, request, queryset):
+        response = StreamingHttpResponse(csv_chunks(queryset, fields), content_type="text/csv")
+        response["Content-Disposition"] = f'attachment; filename="{modeladmin.opts.model_name}.csv"'
+        return response
+    return export
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if self.date_hierarchy:
+            queryset = IndexedDateQuerySet(model=queryset.model, query=queryset.query, using=queryset._db, hints=queryset._hints)
+        return queryset
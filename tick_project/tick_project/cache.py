@@ -0,0 +1,233 @@
+"""
+A cache backend stored in a local SQLite file, shared by every worker process
+on the host without an external cache service.
+
+    CACHES = {
+        "default": {
+            "BACKEND": "tick_project.cache.SQLiteCache",
+            "LOCATION": "/path/to/cache.sqlite3",
+            "OPTIONS": {"MAX_BYTES": 64 * 1024 * 1024},
+        }
+    }
+
+Entries support Django's versioned keys and timeouts. When the stored values
+grow beyond MAX_BYTES the least recently used entries are evicted.
+"""
+import pickle
+import time
+
+from django.core.cache.backends.base import BaseCache, DEFAULT_TIMEOUT
+
+from .sqlite_store import LocalConnection
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entry (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cache_entry_accessed ON cache_entry (accessed);
+CREATE INDEX IF NOT EXISTS cache_entry_expires ON cache_entry (expires);
+
+CREATE TABLE IF NOT EXISTS cache_stats (id INTEGER PRIMARY KEY CHECK (id = 1), total_size INTEGER NOT NULL);
+INSERT OR IGNORE INTO cache_stats (id, total_size) VALUES (1, 0);
+
+CREATE TRIGGER IF NOT EXISTS cache_entry_insert AFTER INSERT ON cache_entry BEGIN
+    UPDATE cache_stats SET total_size = total_size + NEW.size WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_entry_update AFTER UPDATE OF size ON cache_entry BEGIN
+    UPDATE cache_stats SET total_size = total_size - OLD.size + NEW.size WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_entry_delete AFTER DELETE ON cache_entry BEGIN
+    UPDATE cache_stats SET total_size = total_size - OLD.size WHERE id = 1;
+END;
+"""
+
+class SQLiteCache(BaseCache):
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+    # reads only refresh an entry's LRU timestamp when it is older than this,
+    # so hot keys don't turn every cache hit into a write.
+    lru_resolution = 1.0
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.max_bytes = int(options.get("MAX_BYTES", 64 * 1024 * 1024))
+        # fraction of MAX_BYTES kept after an eviction pass
+        self.cull_target = float(options.get("CULL_TARGET", 0.9))
+        self._connection = LocalConnection(location, SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def take_counts(self):
+        """Return the hits and misses counted since the last call, and start counting again."""
+        counts = (self.hits, self.misses)
+        self.hits = self.misses = 0
+        return counts
+
+    @property
+    def _db(self):
+        return self._connection.get()
+
+    def get(self, key, default=None, version=None):
+        return self.get_many([key], version=version).get(key, default)
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        if not key_map:
+            return {}
+
+        placeholders = ", ".join("?" * len(key_map))
+        rows = self._db.execute(
+            f"SELECT key, value, expires, accessed FROM cache_entry WHERE key IN ({placeholders})",
+            list(key_map),
+        ).fetchall()
+
+        now = time.time()
+        result = {}
+        expired = []
+        stale = []
+        for key, value, expires, accessed in rows:
+            if expires is not None and expires <= now:
+                expired.append(key)
+                continue
+            result[key_map[key]] = pickle.loads(value)
+            if now - accessed > self.lru_resolution:
+                stale.append(key)
+
+        if expired:
+            self._delete_keys(expired)
+        if stale:
+            self._db.executemany("UPDATE cache_entry SET accessed = ? WHERE key = ?", [(now, key) for key in stale])
+
+        self.hits += len(result)
+        self.misses += len(key_map) - len(result)
+        return result
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._set(key, value, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        for key, value in data.items():
+            self.set(key, value, timeout, version=version)
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._set(key, value, timeout, only_if_missing=True)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._db.execute(
+            "UPDATE cache_entry SET expires = ? WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (self.get_backend_timeout(timeout), key, time.time()),
+        )
+        return cursor.rowcount > 0
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._delete_keys([key]) > 0
+
+    def delete_many(self, keys, version=None):
+        self._delete_keys([self.make_and_validate_key(key, version=version) for key in keys])
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._db.execute(
+            "SELECT 1 FROM cache_entry WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (key, time.time()),
+        ).fetchone()
+        return row is not None
+
+    def incr(self, key, delta=1, version=None):
+        """Atomically add `delta` to a cached number, across every process sharing the file."""
+        key = self.make_and_validate_key(key, version=version)
+        db = self._db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute(
+                "SELECT value FROM cache_entry WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (key, time.time()),
+            ).fetchone()
+            if row is None:
+                raise ValueError("Key '%s' not found" % key)
+            value = pickle.loads(row[0]) + delta
+            db.execute(
+                "UPDATE cache_entry SET value = ? WHERE key = ?",
+                (pickle.dumps(value, self.pickle_protocol), key),
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return value
+
+    def clear(self):
+        self._db.execute("DELETE FROM cache_entry")
+
+    def close(self, **kwargs):
+        # connections are reused across requests; they're closed with the process.
+        pass
+
+    def total_size(self):
+        return self._db.execute("SELECT total_size FROM cache_stats WHERE id = 1").fetchone()[0]
+
+    def _set(self, key, value, timeout, only_if_missing=False):
+        data = pickle.dumps(value, self.pickle_protocol)
+        expires = self.get_backend_timeout(timeout)
+        now = time.time()
+
+        if only_if_missing:
+            # an expired entry counts as missing
+            cursor = self._db.execute(
+                """
+                INSERT INTO cache_entry (key, value, expires, accessed, size) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    value = excluded.value, expires = excluded.expires,
+                    accessed = excluded.accessed, size = excluded.size
+                WHERE cache_entry.expires IS NOT NULL AND cache_entry.expires <= ?
+                """,
+                (key, data, expires, now, len(data), now),
+            )
+            stored = cursor.rowcount > 0
+        else:
+            self._db.execute(
+                """
+                INSERT INTO cache_entry (key, value, expires, accessed, size) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    value = excluded.value, expires = excluded.expires,
+                    accessed = excluded.accessed, size = excluded.size
+                """,
+                (key, data, expires, now, len(data)),
+            )
+            stored = True
+
+        if stored and self.total_size() > self.max_bytes:
+            self._cull()
+        return stored
+
+    def _cull(self):
+        """Drop expired entries, then the least recently used ones until under the size target."""
+        db = self._db
+        db.execute("DELETE FROM cache_entry WHERE expires IS NOT NULL AND expires <= ?", (time.time(),))
+        excess = self.total_size() - self.max_bytes * self.cull_target
+        if excess <= 0:
+            return
+
+        keys = []
+        for key, size in db.execute("SELECT key, size FROM cache_entry ORDER BY accessed"):
+            keys.append(key)
+            excess -= size
+            if excess <= 0:
+                break
+        for start in range(0, len(keys), 500):
+            self._delete_keys(keys[start:start + 500])
+
+    def _delete_keys(self, keys):
+        if not keys:
+            return 0
+        placeholders = ", ".join("?" * len(keys))
+        return self._db.execute(f"DELETE FROM cache_entry WHERE key IN ({placeholders})", keys).rowcount
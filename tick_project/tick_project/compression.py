@@ -0,0 +1,94 @@
+"""
+Response compression.
+
+Responses are compressed with brotli when the client accepts it and the
+optional `brotli` package is installed, otherwise with gzip. Streaming
+responses are compressed chunk by chunk and each chunk is flushed, so the
+browser can start rendering before the response is complete.
+
+Gzip output carries a random file name of random length in its header, as
+Django's GZipMiddleware does, to make BREACH-style length guessing harder.
+"""
+import secrets
+import string
+from gzip import GzipFile
+
+from django.utils.text import StreamingBuffer, compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# in order of preference
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+
+# It's not worth compressing shorter responses.
+MIN_LENGTH = 200
+
+GZIP_LEVEL = 6
+# Brotli's maximum quality (11) is too slow for content compressed per request.
+BROTLI_QUALITY = 5
+MAX_RANDOM_BYTES = 100
+
+def accepted_encodings(header):
+    """Parse an Accept-Encoding header into {coding: quality}."""
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+def negotiate(header):
+    """Return the preferred encoding the client accepts, or None."""
+    accepted = accepted_encodings(header or "")
+    for encoding in ENCODINGS:
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+def is_compressible(content_type):
+    return content_type.split(";", 1)[0].strip().lower().startswith(COMPRESSIBLE_TYPES)
+
+def _random_filename():
+    length = secrets.randbelow(MAX_RANDOM_BYTES) + 1
+    return "".join(secrets.choice(string.ascii_letters) for _ in range(length))
+
+def compress(content, encoding):
+    if encoding == "br":
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    return compress_string(content, max_random_bytes=MAX_RANDOM_BYTES)
+
+def compress_stream(chunks, encoding):
+    """Compress an iterable of bytes, yielding compressed output as each chunk arrives."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+
+    buffer = StreamingBuffer()
+    with GzipFile(filename=_random_filename(), mode="wb", compresslevel=GZIP_LEVEL, fileobj=buffer, mtime=0) as file:
+        for chunk in chunks:
+            file.write(chunk)
+            file.flush()
+            data = buffer.read()
+            if data:
+                yield data
+    yield buffer.read()
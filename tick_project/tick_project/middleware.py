@@ -0,0 +1,142 @@
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from django.middleware.csrf import CsrfViewMiddleware
+from django.urls import resolve
+from django.utils.cache import patch_vary_headers
+
+from . import page_cache
+from .compression import MIN_LENGTH, compress, compress_stream, is_compressible, negotiate
+from .routers import LAST_WRITE_SESSION_KEY, replica_available
+from .throttling import database_load, database_overloaded, retry_after
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+class ReplicaStickinessMiddleware:
+    """
+    Record the time of each successful write in the user's session so that
+    `use_replica` views keep reading from the primary for a short while after it.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and hasattr(request, "session")
+            and replica_available()
+        ):
+            request.session[LAST_WRITE_SESSION_KEY] = time.time()
+
+        return response
+
+class RateLimitMiddleware:
+    """
+    Refuse requests beyond their user's rate limit with 429, and the views in
+    OVERLOAD_SHED_VIEWS with 503 while the database is overloaded (see
+    `throttling.py`). Must come after the authentication middleware.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if settings.OVERLOAD_DB_LATENCY_MS is None:
+            return self.get_response(request)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(database_load))
+            return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if database_overloaded() and request.resolver_match.view_name in settings.OVERLOAD_SHED_VIEWS:
+            response = HttpResponse("The site is busy, please try again shortly.", status=503, content_type="text/plain")
+            response["Retry-After"] = str(settings.OVERLOAD_RETRY_AFTER)
+            return response
+
+        wait = retry_after(request)
+        if wait:
+            response = HttpResponse(
+                f"Too many requests, please try again in {wait} seconds.", status=429, content_type="text/plain"
+            )
+            response["Retry-After"] = str(wait)
+            return response
+        return None
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli or gzip, whichever the client prefers
+    among those available (see `compression.py`). Unlike Django's
+    GZipMiddleware, each chunk of a streaming response is flushed as soon
+    as it is compressed. Static files are served precompressed by WhiteNoise
+    before reaching this middleware.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if response.has_header("Content-Encoding") or not is_compressible(response.get("Content-Type", "")):
+            return response
+        if response.streaming:
+            if response.is_async:
+                return response
+        elif len(response.content) < MIN_LENGTH:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate(request.META.get("HTTP_ACCEPT_ENCODING"))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(response.streaming_content, encoding)
+            # the compressed length is only known once the stream is done
+            del response.headers["Content-Length"]
+        else:
+            content = compress(response.content, encoding)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response.headers["Content-Length"] = str(len(content))
+
+        # a strong ETag would claim the compressed body is byte-for-byte the uncompressed one
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+class PageCacheMiddleware:
+    """
+    Serve anonymous GETs of `public_page` views from the cache, and cache
+    their responses (see `page_cache.py`). Must come before the session
+    middleware, so cached pages are served without reading the session or
+    loading the user.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # reads and sets the visitor's CSRF cookie for cached pages
+        self.csrf = CsrfViewMiddleware(get_response)
+
+    def __call__(self, request):
+        if not page_cache.cacheable_request(request):
+            return self.get_response(request)
+
+        page = page_cache.get(request)
+        if page is None:
+            response = self.get_response(request)
+            page_cache.store(request, response)
+            return response
+
+        # for the metrics and traces recorded by the middleware above
+        request.resolver_match = resolve(request.path_info)
+        self.csrf.process_request(request)
+        response = page_cache.build_response(request, page)
+        return self.csrf.process_response(request, response)
@@ -0,0 +1,82 @@
+"""
+Full-page cache for anonymous visitors.
+
+Views decorated with `public_page` show every anonymous visitor the same page,
+whatever the query string. Their GET responses to requests without a session
+or messages cookie are kept in the cache for PAGE_CACHE_TIMEOUT seconds, keyed
+by path, and `PageCacheMiddleware` serves them before the session,
+authentication, CSRF and timezone middleware run.
+
+CSRF tokens in the page belong to the visitor it was rendered for: they are
+stored as a placeholder, which is replaced with a token for the current
+visitor when the page is served, with the CSRF cookie handled by Django's own
+CSRF middleware code.
+"""
+import re
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+
+CSRF_INPUT = re.compile(rb'(name="csrfmiddlewaretoken" value=")[A-Za-z0-9]+(")')
+CSRF_PLACEHOLDER = b"__csrf_token__"
+
+def public_page(view):
+    """Mark the responses of `view` as the same for every anonymous visitor."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        response.public_page = True
+        return response
+    return wrapper
+
+def cache_key(path):
+    return f"page:{path}"
+
+def cacheable_request(request):
+    """
+    Whether `request` is an anonymous GET that a cached page could answer.
+    Raises DisallowedHost for hosts not in ALLOWED_HOSTS, as CommonMiddleware
+    would for a page that isn't cached.
+    """
+    if (
+        settings.PAGE_CACHE_TIMEOUT is None
+        or settings.CSRF_USE_SESSIONS
+        or request.method != "GET"
+        or settings.SESSION_COOKIE_NAME in request.COOKIES
+        or CookieStorage.cookie_name in request.COOKIES
+    ):
+        return False
+    request.get_host()
+    return True
+
+def store(request, response):
+    """Cache `response` to a cacheable request if it is a public page."""
+    if (
+        not getattr(response, "public_page", False)
+        or response.status_code != 200
+        or response.streaming
+        # anything but the CSRF cookie belongs to this visitor
+        or set(response.cookies) - {settings.CSRF_COOKIE_NAME}
+    ):
+        return
+    content = CSRF_INPUT.sub(rb"\g<1>" + CSRF_PLACEHOLDER + rb"\g<2>", response.content)
+    headers = [(name, value) for name, value in response.headers.items() if name.lower() != "content-length"]
+    cache.set(cache_key(request.path), (content, headers), settings.PAGE_CACHE_TIMEOUT)
+
+def get(request):
+    return cache.get(cache_key(request.path))
+
+def build_response(request, page):
+    """A response with the cached `page`, holding a CSRF token for the visitor."""
+    content, headers = page
+    if CSRF_PLACEHOLDER in content:
+        content = content.replace(CSRF_PLACEHOLDER, get_token(request).encode())
+    response = HttpResponse(content)
+    for name, value in headers:
+        response[name] = value
+    response["Content-Length"] = str(len(content))
+    return response
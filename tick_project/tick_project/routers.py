@@ -0,0 +1,88 @@
+"""
+Database routing for the read replica.
+
+Views decorated with `use_replica` read tracker data from the replica alias
+(`settings.REPLICA_DATABASE_ALIAS`) instead of the primary database. Writes
+always go to the primary. A user who has just written is kept on the primary
+for `settings.REPLICA_STICKY_SECONDS` so they always see their own changes.
+
+Values that outlive the request, like the summaries cached under the user's
+data version (see `tracker/cache.py`), are built inside `primary_reads()`: the
+version comes from the primary, and a replica that hasn't caught up yet would
+leave an outdated value cached under it.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# session key holding the timestamp of the user's last successful write
+LAST_WRITE_SESSION_KEY = "_replica_last_write"
+
+_reading_from_replica = ContextVar("reading_from_replica", default=False)
+
+def replica_available():
+    return settings.REPLICA_DATABASE_ALIAS in settings.DATABASES
+
+def recently_wrote(request):
+    """Return True if the request's session wrote to the primary within the sticky window."""
+    session = getattr(request, "session", None)
+    if session is None:
+        return False
+    last_write = session.get(LAST_WRITE_SESSION_KEY)
+    return last_write is not None and time.time() - last_write < settings.REPLICA_STICKY_SECONDS
+
+def use_replica(view_func):
+    """
+    Route the read queries issued by `view_func` (including the ones evaluated
+    while rendering its templates) to the replica.
+    """
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if not replica_available() or recently_wrote(request):
+            return view_func(request, *args, **kwargs)
+
+        token = _reading_from_replica.set(True)
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            _reading_from_replica.reset(token)
+
+    return _wrapped_view
+
+@contextmanager
+def primary_reads():
+    """Read from the primary inside the block, even within a `use_replica` view."""
+    token = _reading_from_replica.set(False)
+    try:
+        yield
+    finally:
+        _reading_from_replica.reset(token)
+
+class ReplicaRouter:
+    """Send reads of tracker models to the replica while a `use_replica` view is running."""
+    route_app_labels = {"tracker"}
+
+    def db_for_read(self, model, **hints):
+        if _reading_from_replica.get() and model._meta.app_label in self.route_app_labels:
+            return settings.REPLICA_DATABASE_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        # never let an instance loaded from the replica be saved back to it
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, settings.REPLICA_DATABASE_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # the replica is a copy of the primary and is never migrated directly
+        if db == settings.REPLICA_DATABASE_ALIAS:
+            return False
+        return None
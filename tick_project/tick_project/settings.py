@@ -41,19 +41,30 @@ INSTALLED_APPS = [
 
     'users',
     'tracker',
+    'jobs',
+    'monitoring',
 ]
 
 MIDDLEWARE = [
+    'monitoring.middleware.TracingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'tick_project.middleware.CompressionMiddleware',
+    'monitoring.middleware.MetricsMiddleware',
+    'monitoring.middleware.SlowQueryMiddleware',
+    'tick_project.middleware.PageCacheMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'tick_project.middleware.ReplicaStickinessMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'users.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 
-    'users.middleware.TimezoneMiddleware'
+    'users.middleware.TimezoneMiddleware',
+    'tracker.middleware.IdentityMapMiddleware',
+    'tick_project.middleware.RateLimitMiddleware',
+    'monitoring.middleware.TraceViewMiddleware',
 ]
 
 ROOT_URLCONF = 'tick_project.urls'
@@ -87,6 +98,103 @@ DATABASES = {
     }
 }
 
+# Read replica
+# Read-only summary and list views read tracker data from this alias when it is
+# configured. Locally it can be a SQLite copy of the primary refreshed with
+# `python manage.py refresh_replica`. Users are kept on the primary for
+# REPLICA_STICKY_SECONDS after a write, so it should cover the refresh interval.
+# Other sessions can read the replica before it catches up; cached summaries,
+# fragments and autocomplete indexes are always built from the primary.
+
+REPLICA_DATABASE_ALIAS = 'replica'
+REPLICA_DATABASE_NAME = env('REPLICA_DATABASE_NAME', default=None)
+REPLICA_STICKY_SECONDS = env.int('REPLICA_STICKY_SECONDS', default=30)
+
+if REPLICA_DATABASE_NAME:
+    DATABASES[REPLICA_DATABASE_ALIAS] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': REPLICA_DATABASE_NAME,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['tick_project.routers.ReplicaRouter']
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# A SQLite file shared by every worker process on the host.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'tick_project.cache.SQLiteCache',
+        'LOCATION': env('CACHE_LOCATION', default=str(BASE_DIR / 'cache.sqlite3')),
+        'OPTIONS': {
+            'MAX_BYTES': env.int('CACHE_MAX_BYTES', default=64 * 1024 * 1024),
+        },
+    }
+}
+
+# Public pages served to anonymous visitors are cached for this many seconds
+# (unset to disable), see `tick_project/page_cache.py`.
+PAGE_CACHE_TIMEOUT = env.int('PAGE_CACHE_TIMEOUT', default=60 * 10) or None
+
+# Sessions are read from the cache and only fall back to the database on a miss.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Metrics
+# Request, query, cache and session metrics are kept in a SQLite file shared by
+# the worker processes and served at /metrics to staff users and METRICS_ALLOWED_IPS.
+
+METRICS_LOCATION = env('METRICS_LOCATION', default=str(BASE_DIR / 'metrics.sqlite3'))
+METRICS_ALLOWED_IPS = env.list('METRICS_ALLOWED_IPS', default=[])
+
+# Queries slower than SLOW_QUERY_THRESHOLD_MS are logged with their query plan
+# (unset to disable); `python manage.py slow_queries` summarises the log.
+
+SLOW_QUERY_THRESHOLD_MS = env.int('SLOW_QUERY_THRESHOLD_MS', default=100) or None
+SLOW_QUERY_LOG = env('SLOW_QUERY_LOG', default=str(BASE_DIR / 'logs' / 'slow_queries.jsonl'))
+SLOW_QUERY_LOG_MAX_BYTES = env.int('SLOW_QUERY_LOG_MAX_BYTES', default=10 * 1024 * 1024)
+SLOW_QUERY_LOG_BACKUPS = env.int('SLOW_QUERY_LOG_BACKUPS', default=5)
+
+# A sample of requests is traced and written as OTLP/JSON to TRACE_DIR;
+# `python manage.py trace <trace id>` prints the breakdown of one of them.
+
+TRACE_SAMPLE_RATE = env.float('TRACE_SAMPLE_RATE', default=0.01)
+TRACE_DIR = env('TRACE_DIR', default=str(BASE_DIR / 'logs' / 'traces'))
+
+# Rate limiting
+# Token buckets per user and request class, as (capacity, tokens per second),
+# shared by the worker processes through a SQLite file. Writes are POSTs to any
+# view but the exempt ones. Anonymous clients are told apart by address: behind
+# a reverse proxy, set RATE_LIMIT_CLIENT_IP_HEADER to the header it puts the
+# client's address in, e.g. HTTP_X_FORWARDED_FOR or HTTP_X_REAL_IP.
+
+RATE_LIMIT_LOCATION = env('RATE_LIMIT_LOCATION', default=str(BASE_DIR / 'ratelimit.sqlite3'))
+RATE_LIMITS = {
+    'write': (env.int('RATE_LIMIT_WRITE_BURST', default=30), env.float('RATE_LIMIT_WRITE_RATE', default=0.5)),
+    'summary': (env.int('RATE_LIMIT_SUMMARY_BURST', default=20), env.float('RATE_LIMIT_SUMMARY_RATE', default=0.2)),
+}
+RATE_LIMIT_VIEW_CLASSES = {
+    'tracker:daily': 'summary',
+    'tracker:weekly': 'summary',
+    'tracker:monthly': 'summary',
+}
+RATE_LIMIT_EXEMPT_VIEWS = [
+    'users:logout',
+]
+RATE_LIMIT_CLIENT_IP_HEADER = env('RATE_LIMIT_CLIENT_IP_HEADER', default=None)
+
+# While the average query takes longer than OVERLOAD_DB_LATENCY_MS (unset to
+# disable), cached summaries are served even when out of date and these views
+# are refused with 503.
+OVERLOAD_DB_LATENCY_MS = env.int('OVERLOAD_DB_LATENCY_MS', default=200) or None
+OVERLOAD_SHED_VIEWS = [
+    'tracker:daily',
+    'tracker:projects',
+    'tracker:project-detail',
+    'users:account',
+]
+OVERLOAD_RETRY_AFTER = 30
+
 AUTH_USER_MODEL = "users.User"
 
 LOGIN_URL = 'users:login'
@@ -132,6 +240,18 @@ STATICFILES_DIRS = [
 
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# `python manage.py collectstatic` writes each file under a content-hashed name,
+# along with gzip and (if the brotli package is installed) brotli copies.
+# WhiteNoise serves the hashed files with far-future, immutable caching.
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
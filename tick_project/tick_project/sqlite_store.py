@@ -0,0 +1,45 @@
+"""
+Helpers for small SQLite files shared by every worker process on a host.
+
+Connections are opened in WAL mode so readers never block the single writer,
+and are kept per thread and per process (a forked gunicorn worker never reuses
+its parent's connection).
+"""
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+def open_connection(path, timeout=5):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    # isolation_level=None: autocommit unless a transaction is opened explicitly
+    connection = sqlite3.connect(str(path), timeout=timeout, isolation_level=None, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+class LocalConnection:
+    """
+    Lazily open one connection per thread and per process, and run `schema`
+    (a script of idempotent `CREATE ... IF NOT EXISTS` statements) on first use.
+    """
+    def __init__(self, path, schema=""):
+        self.path = path
+        self.schema = schema
+        self._local = threading.local()
+
+    def get(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = open_connection(self.path)
+            if self.schema:
+                connection.executescript(self.schema)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.pid == os.getpid():
+            connection.close()
+        self._local.connection = None
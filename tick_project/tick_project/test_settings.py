@@ -0,0 +1,30 @@
+"""
+Settings for running the tests:
+
+    python manage.py test --settings=tick_project.test_settings
+
+The production settings with their features on (the SQLite cache, page
+caching, rate limits, overload shedding, slow query logging and tracing),
+but with their state kept in memory or in a temporary directory, so tests
+never read what a previous run or the running site left behind. Tests that
+need a feature off turn it off with `override_settings`.
+"""
+import atexit
+import shutil
+import tempfile
+from pathlib import Path
+
+from .settings import *  # noqa: F401,F403
+
+_state_dir = Path(tempfile.mkdtemp(prefix="tick-tests-"))
+atexit.register(shutil.rmtree, _state_dir, ignore_errors=True)
+
+# SQLite files opened in memory are private to each thread of each process
+CACHES['default']['LOCATION'] = ':memory:'
+METRICS_LOCATION = ':memory:'
+RATE_LIMIT_LOCATION = ':memory:'
+SLOW_QUERY_LOG = str(_state_dir / 'slow_queries.jsonl')
+TRACE_DIR = str(_state_dir / 'traces')
+
+# tests run without collectstatic, so there is no manifest
+STORAGES['staticfiles'] = {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}
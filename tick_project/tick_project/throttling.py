@@ -0,0 +1,167 @@
+"""
+Rate limiting and load shedding.
+
+Requests are grouped into classes (RATE_LIMITS): writes, and the expensive
+summary views (RATE_LIMIT_VIEW_CLASSES); views in RATE_LIMIT_EXEMPT_VIEWS are
+never limited. Each user, or each client address for anonymous requests (see
+`client_address`), has a token bucket per class, kept in a SQLite file shared
+by every worker process on the host: a request takes one token, and tokens
+come back at the class's rate up to its capacity.
+
+Each process also follows the latency of its database queries. While the
+moving average of at least MIN_SAMPLES recent queries is above
+OVERLOAD_DB_LATENCY_MS the site is considered
+overloaded: cached summaries are served even if they are out of date (see
+`tracker.cache.cached_for_user`) and the views in OVERLOAD_SHED_VIEWS are
+refused until the average falls below half the threshold.
+"""
+import math
+import threading
+import time
+
+from django.conf import settings
+
+from .sqlite_store import LocalConnection
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS token_bucket (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+# Refill the bucket for the time since its last update and take a token, in one
+# statement so concurrent workers cannot both spend the same token. No row is
+# returned when the bucket is empty.
+TAKE_TOKEN = """
+INSERT INTO token_bucket (key, tokens, updated) VALUES (:key, :capacity - 1, :now)
+ON CONFLICT (key) DO UPDATE SET
+    tokens = MIN(:capacity, tokens + (:now - updated) * :rate) - 1,
+    updated = :now
+    WHERE MIN(:capacity, tokens + (:now - updated) * :rate) >= 1
+RETURNING tokens
+"""
+
+class TokenBuckets:
+    def __init__(self, path):
+        self._connection = LocalConnection(path, SCHEMA)
+
+    def take(self, key, capacity, rate, now=None):
+        """
+        Take a token from the bucket `key`. Returns 0 if one was available,
+        otherwise the number of seconds until the next token.
+        """
+        now = time.time() if now is None else now
+        db = self._connection.get()
+        params = {"key": key, "capacity": capacity, "rate": rate, "now": now}
+        if db.execute(TAKE_TOKEN, params).fetchone() is not None:
+            return 0
+        row = db.execute("SELECT tokens, updated FROM token_bucket WHERE key = ?", (key,)).fetchone()
+        tokens = min(capacity, row[0] + (now - row[1]) * rate)
+        return (1 - tokens) / rate
+
+    def clear(self):
+        self._connection.get().execute("DELETE FROM token_bucket")
+
+_buckets = None
+_buckets_lock = threading.Lock()
+
+def get_buckets():
+    global _buckets
+    if _buckets is None:
+        with _buckets_lock:
+            if _buckets is None:
+                _buckets = TokenBuckets(settings.RATE_LIMIT_LOCATION)
+    return _buckets
+
+def rate_limit_class(request):
+    """Return the RATE_LIMITS class of a request, or None if it isn't limited."""
+    match = getattr(request, "resolver_match", None)
+    if match is not None and match.view_name in settings.RATE_LIMIT_EXEMPT_VIEWS:
+        limit_class = None
+    elif request.method not in ("GET", "HEAD", "OPTIONS"):
+        limit_class = "write"
+    elif match is not None:
+        limit_class = settings.RATE_LIMIT_VIEW_CLASSES.get(match.view_name)
+    else:
+        limit_class = None
+    return limit_class if limit_class in settings.RATE_LIMITS else None
+
+def client_address(request):
+    """
+    The address of an anonymous client: REMOTE_ADDR, or behind a reverse proxy
+    the RATE_LIMIT_CLIENT_IP_HEADER it sets.
+    """
+    header = settings.RATE_LIMIT_CLIENT_IP_HEADER
+    if header and request.META.get(header):
+        # clients can send their own X-Forwarded-For; the proxy appends the address it saw
+        return request.META[header].split(",")[-1].strip()
+    return request.META.get("REMOTE_ADDR")
+
+def retry_after(request):
+    """
+    Take a token for the request from its user's bucket. Returns 0 if the
+    request may proceed, otherwise the number of seconds to wait (rounded up).
+    """
+    limit_class = rate_limit_class(request)
+    if limit_class is None:
+        return 0
+    capacity, rate = settings.RATE_LIMITS[limit_class]
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        client = f"user:{user.pk}"
+    else:
+        client = f"addr:{client_address(request)}"
+    return math.ceil(get_buckets().take(f"{limit_class}:{client}", capacity, rate))
+
+class DatabaseLoad:
+    """
+    Exponential moving average of this process's query latency. Samples older
+    than STALE_AFTER seconds are forgotten, so an idle process recovers, and
+    the average only counts once MIN_SAMPLES queries followed each other, so
+    one slow query on an idle process doesn't make it overloaded.
+    """
+    SMOOTHING = 0.1
+    STALE_AFTER = 10
+    MIN_SAMPLES = 20
+
+    def __init__(self):
+        self.average = 0.0
+        self.samples = 0
+        self.sampled_at = 0.0
+        self.overloaded = False
+
+    def record(self, seconds):
+        now = time.monotonic()
+        if now - self.sampled_at > self.STALE_AFTER:
+            self.average = seconds
+            self.samples = 1
+        else:
+            self.average += self.SMOOTHING * (seconds - self.average)
+            self.samples += 1
+        self.sampled_at = now
+
+        threshold = settings.OVERLOAD_DB_LATENCY_MS / 1000
+        if self.overloaded:
+            self.overloaded = self.average > threshold / 2
+        else:
+            self.overloaded = self.samples >= self.MIN_SAMPLES and self.average > threshold
+
+    def is_overloaded(self):
+        if self.overloaded and time.monotonic() - self.sampled_at > self.STALE_AFTER:
+            self.overloaded = False
+        return self.overloaded
+
+    def __call__(self, execute, sql, params, many, context):
+        # database execute wrapper
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record(time.perf_counter() - started)
+
+database_load = DatabaseLoad()
+
+def database_overloaded():
+    return settings.OVERLOAD_DB_LATENCY_MS is not None and database_load.is_overloaded()
@@ -20,5 +20,7 @@ from django.urls import path, include
 urlpatterns = [
     path('admin/', admin.site.urls),
     path("", include("tracker.urls")),
-    path("users/", include("users.urls"))
+    path("users/", include("users.urls")),
+    path("jobs/", include("jobs.urls")),
+    path("metrics", include("monitoring.urls")),
 ]
@@ -1,7 +1,47 @@
 from django.contrib import admin
+
+from tick_project.admin_tools import LargeTableAdmin, export_csv
 from .models import Project, Task, Session
-# Register your models here.
 
-admin.site.register(Project)
-admin.site.register(Task)
-admin.site.register(Session)
+class RunningFilter(admin.SimpleListFilter):
+    title = "running"
+    parameter_name = "running"
+
+    def lookups(self, request, model_admin):
+        return (("yes", "Yes"), ("no", "No"))
+
+    def queryset(self, request, queryset):
+        if self.value() == "yes":
+            return queryset.filter(end_time__isnull=True)
+        if self.value() == "no":
+            return queryset.filter(end_time__isnull=False)
+        return queryset
+
+@admin.register(Project)
+class ProjectAdmin(LargeTableAdmin):
+    list_display = ("name", "user", "active", "created_at", "last_edited")
+    list_filter = ("active",)
+    list_select_related = ("user",)
+    ordering = ("-pk",)
+    raw_id_fields = ("user",)
+    search_fields = ("name",)
+    actions = [export_csv("user_id", "name", "active", "color", "created_at", "last_edited")]
+
+@admin.register(Task)
+class TaskAdmin(LargeTableAdmin):
+    list_display = ("name", "project", "is_done", "done_at", "last_edited")
+    list_filter = ("is_done",)
+    list_select_related = ("project",)
+    ordering = ("-pk",)
+    autocomplete_fields = ("project",)
+    actions = [export_csv("project_id", "name", "is_done", "done_at", "created_at", "last_edited")]
+
+@admin.register(Session)
+class SessionAdmin(LargeTableAdmin):
+    list_display = ("task", "start_time", "end_time")
+    list_filter = (RunningFilter,)
+    list_select_related = ("task__project",)
+    date_hierarchy = "start_time"
+    ordering = ("-start_time",)
+    raw_id_fields = ("task",)
+    actions = [export_csv("task_id", "start_time", "end_time")]
@@ -0,0 +1,196 @@
+"""
+Task autocomplete for starting a timer.
+
+Each process keeps, for recently active users, an index of their pending tasks
+in active projects: a sorted array of (word, task pk) pairs over the words of
+the task and project names, searched with `bisect`. Every word of the query
+matches as a prefix, and matches are ranked by how often and how recently the
+task was tracked.
+
+An index is built on the first lookup and tagged with the user's data version
+(see `cache.py`). Saves in this process update it in place (see `signals.py`);
+a version it did not see, e.g. a change made by another worker, makes the next
+lookup rebuild it.
+"""
+import math
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+from django.db.models import Count
+
+from tick_project.routers import primary_reads
+from .cache import get_data_version
+
+RESULT_LIMIT = 8
+# Indexes kept per process, least recently used dropped first.
+MAX_INDEXES = 500
+# A task tracked two weeks ago weighs half as much as one tracked now.
+HALF_LIFE = 60 * 60 * 24 * 14
+
+WORD = re.compile(r"\w+")
+
+def words(text):
+    """Lower case words of `text` without accents."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return WORD.findall(text)
+
+class TaskEntry:
+    __slots__ = ("pk", "name", "project_name", "session_count", "last_used", "words")
+
+    def __init__(self, pk, name, project_name, session_count, last_used):
+        self.pk = pk
+        self.name = name
+        self.project_name = project_name
+        self.session_count = session_count
+        self.last_used = last_used
+        self.words = set(words(name)) | set(words(project_name))
+
+    def score(self, now):
+        """Frecency: more sessions rank higher, decaying with the time since the task was last used."""
+        return (1 + math.log1p(self.session_count)) * 0.5 ** ((now - self.last_used) / HALF_LIFE)
+
+class TaskIndex:
+    def __init__(self, version):
+        self.version = version
+        self.entries = {}
+        # sorted (word, task pk) pairs
+        self.keys = []
+        self.lock = threading.Lock()
+
+    def add(self, entry):
+        self.entries[entry.pk] = entry
+        for word in entry.words:
+            insort(self.keys, (word, entry.pk))
+
+    def remove(self, pk):
+        entry = self.entries.pop(pk, None)
+        if entry is None:
+            return None
+        for word in entry.words:
+            index = bisect_left(self.keys, (word, pk))
+            del self.keys[index]
+        return entry
+
+    def matching(self, prefix):
+        pks = set()
+        index = bisect_left(self.keys, (prefix,))
+        keys = self.keys
+        while index < len(keys) and keys[index][0].startswith(prefix):
+            pks.add(keys[index][1])
+            index += 1
+        return pks
+
+    def lookup(self, query, limit=RESULT_LIMIT):
+        """Return the best `limit` entries whose words start with each word of `query`."""
+        with self.lock:
+            query_words = sorted(set(words(query)), key=len, reverse=True)
+            if query_words:
+                # the longest word has the fewest matches
+                pks = self.matching(query_words[0])
+                for word in query_words[1:]:
+                    if not pks:
+                        break
+                    pks &= self.matching(word)
+                candidates = [self.entries[pk] for pk in pks]
+            else:
+                candidates = list(self.entries.values())
+        now = time.time()
+        candidates.sort(key=lambda entry: (-entry.score(now), entry.name))
+        return candidates[:limit]
+
+def build_index(user):
+    from .models import Task
+
+    index = TaskIndex(get_data_version(user.pk))
+    # tagged with the primary's data version, so built from the primary and not from a lagging replica
+    with primary_reads():
+        tasks = Task.objects.by_user_and_is_active(user).annotate(session_count=Count("sessions")).values_list(
+            "pk", "name", "project__name", "session_count", "last_edited"
+        )
+        entries = [
+            TaskEntry(pk, name, project_name, session_count, last_edited.timestamp())
+            for pk, name, project_name, session_count, last_edited in tasks
+        ]
+    index.entries = {entry.pk: entry for entry in entries}
+    index.keys = sorted((word, entry.pk) for entry in entries for word in entry.words)
+    return index
+
+_indexes = OrderedDict()
+_indexes_lock = threading.Lock()
+
+def get_index(user):
+    """Return the user's index, building it if there is none for their current data."""
+    version = get_data_version(user.pk)
+    with _indexes_lock:
+        index = _indexes.get(user.pk)
+        if index is not None and index.version == version:
+            _indexes.move_to_end(user.pk)
+            return index
+
+    index = build_index(user)
+    with _indexes_lock:
+        _indexes[user.pk] = index
+        _indexes.move_to_end(user.pk)
+        while len(_indexes) > MAX_INDEXES:
+            _indexes.popitem(last=False)
+    return index
+
+def suggest(user, query, limit=RESULT_LIMIT):
+    return get_index(user).lookup(query, limit)
+
+def forget(user_id):
+    with _indexes_lock:
+        _indexes.pop(user_id, None)
+
+def clear():
+    with _indexes_lock:
+        _indexes.clear()
+
+def _update(user_id, version, change):
+    """
+    Apply `change` to the user's index if it was current up to the save that
+    produced `version`, otherwise drop it.
+    """
+    with _indexes_lock:
+        index = _indexes.get(user_id)
+    if index is None:
+        return
+    with index.lock:
+        if version is not None and index.version is not None and version == index.version + 1:
+            change(index)
+            index.version = version
+            return
+    forget(user_id)
+
+def task_changed(task, version, deleted=False):
+    def change(index):
+        previous = index.remove(task.pk)
+        project = task.project
+        if deleted or task.is_done or task.deleted_at is not None or not project.active or project.deleted_at is not None:
+            return
+        index.add(TaskEntry(
+            task.pk,
+            task.name,
+            project.name,
+            previous.session_count if previous else 0,
+            task.last_edited.timestamp() if task.last_edited else time.time(),
+        ))
+    _update(task.project.user_id, version, change)
+
+def session_changed(session, version, created=False, deleted=False):
+    def change(index):
+        entry = index.entries.get(session.task_id)
+        if entry is None:
+            return
+        if created:
+            entry.session_count += 1
+        elif deleted:
+            entry.session_count = max(0, entry.session_count - 1)
+        # saving a session marks its task as edited
+        entry.last_used = time.time()
+    _update(session.task.project.user_id, version, change)
@@ -0,0 +1,72 @@
+"""
+Per-user caching of tracker data.
+
+Cached values are stored under the user's current data version. Saving any of
+the user's projects, tasks or sessions bumps that version (see `signals.py`),
+so outdated entries are never read again and simply age out of the cache.
+"""
+import time
+from django.core.cache import cache
+from django.utils import timezone
+
+from monitoring.tracing import traced
+from tick_project.routers import primary_reads
+from tick_project.throttling import database_overloaded
+
+# Summaries of past periods only change when the user edits their data.
+SUMMARY_TIMEOUT = 60 * 60 * 24
+# Summaries that include today keep growing while a timer is running.
+CURRENT_SUMMARY_TIMEOUT = 60
+# The latest value of each key is kept this long, to be served while the database is overloaded.
+STALE_TIMEOUT = 60 * 60 * 24 * 7
+
+def _version_key(user_id):
+    return f"tracker:data-version:{user_id}"
+
+def get_data_version(user_id):
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # start from a timestamp so that a version evicted from the cache is never reused
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+def bump_data_version(user_id):
+    """Move the user's data to a new version and return it."""
+    try:
+        return cache.incr(_version_key(user_id))
+    except ValueError:
+        version = time.time_ns()
+        cache.set(_version_key(user_id), version, timeout=None)
+        return version
+
+@traced()
+def cached_for_user(user, key, build, timeout=SUMMARY_TIMEOUT):
+    """
+    Return the value cached under `key` for the user's current data, calling
+    `build()` and caching its result on a miss. Keys are scoped to the active
+    timezone since it decides which sessions fall on which dates. `build()`
+    reads from the primary, where the data version comes from.
+
+    While the database is overloaded, the latest value built for `key` is
+    returned on a miss, even if the user's data has changed since.
+    """
+    version = get_data_version(user.pk)
+    key = f"tracker:{user.pk}:{timezone.get_current_timezone_name()}:{key}"
+    stale_key = f"{key}:latest"
+
+    value = cache.get(key, version=version)
+    if value is None and database_overloaded():
+        value = cache.get(stale_key)
+    if value is None:
+        with primary_reads():
+            value = build()
+            cache.set(key, value, timeout, version=version)
+            cache.set(stale_key, value, STALE_TIMEOUT)
+    return value
+
+def summary_timeout(date_end):
+    if date_end >= timezone.localdate():
+        return CURRENT_SUMMARY_TIMEOUT
+    return SUMMARY_TIMEOUT
@@ -0,0 +1,56 @@
+"""
+Inline SVG charts, rendered on the server so pages arrive fully drawn.
+
+Colours and fonts come from the stylesheet (`.pie-chart`, `.bar-chart`).
+"""
+import math
+from functools import lru_cache
+
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+PIE_RADIUS = 14
+PIE_PADDING = 4
+
+BAR_ROW_HEIGHT = 16
+BAR_HEIGHT = 8
+# share of the chart's width used by the longest bar, leaving room for the labels
+BAR_MAX_PERCENT = 70
+
+@lru_cache(maxsize=None)
+def pie_chart(percentage):
+    """A ring filled to `percentage` (0-100). There are only 101 of them, so each is built once."""
+    percentage = max(0, min(100, int(percentage)))
+    circumference = 2 * math.pi * PIE_RADIUS
+    visible = round(percentage / 100 * circumference, 2)
+    invisible = round(circumference - visible, 2)
+    center = PIE_RADIUS + PIE_PADDING
+    return mark_safe(
+        f'<svg width="21" height="21" viewBox="0 0 36 36" role="img" aria-label="{percentage}%">'
+        f'<circle class="bg" cx="{center}" cy="{center}" r="{PIE_RADIUS}"/>'
+        f'<circle class="fg" cx="{center}" cy="{center}" r="{PIE_RADIUS}" stroke-dasharray="{visible} {invisible}"/>'
+        f'</svg>'
+    )
+
+def bar_chart(days, label_width, show_time=False):
+    """
+    One horizontal bar per day, as built by `build_daily_summary`, scaled to the
+    longest day. Each row is labelled with `date_label`, followed by the time
+    spent when `show_time` is set.
+    """
+    longest = max((day["total_seconds_spent"] for day in days), default=0)
+    height = len(days) * BAR_ROW_HEIGHT
+    rows = []
+    for index, day in enumerate(days):
+        y = index * BAR_ROW_HEIGHT
+        label = escape(day["date_label"])
+        if show_time:
+            time_spent = day["daily_time_spent_dict"]
+            label += f' <tspan class="muted">{time_spent["hours"]:02d}:{time_spent["minutes"]:02d}</tspan>'
+        rows.append(f'<text x="0" y="{y + BAR_HEIGHT + 2}">{label}</text>')
+        if day["total_seconds_spent"] and longest:
+            width = round(day["total_seconds_spent"] / longest * BAR_MAX_PERCENT, 2)
+            rows.append(f'<rect x="{label_width}" y="{y + 2}" width="{width}%" height="{BAR_HEIGHT}"/>')
+    return mark_safe(
+        f'<svg class="bar-chart" width="100%" height="{height}" role="img">{"".join(rows)}</svg>'
+    )
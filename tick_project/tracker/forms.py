@@ -39,6 +39,39 @@ class ProjectForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         self.fields["name"].widget.attrs.update({'class': 'form-control'})
 
+class BulkTaskForm(forms.Form):
+    """An action to apply to several of the user's tasks at once (see `services/bulk.py`)."""
+    DONE = "done"
+    PENDING = "pending"
+    MOVE = "move"
+    DELETE = "delete"
+    ACTION_CHOICES = [
+        (DONE, "mark done"),
+        (PENDING, "mark pending"),
+        (MOVE, "move to project"),
+        (DELETE, "delete"),
+    ]
+
+    action = forms.ChoiceField(choices=ACTION_CHOICES)
+    tasks = forms.ModelMultipleChoiceField(
+        queryset=Task.objects.none(), error_messages={"required": "Select at least one task."}
+    )
+    project = forms.ModelChoiceField(queryset=Project.objects.none(), required=False, empty_label="project")
+
+    def __init__(self, *args, **kwargs):
+        user = kwargs.pop("user")
+        super().__init__(*args, **kwargs)
+        self.fields["tasks"].queryset = Task.objects.filter(project__user=user)
+        self.fields["project"].queryset = user.project_set.filter(active=True)
+        self.fields["action"].widget.attrs.update({'class': 'form-control'})
+        self.fields["project"].widget.attrs.update({'class': 'form-control'})
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get("action") == self.MOVE and not cleaned_data.get("project"):
+            self.add_error("project", "Choose the project to move the tasks to.")
+        return cleaned_data
+
 class SessionReviewForm(forms.Form):
     task_name = forms.CharField(label="Task name", max_length=255)
     duration_minutes = forms.IntegerField(label="Duration (minutes)", min_value=1)
@@ -54,4 +87,17 @@ class SessionReviewForm(forms.Form):
 
         self.fields["task_name"].widget.attrs.update({'class': 'form-control'})
         self.fields["duration_minutes"].widget.attrs.update({'class': 'form-control'})
-        self.fields["mark_done"].widget.attrs.update({'class': 'form-check-input'})
\ No newline at end of file
+        self.fields["mark_done"].widget.attrs.update({'class': 'form-check-input'})
+
+class SessionUploadForm(forms.Form):
+    """A finished session recorded offline by an app (see `services/sync.py`)."""
+    task = forms.IntegerField()
+    start_time = forms.DateTimeField()
+    end_time = forms.DateTimeField()
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start_time, end_time = cleaned_data.get("start_time"), cleaned_data.get("end_time")
+        if start_time and end_time and end_time <= start_time:
+            self.add_error("end_time", "The session must end after it starts.")
+        return cleaned_data
@@ -7,6 +7,11 @@ def timedelta_to_dict(td):
         "minutes": minutes
     }
 
+def format_hours_minutes(seconds):
+    """Format a number of seconds as HH:MM, like `timedelta_to_dict` counts them."""
+    hours, remainder = divmod(int(seconds or 0), 3600)
+    return f"{hours:02d}:{remainder // 60:02d}"
+
 def current_session_context(request):
     from .models import Session
     return {
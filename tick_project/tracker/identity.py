@@ -0,0 +1,68 @@
+"""
+Request-scoped identity map for projects and tasks.
+
+While a request is handled (see `IdentityMapMiddleware`), every Project and
+Task loaded from the database is recorded by primary key, and following a
+foreign key declared with `IdentityMapForeignKey` (`task.project`,
+`session.task`) returns the recorded instance instead of querying again. So
+within one request each project and task is fetched at most once, however
+many templates and signal handlers follow the key. Outside requests, e.g. in
+jobs and management commands, nothing is recorded.
+
+The latest load of a row wins. Like any instance a view already holds, a
+recorded instance does not see `QuerySet.update()` calls made later in the
+request.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import models
+from django.db.models.fields.related_descriptors import ForwardManyToOneDescriptor
+
+_current = ContextVar("identity_map", default=None)
+
+@contextmanager
+def identity_map():
+    """Record the projects and tasks loaded inside the block."""
+    token = _current.set({})
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+def remember(instance):
+    loaded = _current.get()
+    if loaded is not None and instance.pk is not None:
+        loaded[type(instance), instance.pk] = instance
+
+def lookup(model, pk):
+    loaded = _current.get()
+    if loaded is None or pk is None:
+        return None
+    return loaded.get((model, pk))
+
+class IdentityMapped:
+    """Model mixin recording the instances loaded from the database."""
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # instances with deferred fields would query again for them
+        if not instance.get_deferred_fields():
+            remember(instance)
+        return instance
+
+class IdentityMapForwardDescriptor(ForwardManyToOneDescriptor):
+    def get_object(self, instance):
+        related = lookup(self.field.remote_field.model, getattr(instance, self.field.attname))
+        if related is not None:
+            return related
+        return super().get_object(instance)
+
+class IdentityMapForeignKey(models.ForeignKey):
+    """A ForeignKey whose related object is taken from the identity map when it was loaded already."""
+    forward_related_accessor_class = IdentityMapForwardDescriptor
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        # nothing changes in the database, so migrations see a plain ForeignKey
+        return name, "django.db.models.ForeignKey", args, kwargs
@@ -0,0 +1,30 @@
+from jobs.registry import register
+from .models import Project
+from .services.deletion import (
+    purge_task, purge_tasks, purge_project, purge_user, count_task_rows, count_tasks_rows, count_project_rows,
+)
+
+@register("tracker.purge_task", label="Deleting task")
+def purge_task_job(job, task_id):
+    total = count_task_rows(task_id)
+    job.set_progress(0, total)
+    purge_task(task_id, progress=job.set_progress)
+
+@register("tracker.purge_tasks", label="Deleting tasks")
+def purge_tasks_job(job, task_ids):
+    total = count_tasks_rows(task_ids)
+    job.set_progress(0, total)
+    purge_tasks(task_ids, progress=job.set_progress)
+
+@register("tracker.purge_project", label="Deleting project")
+def purge_project_job(job, project_id):
+    total = count_project_rows(project_id)
+    job.set_progress(0, total)
+    purge_project(project_id, progress=job.set_progress)
+
+@register("tracker.purge_user", label="Deleting account")
+def purge_user_job(job, user_id):
+    project_ids = Project.all_objects.filter(user_id=user_id).values_list("pk", flat=True)
+    total = sum(count_project_rows(project_id) for project_id in project_ids) + 1
+    job.set_progress(0, total)
+    purge_user(user_id, progress=job.set_progress)
@@ -0,0 +1,25 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from tracker.models import Project, Task
+from tracker.services.deletion import PurgeStats, purge_task, purge_project, purge_user
+
+class Command(BaseCommand):
+    help = "Purge the rows of every account, project and task marked as deleted, e.g. after an interrupted purge."
+
+    def handle(self, *args, **options):
+        total = PurgeStats()
+        purges = [
+            (purge_user, get_user_model().objects.filter(deleted_at__isnull=False)),
+            (purge_project, Project.all_objects.filter(deleted_at__isnull=False)),
+            (purge_task, Task.all_objects.filter(deleted_at__isnull=False)),
+        ]
+        for purge, queryset in purges:
+            for pk in queryset.values_list("pk", flat=True):
+                stats = purge(pk)
+                total.rows += stats.rows
+                total.seconds += stats.seconds
+
+        self.stdout.write(
+            f"Deleted {total.rows} rows in {total.seconds:.2f}s ({total.rows_per_second:.0f} rows/s)"
+        )
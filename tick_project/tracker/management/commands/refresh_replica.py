@@ -0,0 +1,51 @@
+import os
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+class Command(BaseCommand):
+    help = "Copy the primary SQLite database to the read replica using SQLite's backup API."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep running and refresh the replica every INTERVAL seconds.",
+        )
+
+    def handle(self, *args, **options):
+        alias = settings.REPLICA_DATABASE_ALIAS
+        if alias not in settings.DATABASES:
+            raise CommandError("No replica configured, set REPLICA_DATABASE_NAME to enable it.")
+
+        primary = connections["default"].settings_dict
+        replica = connections[alias].settings_dict
+        for db in (primary, replica):
+            if db["ENGINE"] != "django.db.backends.sqlite3":
+                raise CommandError("refresh_replica only supports SQLite databases.")
+
+        while True:
+            self.refresh(str(primary["NAME"]), str(replica["NAME"]))
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
+
+    def refresh(self, primary_path, replica_path):
+        started = time.perf_counter()
+        # back up into a temporary file and swap it in, so readers never see a half-written copy.
+        tmp_path = f"{replica_path}.tmp"
+        source = sqlite3.connect(primary_path)
+        target = sqlite3.connect(tmp_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        os.replace(tmp_path, replica_path)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"Replica refreshed in {elapsed:.3f}s")
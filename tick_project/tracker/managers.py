@@ -1,14 +1,46 @@
 from datetime import datetime, time, timedelta
 from django.utils import timezone
-from django.db.models import Manager
+from django.db.models import Count, DateTimeField, DurationField, ExpressionWrapper, F, Manager, Q, Sum, Value
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
 
+def date_range(date, extra_days=0):
+    """Return aware datetimes for midnight of `date` and the end of `date + extra_days`."""
+    start_datetime = timezone.make_aware(datetime.combine(date, time.min))  # midnight start
+    end_datetime = timezone.make_aware(datetime.combine(date + timedelta(days=extra_days), time.max)) # 23:59:59 end
+    return start_datetime, end_datetime
+
+def session_duration(prefix=""):
+    """
+    Expression for the duration of a session, counting a running session up to now.
+    `prefix` is the lookup path to the session, e.g. "sessions__" from a task.
+    """
+    end_time = Coalesce(F(f"{prefix}end_time"), Value(timezone.now(), output_field=DateTimeField()))
+    return ExpressionWrapper(end_time - F(f"{prefix}start_time"), output_field=DurationField())
+
+def task_time_spent():
+    """Annotation for the time tracked on a task, read by `Task.total_seconds_spent`."""
+    return Sum(session_duration("sessions__"))
+
+def project_time_spent():
+    """Annotation for the time tracked on a project's tasks that aren't deleted, read by `Project.total_seconds_spent`."""
+    return Sum(session_duration("tasks__sessions__"), filter=Q(tasks__deleted_at__isnull=True))
+
+class ProjectManager(Manager):
+    def get_queryset(self):
+        # deleted projects are hidden until their rows are purged
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
 class SessionManager(Manager):
+    def get_queryset(self):
+        # sessions of deleted tasks are hidden until their rows are purged
+        return super().get_queryset().filter(task__deleted_at__isnull=True)
+
     def get_active_session(self, user):
         active_session = self.filter(
             task__project__user = user,
             end_time__isnull = True
-        ).first()
+        ).select_related("task").first()
         return active_session
 
     def end_current_session(self, user):
@@ -27,25 +59,23 @@ class SessionManager(Manager):
    
     def by_project_and_start_date_within(self, project, date, extra_days=0):
         """Fetch sessions that started between `date`(inclusive) and `extra_days` (inclusive)"""
-        start_datetime = timezone.make_aware(datetime.combine(date, time.min))  # midnight start
-        end_datetime = timezone.make_aware(datetime.combine(date + timedelta(days=extra_days), time.max)) # 23:59:59 end
-
         return self.filter(
-            start_time__range=(start_datetime, end_datetime), 
+            start_time__range=date_range(date, extra_days), 
             task__project= project
             )
     
     def by_user_and_start_date_within(self, user, date, extra_days=0):
         """Fetch sessions that started between `date`(inclusive) and `extra_days` (inclusive)"""
-        start_datetime = timezone.make_aware(datetime.combine(date, time.min))  # midnight start
-        end_datetime = timezone.make_aware(datetime.combine(date + timedelta(days=extra_days), time.max)) # 23:59:59 end
-
         return self.filter(
-            start_time__range=(start_datetime, end_datetime), 
+            start_time__range=date_range(date, extra_days), 
             task__project__user= user
             )
 
 class TaskManager(Manager):
+    def get_queryset(self):
+        # deleted tasks are hidden until their rows are purged
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
     def by_user_and_is_active(self, user, is_done=False):
         """
         Fetch tasks that belong to an active user's project. 
@@ -59,11 +89,18 @@ class TaskManager(Manager):
     
     def by_user_and_done_date_within(self, user, date, extra_days=0):
         """Fetch tasks that that were marked as done between `date`(inclusive) and `extra_days` (inclusive)"""
-        start_datetime = timezone.make_aware(datetime.combine(date, time.min))  # midnight start
-        end_datetime = timezone.make_aware(datetime.combine(date + timedelta(days=extra_days), time.max)) # 23:59:59 end
-
         return self.filter(
             project__user=user,
             is_done=True,
-            done_at__range=(start_datetime, end_datetime)
-        ).order_by('-done_at')
\ No newline at end of file
+            done_at__range=date_range(date, extra_days)
+        ).order_by('-done_at')
+
+    def count_by_user(self, user, date):
+        """
+        Count, in a single query, the user's tasks marked as done on `date`
+        and the pending tasks of active projects.
+        """
+        return self.filter(project__user=user).aggregate(
+            done=Count("pk", filter=Q(is_done=True, done_at__range=date_range(date))),
+            pending=Count("pk", filter=Q(is_done=False, project__active=True)),
+        )
\ No newline at end of file
@@ -0,0 +1,10 @@
+from .identity import identity_map
+
+class IdentityMapMiddleware:
+    """Load each project and task at most once per request (see `identity.py`)."""
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with identity_map():
+            return self.get_response(request)
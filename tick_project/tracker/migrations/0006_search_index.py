@@ -0,0 +1,99 @@
+from django.db import migrations
+
+# Full-text index over task and project names (see tracker/services/search.py).
+# Task rows use rowid = 2 * id and project rows 2 * id + 1. `owner` holds the
+# token "u<user id>" so a search only reads its user's part of the index.
+# Deleted rows are left out; triggers keep the index in sync with the tables.
+CREATE = [
+    """
+    CREATE VIRTUAL TABLE tracker_search USING fts5(
+        name, owner, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER tracker_search_task_insert AFTER INSERT ON tracker_task
+    WHEN NEW.deleted_at IS NULL
+    BEGIN
+        INSERT INTO tracker_search (rowid, name, owner)
+        SELECT 2 * NEW.id, NEW.name, 'u' || user_id FROM tracker_project WHERE id = NEW.project_id;
+    END
+    """,
+    """
+    CREATE TRIGGER tracker_search_task_update AFTER UPDATE OF name, project_id, deleted_at ON tracker_task
+    WHEN OLD.name IS NOT NEW.name OR OLD.project_id IS NOT NEW.project_id OR OLD.deleted_at IS NOT NEW.deleted_at
+    BEGIN
+        DELETE FROM tracker_search WHERE rowid = 2 * OLD.id;
+        INSERT INTO tracker_search (rowid, name, owner)
+        SELECT 2 * NEW.id, NEW.name, 'u' || user_id FROM tracker_project
+        WHERE id = NEW.project_id AND NEW.deleted_at IS NULL;
+    END
+    """,
+    """
+    CREATE TRIGGER tracker_search_task_delete AFTER DELETE ON tracker_task
+    BEGIN
+        DELETE FROM tracker_search WHERE rowid = 2 * OLD.id;
+    END
+    """,
+    """
+    CREATE TRIGGER tracker_search_project_insert AFTER INSERT ON tracker_project
+    WHEN NEW.deleted_at IS NULL
+    BEGIN
+        INSERT INTO tracker_search (rowid, name, owner) VALUES (2 * NEW.id + 1, NEW.name, 'u' || NEW.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER tracker_search_project_update AFTER UPDATE OF name, deleted_at ON tracker_project
+    WHEN OLD.name IS NOT NEW.name OR OLD.deleted_at IS NOT NEW.deleted_at
+    BEGIN
+        DELETE FROM tracker_search WHERE rowid = 2 * OLD.id + 1;
+        INSERT INTO tracker_search (rowid, name, owner)
+        SELECT 2 * NEW.id + 1, NEW.name, 'u' || NEW.user_id WHERE NEW.deleted_at IS NULL;
+    END
+    """,
+    """
+    CREATE TRIGGER tracker_search_project_delete AFTER DELETE ON tracker_project
+    BEGIN
+        DELETE FROM tracker_search WHERE rowid = 2 * OLD.id + 1;
+    END
+    """,
+    """
+    INSERT INTO tracker_search (rowid, name, owner)
+    SELECT 2 * task.id, task.name, 'u' || project.user_id
+    FROM tracker_task task JOIN tracker_project project ON project.id = task.project_id
+    WHERE task.deleted_at IS NULL
+    """,
+    """
+    INSERT INTO tracker_search (rowid, name, owner)
+    SELECT 2 * id + 1, name, 'u' || user_id FROM tracker_project WHERE deleted_at IS NULL
+    """,
+]
+
+DROP = [
+    "DROP TRIGGER IF EXISTS tracker_search_task_insert",
+    "DROP TRIGGER IF EXISTS tracker_search_task_update",
+    "DROP TRIGGER IF EXISTS tracker_search_task_delete",
+    "DROP TRIGGER IF EXISTS tracker_search_project_insert",
+    "DROP TRIGGER IF EXISTS tracker_search_project_update",
+    "DROP TRIGGER IF EXISTS tracker_search_project_delete",
+    "DROP TABLE IF EXISTS tracker_search",
+]
+
+def run(statements):
+    def operation(apps, schema_editor):
+        # FTS5 is SQLite only; other databases fall back to `icontains` searches
+        if schema_editor.connection.vendor != "sqlite":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0005_project_deleted_at_task_deleted_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(CREATE), run(DROP)),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-19 17:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0006_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['start_time'], name='tracker_session_start_time'),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(condition=models.Q(('end_time__isnull', True)), fields=['end_time'], name='tracker_session_running'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['is_done'], name='tracker_task_is_done'),
+        ),
+    ]
@@ -0,0 +1,164 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Change log read by the sync API (see tracker/services/sync.py). Inserts,
+# updates of synced fields and deletes of projects, tasks and sessions add an
+# entry for the object's user and replace its previous entry. The AUTOINCREMENT
+# id never reuses a deleted entry's id, so an object's new entry always sorts
+# after every cursor a client already holds. Rows purged after a soft delete
+# (and the sessions of purged tasks) already have their entry and get no new
+# one. Existing rows get an entry each, so a first sync returns everything.
+CREATE = [
+    """
+    CREATE TRIGGER tracker_change_project_insert AFTER INSERT ON tracker_project
+    BEGIN
+        INSERT INTO tracker_change (user_id, kind, object_id) VALUES (NEW.user_id, 'project', NEW.id);
+    END
+    """,
+    """
+    CREATE TRIGGER tracker_change_project_update AFTER UPDATE OF name, active, color, deleted_at ON tracker_project
+    WHEN OLD.name IS NOT NEW.name OR OLD.active IS NOT NEW.active OR OLD.color IS NOT NEW.color
+        OR OLD.deleted_at IS NOT NEW.deleted_at
+    BEGIN
+        DELETE FROM tracker_change WHERE kind = 'project' AND object_id = NEW.id;
+        INSERT INTO tracker_change (user_id, kind, object_id) VALUES (NEW.user_id, 'project', NEW.id);
+    END
+    """,
+    """
+    CREATE TRIGGER tracker_change_project_delete AFTER DELETE ON tracker_project
+    WHEN OLD.deleted_at IS NULL
+    BEGIN
+        DELETE FROM tracker_change WHERE kind = 'project' AND object_id = OLD.id;
+        INSERT INTO tracker_change (user_id, kind, object_id) VALUES (OLD.user_id, 'project', OLD.id);
+    END
+    """,
+    """
+    CREATE TRIGGER tracker_change_task_insert AFTER INSERT ON tracker_task
+    BEGIN
+        INSERT INTO tracker_change (user_id, kind, object_id)
+        SELECT user_id, 'task', NEW.id FROM tracker_project WHERE id = NEW.project_id;
+    END
+    """,
+    """
+    CREATE TRIGGER tracker_change_task_update AFTER UPDATE OF project_id, name, is_done, done_at, deleted_at ON tracker_task
+    WHEN OLD.project_id IS NOT NEW.project_id OR OLD.name IS NOT NEW.name OR OLD.is_done IS NOT NEW.is_done
+        OR OLD.done_at IS NOT NEW.done_at OR OLD.deleted_at IS NOT NEW.deleted_at
+    BEGIN
+        DELETE FROM tracker_change WHERE kind = 'task' AND object_id = NEW.id;
+        INSERT INTO tracker_change (user_id, kind, object_id)
+        SELECT user_id, 'task', NEW.id FROM tracker_project WHERE id = NEW.project_id;
+    END
+    """,
+    """
+    CREATE TRIGGER tracker_change_task_delete AFTER DELETE ON tracker_task
+    WHEN OLD.deleted_at IS NULL
+        AND EXISTS (SELECT 1 FROM tracker_project WHERE id = OLD.project_id AND deleted_at IS NULL)
+    BEGIN
+        DELETE FROM tracker_change WHERE kind = 'task' AND object_id = OLD.id;
+        INSERT INTO tracker_change (user_id, kind, object_id)
+        SELECT user_id, 'task', OLD.id FROM tracker_project WHERE id = OLD.project_id;
+    END
+    """,
+    """
+    CREATE TRIGGER tracker_change_session_insert AFTER INSERT ON tracker_session
+    BEGIN
+        INSERT INTO tracker_change (user_id, kind, object_id)
+        SELECT project.user_id, 'session', NEW.id
+        FROM tracker_task task JOIN tracker_project project ON project.id = task.project_id
+        WHERE task.id = NEW.task_id;
+    END
+    """,
+    """
+    CREATE TRIGGER tracker_change_session_update AFTER UPDATE OF task_id, start_time, end_time ON tracker_session
+    WHEN OLD.task_id IS NOT NEW.task_id OR OLD.start_time IS NOT NEW.start_time OR OLD.end_time IS NOT NEW.end_time
+    BEGIN
+        DELETE FROM tracker_change WHERE kind = 'session' AND object_id = NEW.id;
+        INSERT INTO tracker_change (user_id, kind, object_id)
+        SELECT project.user_id, 'session', NEW.id
+        FROM tracker_task task JOIN tracker_project project ON project.id = task.project_id
+        WHERE task.id = NEW.task_id;
+    END
+    """,
+    """
+    CREATE TRIGGER tracker_change_session_delete AFTER DELETE ON tracker_session
+    WHEN EXISTS (
+        SELECT 1 FROM tracker_task task JOIN tracker_project project ON project.id = task.project_id
+        WHERE task.id = OLD.task_id AND task.deleted_at IS NULL AND project.deleted_at IS NULL
+    )
+    BEGIN
+        DELETE FROM tracker_change WHERE kind = 'session' AND object_id = OLD.id;
+        INSERT INTO tracker_change (user_id, kind, object_id)
+        SELECT project.user_id, 'session', OLD.id
+        FROM tracker_task task JOIN tracker_project project ON project.id = task.project_id
+        WHERE task.id = OLD.task_id;
+    END
+    """,
+    """
+    INSERT INTO tracker_change (user_id, kind, object_id)
+    SELECT user_id, 'project', id FROM tracker_project WHERE deleted_at IS NULL ORDER BY id
+    """,
+    """
+    INSERT INTO tracker_change (user_id, kind, object_id)
+    SELECT project.user_id, 'task', task.id
+    FROM tracker_task task JOIN tracker_project project ON project.id = task.project_id
+    WHERE task.deleted_at IS NULL AND project.deleted_at IS NULL
+    ORDER BY task.id
+    """,
+    """
+    INSERT INTO tracker_change (user_id, kind, object_id)
+    SELECT project.user_id, 'session', session.id
+    FROM tracker_session session
+    JOIN tracker_task task ON task.id = session.task_id
+    JOIN tracker_project project ON project.id = task.project_id
+    WHERE task.deleted_at IS NULL AND project.deleted_at IS NULL
+    ORDER BY session.id
+    """,
+]
+
+DROP = [
+    "DROP TRIGGER IF EXISTS tracker_change_project_insert",
+    "DROP TRIGGER IF EXISTS tracker_change_project_update",
+    "DROP TRIGGER IF EXISTS tracker_change_project_delete",
+    "DROP TRIGGER IF EXISTS tracker_change_task_insert",
+    "DROP TRIGGER IF EXISTS tracker_change_task_update",
+    "DROP TRIGGER IF EXISTS tracker_change_task_delete",
+    "DROP TRIGGER IF EXISTS tracker_change_session_insert",
+    "DROP TRIGGER IF EXISTS tracker_change_session_update",
+    "DROP TRIGGER IF EXISTS tracker_change_session_delete",
+]
+
+def run(statements):
+    def operation(apps, schema_editor):
+        # the triggers are SQLite only, like the search index
+        if schema_editor.connection.vendor != "sqlite":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0007_session_and_task_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('project', 'Project'), ('task', 'Task'), ('session', 'Session')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('user', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'object_id'], name='tracker_change_object')],
+            },
+        ),
+        migrations.RunPython(run(CREATE), run(DROP)),
+    ]
@@ -4,17 +4,23 @@ from django.utils import timezone
 
 from django.conf import settings
 
-from .managers import SessionManager, TaskManager
+from .managers import ProjectManager, SessionManager, TaskManager
 from .helpers import timedelta_to_dict
+from .identity import IdentityMapForeignKey, IdentityMapped
 # Create your models here.
 
-class Project(models.Model):
+class Project(IdentityMapped, models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     name = models.CharField(max_length=255)
     active = models.BooleanField(default=True)
     color = models.CharField(max_length=7, default="#C3C3C3")
     created_at = models.DateTimeField(auto_now_add=True)  
     last_edited = models.DateTimeField(auto_now=True)  
+    # set when the project is deleted; its rows are purged in the background
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = ProjectManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         return self.name
@@ -23,6 +29,9 @@ class Project(models.Model):
         return timedelta_to_dict(timedelta(seconds=self.total_seconds_spent()))
 
     def total_seconds_spent(self):
+        # lists annotate the total with the query to avoid a query per project
+        if hasattr(self, "time_spent"):
+            return self.time_spent.total_seconds() if self.time_spent else 0
         total_seconds = sum(task.total_seconds_spent() for task in self.tasks.all())
         return total_seconds
     
@@ -31,15 +40,24 @@ class Project(models.Model):
         seconds = sum(session.duration_in_seconds() for session in sessions)
         return seconds
 
-class Task(models.Model):
-    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="tasks")
+class Task(IdentityMapped, models.Model):
+    project = IdentityMapForeignKey(Project, on_delete=models.CASCADE, related_name="tasks")
     name = models.CharField(max_length=280)
     is_done = models.BooleanField(default=False)
     done_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     last_edited = models.DateTimeField(auto_now=True)
+    # set when the task is deleted; its rows are purged in the background
+    deleted_at = models.DateTimeField(null=True, blank=True)
 
     objects = TaskManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            # entries are in (is_done, pk) order, so the admin's done filter pages without sorting
+            models.Index(fields=["is_done"], name="tracker_task_is_done"),
+        ]
 
     def save(self, *args, **kwargs):
         # update done_at according to task.is_done 
@@ -56,15 +74,26 @@ class Task(models.Model):
         return timedelta_to_dict(timedelta(seconds=self.total_seconds_spent()))
 
     def total_seconds_spent(self):
+        # lists annotate the total with the query to avoid a query per task
+        if hasattr(self, "time_spent"):
+            return self.time_spent.total_seconds() if self.time_spent else 0
         total_seconds = sum(session.duration_in_seconds() for session in self.sessions.all())
         return total_seconds
 
 class Session(models.Model):
-    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="sessions")
+    task = IdentityMapForeignKey(Task, on_delete=models.CASCADE, related_name="sessions")
     start_time = models.DateTimeField(null=True, blank=True)
     end_time = models.DateTimeField(null=True, blank=True)
 
     objects = SessionManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["start_time"], name="tracker_session_start_time"),
+            # only running sessions, so finding a user's active session reads a handful of rows
+            models.Index(fields=["end_time"], condition=models.Q(end_time__isnull=True), name="tracker_session_running"),
+        ]
 
     def __str__(self):
         return f"{self.task}({self.start_time})"
@@ -72,8 +101,8 @@ class Session(models.Model):
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
         # update last_edited timestamp on task when a session is saved.
-        Task.objects.filter(pk=self.task.pk).update(last_edited=timezone.now())
-        Project.objects.filter(pk=self.task.project.pk).update(last_edited=timezone.now())
+        Task.objects.filter(pk=self.task_id).update(last_edited=timezone.now())
+        Project.objects.filter(pk=self.task.project_id).update(last_edited=timezone.now())
 
     def set_start_time(self):
         self.start_time = timezone.now()
@@ -96,4 +125,33 @@ class Session(models.Model):
         return duration.total_seconds()
     
     def duration_dict(self):
-        return timedelta_to_dict(timedelta(seconds=self.duration_in_seconds()))
\ No newline at end of file
+        return timedelta_to_dict(timedelta(seconds=self.duration_in_seconds()))
+
+class Change(models.Model):
+    """
+    An entry of a user's change log, read by the sync API (see `services/sync.py`).
+    Entries are written by database triggers (migration 0008), not by the ORM.
+    """
+    PROJECT = "project"
+    TASK = "task"
+    SESSION = "session"
+    KIND_CHOICES = [
+        (PROJECT, "Project"),
+        (TASK, "Task"),
+        (SESSION, "Session"),
+    ]
+
+    # no constraint: deleting an account removes its entries before its rows,
+    # whose delete triggers may still record a few entries for it
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_constraint=False, related_name="+")
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+
+    class Meta:
+        indexes = [
+            # the triggers replace an object's previous entry
+            models.Index(fields=["kind", "object_id"], name="tracker_change_object"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} (#{self.pk})"
@@ -0,0 +1,34 @@
+"""
+Actions on many tasks at once, each run as a single UPDATE.
+
+`tasks` is a queryset of the user's tasks, e.g. the cleaned value of
+`BulkTaskForm.tasks`. Only the tasks the action changes are updated, so
+`last_edited` is touched exactly where `Task.save` would have touched it,
+and `done_at` follows the same rules as in `Task.save`. Bulk updates don't
+send `post_save`, so the user's data version is bumped explicitly.
+Deleting is in `deletion.py` (`mark_tasks_deleted`).
+"""
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from ..cache import bump_data_version
+
+def mark_tasks_done(user, tasks, done=True):
+    """Mark `tasks` done (or pending again) and return how many changed."""
+    now = timezone.now()
+    if done:
+        # like Task.save, keep an existing done_at
+        changed = tasks.filter(is_done=False).update(is_done=True, done_at=Coalesce("done_at", Value(now)), last_edited=now)
+    else:
+        changed = tasks.filter(is_done=True).update(is_done=False, done_at=None, last_edited=now)
+    if changed:
+        bump_data_version(user.pk)
+    return changed
+
+def move_tasks(user, tasks, project):
+    """Move `tasks` to `project` and return how many changed."""
+    changed = tasks.exclude(project=project).update(project=project, last_edited=timezone.now())
+    if changed:
+        bump_data_version(user.pk)
+    return changed
@@ -0,0 +1,147 @@
+"""
+Deletion of accounts, projects and tasks without Django's cascade collector.
+
+`Model.delete()` loads every related Task and Session into memory to emulate
+ON DELETE CASCADE, which takes seconds for accounts with many sessions. Instead,
+the `mark_*_deleted` functions hide the object right away (setting `deleted_at`
+makes the default managers skip it) and enqueue a background job (see
+`tracker/jobs.py`) that removes its rows with raw DELETEs in bounded batches,
+children first, each batch in its own short transaction.
+"""
+import logging
+import time
+from dataclasses import dataclass
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.utils import timezone
+
+from jobs.models import Job
+from users.auth import invalidate_user
+from ..cache import bump_data_version
+from ..models import Project, Task, Session
+
+logger = logging.getLogger(__name__)
+
+# rows removed per DELETE statement
+BATCH_SIZE = 1000
+
+@dataclass
+class PurgeStats:
+    rows: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+def mark_task_deleted(task):
+    """Hide the task and its sessions, and return the job purging them."""
+    with transaction.atomic():
+        Task.all_objects.filter(pk=task.pk).update(deleted_at=timezone.now())
+        job = Job.objects.enqueue("tracker.purge_task", user=task.project.user, task_id=task.pk)
+    bump_data_version(task.project.user_id)
+    return job
+
+def mark_tasks_deleted(user, tasks):
+    """Hide `tasks` (a queryset of the user's tasks) and their sessions, and return the job purging them."""
+    with transaction.atomic():
+        task_ids = list(tasks.values_list("pk", flat=True))
+        Task.all_objects.filter(pk__in=task_ids).update(deleted_at=timezone.now())
+        job = Job.objects.enqueue("tracker.purge_tasks", user=user, task_ids=task_ids)
+    bump_data_version(user.pk)
+    return job
+
+def mark_project_deleted(project):
+    """Hide the project with its tasks and sessions, and return the job purging them."""
+    now = timezone.now()
+    with transaction.atomic():
+        Project.all_objects.filter(pk=project.pk).update(deleted_at=now)
+        Task.all_objects.filter(project=project, deleted_at__isnull=True).update(deleted_at=now)
+        job = Job.objects.enqueue("tracker.purge_project", user=project.user, project_id=project.pk)
+    bump_data_version(project.user_id)
+    return job
+
+def mark_user_deleted(user):
+    """Deactivate the account (so it can no longer log in), hide its projects and tasks and return the job purging them."""
+    now = timezone.now()
+    with transaction.atomic():
+        get_user_model().objects.filter(pk=user.pk).update(is_active=False, deleted_at=now)
+        Project.all_objects.filter(user=user, deleted_at__isnull=True).update(deleted_at=now)
+        Task.all_objects.filter(project__user=user, deleted_at__isnull=True).update(deleted_at=now)
+        # the job outlives the account, so it isn't linked to it
+        job = Job.objects.enqueue("tracker.purge_user", user_id=user.pk)
+    # update() sends no post_save, so drop the cached user here: its other sessions must stop authenticating
+    invalidate_user(user.pk)
+    return job
+
+def count_task_rows(task_id):
+    return Session.all_objects.filter(task_id=task_id).count() + 1
+
+def count_tasks_rows(task_ids):
+    return Session.all_objects.filter(task_id__in=task_ids).count() + len(task_ids)
+
+def count_project_rows(project_id):
+    tasks = Task.all_objects.filter(project_id=project_id)
+    return Session.all_objects.filter(task__in=tasks).count() + tasks.count() + 1
+
+def purge_task(task_id, progress=None):
+    stats = PurgeStats()
+    started = time.perf_counter()
+    _delete_in_batches(Session, "task_id = %s", [task_id], stats, progress)
+    _delete_in_batches(Task, "id = %s", [task_id], stats, progress)
+    return _finish("task", task_id, stats, started)
+
+def purge_tasks(task_ids, progress=None):
+    stats = PurgeStats()
+    started = time.perf_counter()
+    for offset in range(0, len(task_ids), BATCH_SIZE):
+        chunk = task_ids[offset:offset + BATCH_SIZE]
+        placeholders = ", ".join(["%s"] * len(chunk))
+        _delete_in_batches(Session, f"task_id IN ({placeholders})", chunk, stats, progress)
+        _delete_in_batches(Task, f"id IN ({placeholders})", chunk, stats, progress)
+    return _finish("tasks", f"({len(task_ids)})", stats, started)
+
+def purge_project(project_id, progress=None):
+    stats = PurgeStats()
+    started = time.perf_counter()
+    task_table = connection.ops.quote_name(Task._meta.db_table)
+    _delete_in_batches(Session, f"task_id IN (SELECT id FROM {task_table} WHERE project_id = %s)", [project_id], stats, progress)
+    _delete_in_batches(Task, "project_id = %s", [project_id], stats, progress)
+    _delete_in_batches(Project, "id = %s", [project_id], stats, progress)
+    return _finish("project", project_id, stats, started)
+
+def purge_user(user_id, progress=None):
+    stats = PurgeStats()
+    started = time.perf_counter()
+    project_ids = list(Project.all_objects.filter(user_id=user_id).values_list("pk", flat=True))
+    for project_id in project_ids:
+        project_progress = None
+        if progress is not None:
+            # keep counting up from the rows deleted for previous projects
+            project_progress = lambda rows, offset=stats.rows: progress(offset + rows)
+        stats.rows += purge_project(project_id, project_progress).rows
+    # with the tracker rows gone, the collector only has the account's own small relations left
+    deleted, _ = get_user_model().objects.filter(pk=user_id).delete()
+    stats.rows += deleted
+    return _finish("user", user_id, stats, started)
+
+def _delete_in_batches(model, where, params, stats, progress=None):
+    table = connection.ops.quote_name(model._meta.db_table)
+    sql = f"DELETE FROM {table} WHERE id IN (SELECT id FROM {table} WHERE {where} LIMIT %s)"
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, [*params, BATCH_SIZE])
+            deleted = cursor.rowcount
+        stats.rows += deleted
+        if progress is not None:
+            progress(stats.rows)
+        if deleted < BATCH_SIZE:
+            break
+
+def _finish(kind, pk, stats, started):
+    stats.seconds = time.perf_counter() - started
+    logger.info(
+        "Purged %s %s: %d rows in %.2fs (%.0f rows/s)",
+        kind, pk, stats.rows, stats.seconds, stats.rows_per_second,
+    )
+    return stats
@@ -0,0 +1,100 @@
+"""
+Search over the names of a user's tasks and projects.
+
+On SQLite the names are indexed in the FTS5 table `tracker_search`, kept in
+sync by triggers (see migration 0006). Every word of the query matches as a
+prefix, and results are ranked by bm25. Other databases fall back to
+`icontains` lookups ordered by `last_edited`.
+"""
+import re
+from typing import NamedTuple
+
+from django.db import connections, router
+from django.db.models import Q, Sum
+
+from ..managers import session_duration
+from ..models import Project, Task
+
+SEARCH_LIMIT = 50
+
+WORD = re.compile(r"\w+")
+
+SEARCH_SQL = """
+SELECT rowid FROM tracker_search
+WHERE tracker_search MATCH %s
+ORDER BY rank
+LIMIT %s
+"""
+
+class SearchResult(NamedTuple):
+    kind: str  # "task" or "project"
+    item: object
+
+def match_query(text):
+    """
+    Build an FTS5 query matching names that contain each word of `text` as a
+    prefix, or None if `text` has no words. Words are quoted, so FTS5 operators
+    typed by the user are searched for as plain text.
+    """
+    words = WORD.findall(text)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+def ranked_rowids(connection, user, text, limit):
+    query = match_query(text)
+    if query is None:
+        return []
+    # the owner column narrows the match to the user's rows inside the index
+    match = f'owner:"u{user.pk}" AND name:({query})'
+    with connection.cursor() as cursor:
+        cursor.execute(SEARCH_SQL, [match, limit])
+        return [rowid for rowid, in cursor.fetchall()]
+
+def user_tasks(user):
+    # the index leaves deleted rows out, but a deleted project's tasks stay in it
+    return Task.objects.filter(project__user=user, project__deleted_at__isnull=True).select_related("project").annotate(
+        time_spent=Sum(session_duration("sessions__"))
+    )
+
+def user_projects(user):
+    return Project.objects.filter(user=user).annotate(
+        time_spent=Sum(session_duration("tasks__sessions__"), filter=Q(tasks__deleted_at__isnull=True))
+    )
+
+def search(user, text, limit=SEARCH_LIMIT):
+    """
+    Return up to `limit` of the user's tasks and projects whose names match
+    `text`, best match first, as SearchResult records.
+    """
+    connection = connections[router.db_for_read(Task)]
+    if connection.vendor != "sqlite":
+        return icontains_search(user, text, limit)
+
+    rowids = ranked_rowids(connection, user, text, limit)
+    task_pks = [rowid // 2 for rowid in rowids if rowid % 2 == 0]
+    project_pks = [rowid // 2 for rowid in rowids if rowid % 2 == 1]
+    tasks = user_tasks(user).in_bulk(task_pks)
+    projects = user_projects(user).in_bulk(project_pks)
+
+    results = []
+    for rowid in rowids:
+        if rowid % 2 == 0 and rowid // 2 in tasks:
+            results.append(SearchResult("task", tasks[rowid // 2]))
+        elif rowid % 2 == 1 and rowid // 2 in projects:
+            results.append(SearchResult("project", projects[rowid // 2]))
+    return results
+
+def icontains_search(user, text, limit=SEARCH_LIMIT):
+    """Search by `icontains` on every word, without ranking."""
+    words = WORD.findall(text)
+    if not words:
+        return []
+    tasks = user_tasks(user)
+    projects = user_projects(user)
+    for word in words:
+        tasks = tasks.filter(name__icontains=word)
+        projects = projects.filter(name__icontains=word)
+    results = [SearchResult("project", project) for project in projects.order_by("-last_edited")[:limit]]
+    results += [SearchResult("task", task) for task in tasks.order_by("-last_edited")[:limit - len(results)]]
+    return results
@@ -1,85 +1,115 @@
 from django.utils import timezone
 from datetime import timedelta
+from typing import NamedTuple
+
+from monitoring.tracing import traced
 
 from ..helpers import timedelta_to_dict
 
-def group_sessions_by_project(sessions):
-    """
-    Groups a list of sessions by their associated project.
+# Fields fetched with `values_list` for each session that goes into a summary.
+SESSION_SUMMARY_FIELDS = ("start_time", "end_time", "task__project_id", "task__project__name")
 
-    Args:
-        sessions (iterable): An iterable of Session instances.
+class ProjectSummary(NamedTuple):
+    """Time spent on one project within a summary period."""
+    pk: int
+    name: str
+    total_seconds: float
+    time_spent_dict: dict
+    percentage: int
 
-    Returns:
-        dict: A dictionary where keys are Project instances and values are lists of
-              Session instances belonging to that project.
+class SessionTotals:
+    """
+    Seconds spent within a summary period, in total, per project and per date.
+
+    Attributes:
+        total_seconds (float): Seconds spent across all sessions.
+        by_project (dict): Maps project pks to `[name, seconds]`.
+        by_date (dict): Maps local dates (datetime.date) to seconds.
     """
-    sessions_by_project = {}
-    for session in sessions:
-        project = session.task.project
-        if project not in sessions_by_project:
-            sessions_by_project[project] = []
-        sessions_by_project[project].append(session)
+    __slots__ = ("total_seconds", "by_project", "by_date")
 
-    return sessions_by_project
+    def __init__(self):
+        self.total_seconds = 0
+        self.by_project = {}
+        self.by_date = {}
 
-def build_annotated_project_summary(sessions_by_project:dict, total_seconds:int):
+@traced()
+def summarize_sessions(rows):
     """
-    Builds a summary of projects with annotated total time spent and percentage of total time.
+    Adds up session durations in a single pass over `rows`.
 
-    Each project in the summary will have three additional attributes:
-        - `total_seconds`: total time spent on that project in seconds.
-        - `time_spent_dict`: dictionary representation of total time spent (via `timedelta_to_dict`).
-        - `percentage`: percentage of total_seconds that were spent on project.
+    Only the running totals are kept, so memory grows with the number of
+    projects and dates rather than with the number of sessions. Sessions
+    without an end time are counted up to now.
 
     Args:
-        sessions_by_project (dict): A dictionary mapping Project instances to a list of Session instances.
-        total_seconds (int): Total seconds spent across all projects (used to calculate percentage).
+        rows (iterable): Tuples of (start_time, end_time, project_pk, project_name),
+              e.g. `sessions.values_list(*SESSION_SUMMARY_FIELDS)`.
 
     Returns:
-        list: A list of Project instances with annotated attributes.
+        SessionTotals: The summed durations.
     """
-    
-    project_summary = []
-    for project, project_sessions in sessions_by_project.items():
-        project.total_seconds = sum(session.duration_in_seconds() for session in project_sessions)
-        project.time_spent_dict = timedelta_to_dict(timedelta(seconds=project.total_seconds))
-        if total_seconds > 0:
-            project.percentage = round(project.total_seconds/total_seconds * 100)
+    totals = SessionTotals()
+    by_project = totals.by_project
+    by_date = totals.by_date
+    now = timezone.now()
+    tz = timezone.get_current_timezone()
+
+    for start_time, end_time, project_pk, project_name in rows:
+        if start_time is None:
+            continue
+        seconds = ((end_time or now) - start_time).total_seconds()
+        totals.total_seconds += seconds
+
+        project = by_project.get(project_pk)
+        if project is None:
+            by_project[project_pk] = [project_name, seconds]
         else:
-            project.percentage = 0
-        project_summary.append(project)
-    return project_summary
+            project[1] += seconds
 
-def group_sessions_by_date(sessions):
+        date = start_time.astimezone(tz).date()
+        by_date[date] = by_date.get(date, 0) + seconds
+
+    return totals
+
+@traced()
+def build_annotated_project_summary(seconds_by_project:dict, total_seconds:int):
     """
-    Groups a list of sessions by start_time date.
+    Builds a summary of projects with total time spent and percentage of total time.
 
     Args:
-        sessions (iterable): An iterable of Session instances.
+        seconds_by_project (dict): Maps project pks to `[name, seconds]`, as in `SessionTotals.by_project`.
+        total_seconds (int): Total seconds spent across all projects (used to calculate percentage).
 
     Returns:
-        dict: A dictionary where keys are dates and values are lists of
-              Session instances started on that date.
+        list: A list of ProjectSummary records, in the order the projects were first seen.
     """
-    sessions_by_date = {}
-    for session in sessions:
-        date = session.start_time.date()
-        if date not in sessions_by_date:
-            sessions_by_date[date] = []
-        sessions_by_date[date].append(session)
-    return sessions_by_date
-
-def build_daily_summary(sessions_by_date, date_start, date_end, date_format):
+    project_summary = []
+    for pk, (name, seconds) in seconds_by_project.items():
+        if total_seconds > 0:
+            percentage = round(seconds/total_seconds * 100)
+        else:
+            percentage = 0
+        project_summary.append(ProjectSummary(
+            pk=pk,
+            name=name,
+            total_seconds=seconds,
+            time_spent_dict=timedelta_to_dict(timedelta(seconds=seconds)),
+            percentage=percentage,
+        ))
+    return project_summary
+
+@traced()
+def build_daily_summary(seconds_by_date, date_start, date_end, date_format):
     """
     Builds a daily summary of session durations within a given date range.
 
-    For each day in the range, it calculates the total seconds spent on sessions and
+    For each day in the range, it takes the total seconds spent on sessions and
     creates a dictionary representation of the time. If there are no sessions for a day,
     the total seconds is 0.
 
     Args:
-        sessions_by_date (dict): A dictionary mapping dates (datetime.date) to lists of Session instances.
+        seconds_by_date (dict): Maps dates (datetime.date) to seconds, as in `SessionTotals.by_date`.
         date_start (datetime.date): The first date in the range.
         date_end (datetime.date): The last date in the range (inclusive).
         date_format (str): A format string used to label each day (e.g., "%A" for weekday name).
@@ -93,18 +123,14 @@ def build_daily_summary(sessions_by_date, date_start, date_end, date_format):
     daily_summary = []
     date = date_start
     while date <= date_end:
-        daily_sessions = sessions_by_date.get(date)
-        if daily_sessions:
-            total_seconds_spent = sum(session.duration_in_seconds() for session in daily_sessions)
-        else:
-            total_seconds_spent = 0
+        total_seconds_spent = seconds_by_date.get(date, 0)
 
         daily_summary.append({
-            "date_label": date.strftime(date_format), 
+            "date_label": date.strftime(date_format),
             "total_seconds_spent": total_seconds_spent,
             "daily_time_spent_dict": timedelta_to_dict(timedelta(seconds=total_seconds_spent))
         })
-        
+
         date = date + timedelta(days=1)
 
-    return daily_summary
\ No newline at end of file
+    return daily_summary
@@ -0,0 +1,107 @@
+"""
+Delta sync for the desktop and mobile apps (see `views/api.py`).
+
+Every insert, update and delete of a project, task or session replaces the
+object's entry in its user's change log (`Change`, kept by the triggers of
+migration 0008, so bulk updates and soft deletes are covered like `save()`).
+Entry ids only grow, and SQLite commits one write at a time, so they become
+visible in order: an entry's id is the cursor a client passes back as `since`
+to get the objects changed after it.
+
+Changed objects are returned as they are now; objects that no longer exist,
+or are hidden until their rows are purged, are returned as tombstones (ids
+only). Deleting a project deletes its tasks and sessions, and deleting a task
+its sessions, whether or not they get tombstones of their own.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..cache import bump_data_version
+from ..forms import SessionUploadForm
+from ..models import Change, Project, Task, Session
+
+# change log entries read per call; clients call again while `has_more`
+CHANGES_LIMIT = 500
+# sessions accepted per upload
+UPLOAD_LIMIT = 500
+
+@dataclass
+class ChangesPage:
+    cursor: int
+    has_more: bool
+    projects: list = field(default_factory=list)
+    tasks: list = field(default_factory=list)
+    sessions: list = field(default_factory=list)
+    # ids of deleted objects by kind
+    deleted: dict = field(default_factory=dict)
+
+def changes(user, since=0, limit=CHANGES_LIMIT):
+    """Return the user's objects changed after the cursor `since`, in four queries at most."""
+    entries = list(
+        Change.objects.filter(user=user, pk__gt=since).order_by("pk").values_list("pk", "kind", "object_id")[:limit + 1]
+    )
+    page = ChangesPage(cursor=entries[:limit][-1][0] if entries else since, has_more=len(entries) > limit)
+    changed = defaultdict(set)
+    for _, kind, object_id in entries[:limit]:
+        changed[kind].add(object_id)
+
+    querysets = {
+        Change.PROJECT: Project.objects.filter(user=user),
+        Change.TASK: Task.objects.filter(project__user=user),
+        Change.SESSION: Session.objects.filter(task__project__user=user),
+    }
+    for kind, queryset in querysets.items():
+        objects = list(queryset.filter(pk__in=changed[kind]).order_by("pk")) if changed[kind] else []
+        setattr(page, f"{kind}s", objects)
+        page.deleted[kind] = sorted(changed[kind] - {obj.pk for obj in objects})
+    return page
+
+def upload_sessions(user, items):
+    """
+    Store the finished sessions recorded offline, given as dicts with `task`,
+    `start_time` and `end_time`, all of them or none. Return the sessions in
+    the order of `items` and the errors by item index, if any.
+
+    A session matching one already stored (same task and start time) is
+    returned instead of stored twice, so an upload can safely be retried.
+    """
+    forms = [SessionUploadForm(item if isinstance(item, dict) else {}) for item in items]
+    for form in forms:
+        form.full_clean()
+    task_ids = {form.cleaned_data["task"] for form in forms if "task" in form.cleaned_data}
+    tasks = Task.objects.filter(project__user=user).in_bulk(task_ids)
+    for form in forms:
+        if "task" in form.cleaned_data and form.cleaned_data["task"] not in tasks:
+            form.add_error("task", "Unknown task.")
+    errors = {index: form.errors.get_json_data() for index, form in enumerate(forms) if form.errors}
+    if errors:
+        return [], errors
+
+    with transaction.atomic():
+        stored = {
+            (session.task_id, session.start_time): session
+            for session in Session.objects.filter(
+                task__in=tasks.values(), start_time__in={form.cleaned_data["start_time"] for form in forms}
+            )
+        }
+        sessions, new_sessions = [], []
+        for form in forms:
+            key = (form.cleaned_data["task"], form.cleaned_data["start_time"])
+            if key not in stored:
+                stored[key] = Session(
+                    task=tasks[key[0]], start_time=form.cleaned_data["start_time"], end_time=form.cleaned_data["end_time"]
+                )
+                new_sessions.append(stored[key])
+            sessions.append(stored[key])
+        if new_sessions:
+            Session.objects.bulk_create(new_sessions)
+            # like Session.save
+            now = timezone.now()
+            Task.objects.filter(pk__in={session.task_id for session in new_sessions}).update(last_edited=now)
+            Project.objects.filter(pk__in={session.task.project_id for session in new_sessions}).update(last_edited=now)
+    if new_sessions:
+        bump_data_version(user.pk)
+    return sessions, {}
@@ -0,0 +1,31 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from . import autocomplete
+from .cache import bump_data_version
+from .models import Project, Task, Session
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_changed(sender, instance, origin=None, **kwargs):
+    if origin is None or origin is instance:
+        bump_data_version(instance.user_id)
+        # the project's tasks may have been archived, deleted or renamed
+        autocomplete.forget(instance.user_id)
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_changed(sender, instance, origin=None, **kwargs):
+    # cascaded deletes are covered by the object the deletion started from
+    if origin is None or origin is instance:
+        version = bump_data_version(instance.project.user_id)
+        autocomplete.task_changed(instance, version, deleted=kwargs["signal"] is post_delete)
+
+@receiver(post_save, sender=Session)
+@receiver(post_delete, sender=Session)
+def session_changed(sender, instance, origin=None, **kwargs):
+    if origin is None or origin is instance:
+        version = bump_data_version(instance.task.project.user_id)
+        autocomplete.session_changed(
+            instance, version, created=kwargs.get("created", False), deleted=kwargs["signal"] is post_delete
+        )
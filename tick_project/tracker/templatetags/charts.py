@@ -0,0 +1,14 @@
+from django import template
+
+from .. import charts
+
+register = template.Library()
+
+@register.simple_tag
+def pie_chart(percentage):
+    return charts.pie_chart(percentage)
+
+@register.filter
+def duration_rem(seconds):
+    """Length of a duration bar: 1rem for every 1600 seconds."""
+    return f"{(seconds or 0) / 1600:.2f}rem"
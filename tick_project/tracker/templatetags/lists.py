@@ -0,0 +1,50 @@
+"""
+Rows of the task and project lists.
+
+Each row tag computes the row's values once, e.g. the time spent (annotated
+as `time_spent` by the list views), and renders its partial with only those
+in the context, so long lists don't look up the same values over and over.
+"""
+from django import template
+from django.utils.html import format_html
+
+from ..helpers import format_hours_minutes
+
+register = template.Library()
+
+@register.filter
+def hours_minutes(seconds):
+    return format_hours_minutes(seconds)
+
+@register.simple_tag
+def project_badge(project):
+    return format_html('<span class="project-badge small"><span>{}</span></span>', project.name)
+
+@register.inclusion_tag("tracker/partials/_pending_task_list_item.html")
+def pending_task_item(task, current_session=None, include_project=False, selectable=False):
+    running = current_session is not None and current_session.task_id == task.pk
+    return {
+        "task": task,
+        "seconds": task.total_seconds_spent(),
+        "running": running,
+        "can_start": current_session is None or running,
+        "include_project": include_project,
+        "selectable": selectable,
+    }
+
+@register.inclusion_tag("tracker/partials/_done_task_list_item.html")
+def done_task_item(task, include_project=False, selectable=False):
+    return {
+        "task": task,
+        "seconds": task.total_seconds_spent(),
+        "include_project": include_project,
+        "selectable": selectable,
+    }
+
+@register.inclusion_tag("tracker/partials/_project_list_item.html")
+def project_item(project):
+    return {"project": project, "seconds": project.total_seconds_spent()}
+
+@register.inclusion_tag("tracker/partials/_project_summary_list_item.html")
+def project_summary_item(project):
+    return {"project": project}
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Min
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tick_project.admin_tools import EstimatedCountPaginator, IndexedDateQuerySet, csv_chunks
+from ..models import Project, Session, Task
+
+User = get_user_model()
+
+class SmallLimitPaginator(EstimatedCountPaginator):
+    exact_count_limit = 5
+
+class LargeTableAdminTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(email="admin@example.com", password="StrongPassword123")
+        self.client.force_login(self.admin)
+        self.user = User.objects.create_user(email="test@example.com", password="StrongPassword123")
+        self.project = Project.objects.create(user=self.user, name="General")
+        self.task = Task.objects.create(project=self.project, name="Task")
+        self.start = timezone.make_aware(datetime(2023, 11, 20, 9))
+
+    def add_sessions(self, count, step=timedelta(days=1)):
+        Session.objects.bulk_create(
+            Session(task=self.task, start_time=self.start + step * number, end_time=self.start + step * number + timedelta(hours=1))
+            for number in range(count)
+        )
+
+    def test_changelists(self):
+        self.add_sessions(3)
+        for model in ("project", "task", "session"):
+            response = self.client.get(reverse(f"admin:tracker_{model}_changelist"))
+            self.assertEqual(response.status_code, 200)
+
+    def test_session_changelist_queries_do_not_grow_with_rows(self):
+        url = reverse("admin:tracker_session_changelist")
+        # over several years, so the hierarchy lists years
+        self.add_sessions(3, step=timedelta(days=400))
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+        other = Task.objects.create(project=Project.objects.create(user=self.user, name="Other"), name="Other")
+        Session.objects.bulk_create(Session(task=other, start_time=self.start, end_time=self.start) for _ in range(30))
+        with CaptureQueriesContext(connection) as more:
+            self.client.get(url)
+        self.assertEqual(len(few), len(more))
+        self.assertFalse(any("GROUP BY" in query["sql"] or "DISTINCT" in query["sql"] for query in more))
+
+    def test_estimated_count(self):
+        self.add_sessions(4)
+        self.assertEqual(SmallLimitPaginator(Session.objects.order_by("pk"), 2).count, 4)
+        self.add_sessions(6)
+        Session.objects.filter(pk__in=Session.objects.order_by("pk").values("pk")[:2]).delete()
+        # 8 rows, estimated from the largest pk
+        self.assertEqual(SmallLimitPaginator(Session.objects.order_by("pk"), 2).count, Session.objects.latest("pk").pk)
+
+    def test_date_hierarchy_from_first_and_last(self):
+        self.add_sessions(3, step=timedelta(days=40))
+        queryset = IndexedDateQuerySet(Session)
+        with self.assertNumQueries(2):
+            years = queryset.datetimes("start_time", "year")
+        self.assertEqual([date.year for date in years], [2023, 2024])
+        months = queryset.datetimes("start_time", "month")
+        # January has no sessions but is between the first and last
+        self.assertEqual([(date.year, date.month) for date in months], [(2023, 11), (2023, 12), (2024, 1), (2024, 2)])
+        self.assertEqual(queryset.aggregate(first=Min("start_time")), {"first": self.start})
+
+    def test_export_csv(self):
+        self.add_sessions(5)
+        url = reverse("admin:tracker_session_changelist")
+        response = self.client.post(url, {
+            "action": "export",
+            "_selected_action": list(Session.objects.values_list("pk", flat=True)),
+        })
+        self.assertEqual(response["Content-Type"], "text/csv")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "task_id,start_time,end_time")
+        self.assertEqual(len(lines), 6)
+
+    def test_csv_chunks(self):
+        self.add_sessions(5)
+        chunks = list(csv_chunks(Session.objects.all(), ("task_id",), chunk_size=2))
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual("".join(chunks).split(), ["task_id"] + [str(self.task.pk)] * 5)
@@ -0,0 +1,190 @@
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Change, Project, Task, Session
+from ..services.bulk import mark_tasks_done
+from ..services.deletion import mark_project_deleted, mark_task_deleted, purge_project
+from ..services.sync import changes
+
+User = get_user_model()
+
+class ApiTestMixin:
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="test@example.com", password="StrongPassword123")
+        self.client.login(email="test@example.com", password="StrongPassword123")
+        self.project = Project.objects.create(user=self.user, name="General")
+        self.task = Task.objects.create(project=self.project, name="Write report")
+        self.start = timezone.now().replace(microsecond=0) - timedelta(hours=2)
+        self.session = Session.objects.create(task=self.task, start_time=self.start, end_time=self.start + timedelta(minutes=30))
+
+    def changes(self, since=None):
+        params = {} if since is None else {"since": since}
+        response = self.client.get(reverse("tracker:api-changes"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def upload(self, sessions):
+        return self.client.post(reverse("tracker:api-sessions"), json.dumps({"sessions": sessions}), content_type="application/json")
+
+class ChangesApiTest(ApiTestMixin, TestCase):
+    def test_requires_login(self):
+        self.client.logout()
+        response = self.client.get(reverse("tracker:api-changes"))
+        self.assertEqual(response.status_code, 401)
+
+    def test_first_sync_returns_everything(self):
+        other = User.objects.create_user(email="other@example.com", password="StrongPassword123")
+        Project.objects.create(user=other, name="Not mine")
+
+        data = self.changes()
+        self.assertFalse(data["has_more"])
+        self.assertEqual(data["projects"], [{
+            "id": self.project.pk, "name": "General", "color": "#C3C3C3", "active": True,
+            "created_at": data["projects"][0]["created_at"],
+        }])
+        self.assertEqual([task["id"] for task in data["tasks"]], [self.task.pk])
+        self.assertEqual(data["sessions"], [{
+            "id": self.session.pk, "task": self.task.pk,
+            "start_time": self.start.isoformat().replace("+00:00", "Z"),
+            "end_time": (self.start + timedelta(minutes=30)).isoformat().replace("+00:00", "Z"),
+        }])
+        self.assertEqual(data["deleted"], {"projects": [], "tasks": [], "sessions": []})
+
+    def test_returns_only_what_changed_after_the_cursor(self):
+        cursor = self.changes()["cursor"]
+        self.assertEqual(self.changes(cursor)["tasks"], [])
+
+        self.task.name = "Write the report"
+        self.task.save()
+        Session.objects.create(task=self.task, start_time=timezone.now())
+
+        data = self.changes(cursor)
+        self.assertEqual([(task["id"], task["name"]) for task in data["tasks"]], [(self.task.pk, "Write the report")])
+        self.assertEqual(len(data["sessions"]), 1)
+        self.assertIsNone(data["sessions"][0]["end_time"])
+        # a session's save touches last_edited of its task and project, which aren't synced
+        self.assertEqual(data["projects"], [])
+        self.assertEqual(self.changes(data["cursor"])["sessions"], [])
+
+    def test_bulk_updates_are_returned(self):
+        cursor = self.changes()["cursor"]
+        mark_tasks_done(self.user, Task.objects.filter(pk=self.task.pk))
+
+        data = self.changes(cursor)
+        self.assertEqual([(task["id"], task["is_done"]) for task in data["tasks"]], [(self.task.pk, True)])
+
+    def test_deletes_are_returned_as_tombstones(self):
+        other_task = Task.objects.create(project=self.project, name="Other")
+        cursor = self.changes()["cursor"]
+        session_id = self.session.pk
+        self.session.delete()
+        mark_task_deleted(other_task)
+
+        data = self.changes(cursor)
+        self.assertEqual(data["deleted"], {"projects": [], "tasks": [other_task.pk], "sessions": [session_id]})
+        self.assertEqual(data["tasks"], [])
+
+    def test_deleted_project_is_returned_as_tombstone_and_purge_adds_nothing(self):
+        cursor = self.changes()["cursor"]
+        mark_project_deleted(self.project)
+        data = self.changes(cursor)
+        self.assertEqual(data["deleted"], {"projects": [self.project.pk], "tasks": [self.task.pk], "sessions": []})
+
+        purge_project(self.project.pk)
+        self.assertEqual(self.changes(data["cursor"])["cursor"], data["cursor"])
+
+    def test_objects_keep_only_their_latest_entry(self):
+        for minutes in range(5):
+            self.session.end_time = self.start + timedelta(minutes=minutes + 1)
+            self.session.save()
+        self.assertEqual(Change.objects.filter(kind=Change.SESSION, object_id=self.session.pk).count(), 1)
+
+    def test_pages_through_changes(self):
+        for number in range(4):
+            Task.objects.create(project=self.project, name=f"Task {number}")
+
+        task_ids, cursor, has_more = [], 0, True
+        while has_more:
+            page = changes(self.user, cursor, limit=2)
+            self.assertLessEqual(len(page.projects) + len(page.tasks) + len(page.sessions), 2)
+            task_ids += [task.pk for task in page.tasks]
+            cursor, has_more = page.cursor, page.has_more
+        self.assertEqual(sorted(task_ids), list(Task.objects.order_by("pk").values_list("pk", flat=True)))
+
+    def test_query_count_does_not_grow_with_changes(self):
+        for number in range(10):
+            task = Task.objects.create(project=self.project, name=f"Task {number}")
+            Session.objects.create(task=task, start_time=self.start, end_time=self.start + timedelta(minutes=5))
+        self.changes()
+
+        # the change log, projects, tasks and sessions
+        with self.assertNumQueries(4):
+            self.changes()
+
+    def test_rejects_invalid_cursor(self):
+        for since in ("abc", "-1"):
+            response = self.client.get(reverse("tracker:api-changes"), {"since": since})
+            self.assertEqual(response.status_code, 400)
+
+class UploadSessionsApiTest(ApiTestMixin, TestCase):
+    def session_item(self, hours_ago, minutes=45, task=None):
+        start = self.start - timedelta(hours=hours_ago)
+        return {
+            "task": (task or self.task).pk,
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(minutes=minutes)).isoformat(),
+        }
+
+    def test_requires_login(self):
+        self.client.logout()
+        self.assertEqual(self.upload([self.session_item(1)]).status_code, 401)
+
+    def test_stores_sessions(self):
+        cursor = self.changes()["cursor"]
+        items = [self.session_item(hours_ago) for hours_ago in (3, 2, 1)]
+
+        # the session lookup, the insert and the last_edited updates
+        with self.assertNumQueries(7):
+            response = self.upload(items)
+        self.assertEqual(response.status_code, 200)
+        sessions = response.json()["sessions"]
+        self.assertEqual(len(sessions), 3)
+        self.assertEqual(self.task.sessions.count(), 4)
+        self.assertEqual(Session.objects.get(pk=sessions[0]["id"]).duration_in_seconds(), 45 * 60)
+        self.assertEqual(sorted(session["id"] for session in self.changes(cursor)["sessions"]), sorted(session["id"] for session in sessions))
+
+    def test_retried_upload_stores_nothing_twice(self):
+        items = [self.session_item(1), self.session_item(1)]
+        first = self.upload(items).json()["sessions"]
+        second = self.upload(items).json()["sessions"]
+        self.assertEqual(first, second)
+        self.assertEqual(first[0]["id"], first[1]["id"])
+        self.assertEqual(self.task.sessions.count(), 2)
+
+    def test_invalid_sessions_store_nothing(self):
+        other = User.objects.create_user(email="other@example.com", password="StrongPassword123")
+        other_task = Task.objects.create(project=Project.objects.create(user=other, name="Not mine"), name="Theirs")
+
+        response = self.upload([self.session_item(1), self.session_item(2, minutes=-5), self.session_item(3, task=other_task), "x"])
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["errors"]
+        self.assertEqual(sorted(errors), ["1", "2", "3"])
+        self.assertIn("end_time", errors["1"])
+        self.assertIn("task", errors["2"])
+        self.assertEqual(Session.objects.count(), 1)
+
+    def test_rejects_malformed_uploads(self):
+        url = reverse("tracker:api-sessions")
+        self.assertEqual(self.client.post(url, "{", content_type="application/json").status_code, 400)
+        self.assertEqual(self.client.post(url, "[]", content_type="application/json").status_code, 400)
+        with mock.patch("tracker.views.api.UPLOAD_LIMIT", 1):
+            self.assertEqual(self.upload([self.session_item(1), self.session_item(2)]).status_code, 400)
+        self.assertEqual(self.client.get(url).status_code, 405)
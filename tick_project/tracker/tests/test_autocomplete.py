@@ -0,0 +1,134 @@
+import time
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import autocomplete
+from ..autocomplete import HALF_LIFE, TaskEntry, TaskIndex, suggest, words
+from ..cache import bump_data_version
+from ..models import Project, Session, Task
+from .test_views import AuthenticatedViewMixin
+
+User = get_user_model()
+
+class TaskIndexTest(SimpleTestCase):
+    def setUp(self):
+        now = time.time()
+        self.index = TaskIndex(version=1)
+        self.index.add(TaskEntry(1, "Design review", "Website", 0, now))
+        self.index.add(TaskEntry(2, "Write copy", "Website", 10, now))
+        self.index.add(TaskEntry(3, "Résumé update", "Personal", 1, now - 4 * HALF_LIFE))
+        self.index.add(TaskEntry(4, "Review budget", "Personal", 3, now))
+
+    def pks(self, query):
+        return [entry.pk for entry in self.index.lookup(query)]
+
+    def test_words(self):
+        self.assertEqual(words("Résumé, UPDATE-2"), ["resume", "update", "2"])
+
+    def test_every_word_is_a_prefix(self):
+        self.assertEqual(self.pks("des"), [1])
+        self.assertEqual(self.pks("rev web"), [1])
+        self.assertEqual(self.pks("RESU"), [3])
+        self.assertEqual(self.pks("esign"), [])
+        self.assertEqual(self.pks("design copy"), [])
+
+    def test_project_words_match(self):
+        self.assertEqual(self.pks("webs"), [2, 1])
+
+    def test_ranked_by_frequency_and_recency(self):
+        self.assertEqual(self.pks("rev"), [4, 1])
+        # many sessions rank first, a task unused for two months falls below an unused new one
+        self.assertEqual(self.pks(""), [2, 4, 1, 3])
+
+    def test_remove(self):
+        self.index.remove(1)
+        self.assertEqual(self.pks("rev"), [4])
+        self.assertNotIn(1, {pk for _, pk in self.index.keys})
+
+class AutocompleteTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        autocomplete.clear()
+        self.user = User.objects.create_user(email="test@example.com", password="StrongPassword123")
+        self.project = Project.objects.create(user=self.user, name="Website")
+        self.task = Task.objects.create(project=self.project, name="Design review")
+        Task.objects.create(project=self.project, name="Done task", is_done=True)
+        archived = Project.objects.create(user=self.user, name="Archive", active=False)
+        Task.objects.create(project=archived, name="Old design")
+
+    def names(self, query=""):
+        return [entry.name for entry in suggest(self.user, query)]
+
+    def test_built_once_with_pending_tasks_of_active_projects(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.names(), ["Design review"])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names("des"), ["Design review"])
+
+    def test_saves_update_the_index_in_place(self):
+        self.names()
+        with self.assertNumQueries(0):
+            self.names()
+
+        task = Task.objects.create(project=self.project, name="Design system")
+        self.task.name = "Logo review"
+        self.task.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names("des"), ["Design system"])
+            self.assertEqual(self.names("logo"), ["Logo review"])
+
+        Session.objects.create(task=task, start_time=timezone.now() - timedelta(minutes=5), end_time=timezone.now())
+        task.is_done = True
+        task.save()
+        self.task.delete()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names(), [])
+
+    def test_sessions_raise_the_rank(self):
+        other = Task.objects.create(project=self.project, name="Deploy")
+        self.names()
+        Session.objects.create(task=other, start_time=timezone.now())
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names("de"), ["Deploy", "Design review"])
+
+    def test_rebuilt_after_changes_it_did_not_see(self):
+        self.names()
+        Task.objects.filter(pk=self.task.pk).update(name="Renamed")
+        bump_data_version(self.user.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.names(), ["Renamed"])
+
+        self.project.active = False
+        self.project.save()
+        self.assertEqual(self.names(), [])
+
+class TaskAutocompleteViewTest(AuthenticatedViewMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        autocomplete.clear()
+        self.url = reverse("tracker:task-autocomplete")
+        self.task = Task.objects.create(project=self.project, name="Pending task")
+
+    def test_returns_200_and_uses_template(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_returns_tasks_with_start_urls(self):
+        response = self.client.get(self.url, {"q": "pend"})
+        self.assertEqual(response.json(), [{
+            "pk": self.task.pk,
+            "name": "Pending task",
+            "project": "General",
+            "start_url": reverse("tracker:session-start", args=[self.task.pk]),
+        }])
+        self.assertEqual(self.client.get(self.url, {"q": "nothing"}).json(), [])
+
+    def test_dashboard_shows_quick_start_without_running_timer(self):
+        dashboard = reverse("tracker:dashboard")
+        self.assertContains(self.client.get(dashboard), self.url)
+        Session.objects.create(task=self.task, start_time=timezone.now())
+        self.assertNotContains(self.client.get(dashboard), self.url)
@@ -0,0 +1,145 @@
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.runner import run_pending
+from ..cache import get_data_version
+from ..models import Project, Session, Task
+from ..services.bulk import mark_tasks_done, move_tasks
+from ..services.deletion import mark_tasks_deleted
+from .test_views import AuthenticatedViewMixin
+
+User = get_user_model()
+
+class BulkServicesTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="test@example.com", password="StrongPassword123")
+        self.project = Project.objects.create(user=self.user, name="General")
+        self.pending = Task.objects.create(project=self.project, name="Pending")
+        self.done = Task.objects.create(project=self.project, name="Done", is_done=True)
+        self.yesterday = timezone.now() - timedelta(days=1)
+        Task.objects.filter(pk__in=[self.pending.pk, self.done.pk]).update(last_edited=self.yesterday)
+        Task.objects.filter(pk=self.done.pk).update(done_at=self.yesterday)
+        self.tasks = Task.objects.filter(project__user=self.user)
+
+    def test_mark_done_in_one_update(self):
+        version = get_data_version(self.user.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(mark_tasks_done(self.user, self.tasks), 1)
+
+        self.pending.refresh_from_db()
+        self.done.refresh_from_db()
+        self.assertTrue(self.pending.is_done)
+        self.assertGreater(self.pending.done_at, self.yesterday)
+        self.assertGreater(self.pending.last_edited, self.yesterday)
+        # already done: left as it was
+        self.assertEqual(self.done.done_at, self.yesterday)
+        self.assertEqual(self.done.last_edited, self.yesterday)
+        self.assertNotEqual(get_data_version(self.user.pk), version)
+
+    def test_mark_pending_clears_done_at(self):
+        self.assertEqual(mark_tasks_done(self.user, self.tasks, done=False), 1)
+
+        self.done.refresh_from_db()
+        self.pending.refresh_from_db()
+        self.assertFalse(self.done.is_done)
+        self.assertIsNone(self.done.done_at)
+        self.assertGreater(self.done.last_edited, self.yesterday)
+        self.assertEqual(self.pending.last_edited, self.yesterday)
+
+    def test_move(self):
+        other = Project.objects.create(user=self.user, name="Other")
+        moved = Task.objects.create(project=other, name="Already there")
+        Task.objects.filter(pk=moved.pk).update(last_edited=self.yesterday)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(move_tasks(self.user, self.tasks, other), 2)
+        self.assertEqual(set(other.tasks.all()), {self.pending, self.done, moved})
+        moved.refresh_from_db()
+        self.assertEqual(moved.last_edited, self.yesterday)
+
+    def test_delete_hides_tasks_and_purges_them_in_the_background(self):
+        Session.objects.create(task=self.pending, start_time=timezone.now())
+        job = mark_tasks_deleted(self.user, self.tasks.filter(pk=self.pending.pk))
+
+        self.assertEqual(list(Task.objects.filter(project=self.project)), [self.done])
+        self.assertEqual(job.kwargs, {"task_ids": [self.pending.pk]})
+        run_pending()
+        self.assertFalse(Task.all_objects.filter(pk=self.pending.pk).exists())
+        self.assertFalse(Session.all_objects.filter(task_id=self.pending.pk).exists())
+        self.assertTrue(Task.objects.filter(pk=self.done.pk).exists())
+
+class TaskBulkViewTest(AuthenticatedViewMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("tracker:task-bulk")
+        self.next = reverse("tracker:project-detail", kwargs={"pk": self.project.pk})
+        self.tasks = [Task.objects.create(project=self.project, name=f"Task {i}") for i in range(3)]
+
+    def post(self, action, tasks, **data):
+        return self.client.post(self.url, {"action": action, "tasks": [task.pk for task in tasks], "next": self.next, **data})
+
+    def test_requires_login(self):
+        self.client.logout()
+        response = self.client.post(self.url)
+        self.assertRedirects(response, f"/users/login/?next={self.url}")
+
+    def test_returns_200_and_uses_template(self):
+        # POST only
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+    def test_lists_render_the_bulk_form(self):
+        for url in (reverse("tracker:tasks"), self.next):
+            response = self.client.get(url)
+            self.assertContains(response, 'form="bulk-tasks"', count=3)
+            self.assertContains(response, self.url)
+
+    def test_mark_done(self):
+        response = self.post("done", self.tasks[:2])
+
+        self.assertRedirects(response, self.next)
+        self.assertEqual(Task.objects.filter(is_done=True).count(), 2)
+        self.assertEqual([str(message) for message in get_messages(response.wsgi_request)], ["Marked 2 tasks as done."])
+
+    def test_queries_do_not_grow_with_tasks(self):
+        self.post("pending", self.tasks)
+        with CaptureQueriesContext(connection) as few:
+            self.post("done", self.tasks[:1])
+        many = [Task.objects.create(project=self.project, name=f"More {i}") for i in range(20)]
+        with CaptureQueriesContext(connection) as more:
+            self.post("done", many)
+        self.assertEqual(len(few), len(more))
+
+    def test_move(self):
+        other = Project.objects.create(user=self.user, name="Other")
+        self.post("move", self.tasks, project=other.pk)
+        self.assertEqual(other.tasks.count(), 3)
+
+        response = self.post("move", self.tasks)
+        self.assertRedirects(response, self.next)
+        self.assertIn("Choose the project to move the tasks to.", [str(message) for message in get_messages(response.wsgi_request)])
+
+    def test_delete(self):
+        response = self.post("delete", self.tasks[:1])
+        job_url = response["Location"]
+        self.assertTrue(job_url.startswith("/jobs/"))
+        self.assertFalse(Task.objects.filter(pk=self.tasks[0].pk).exists())
+
+    def test_other_users_tasks_are_refused(self):
+        other_user = User.objects.create_user(email="other@example.com", password="StrongPassword123")
+        other_task = Task.objects.create(project=Project.objects.create(user=other_user, name="Theirs"), name="Theirs")
+
+        response = self.post("done", [self.tasks[0], other_task])
+        self.assertRedirects(response, self.next)
+        self.assertFalse(Task.objects.filter(is_done=True).exists())
+
+    def test_next_must_be_local(self):
+        response = self.client.post(self.url, {"action": "done", "tasks": [self.tasks[0].pk], "next": "https://example.com/"})
+        self.assertRedirects(response, reverse("tracker:tasks"))
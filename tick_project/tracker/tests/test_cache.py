@@ -0,0 +1,141 @@
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tick_project.cache import SQLiteCache
+from tick_project.routers import ReplicaRouter
+from ..cache import get_data_version, cached_for_user
+from ..models import Project, Task, Session
+
+User = get_user_model()
+
+class SQLiteCacheTest(SimpleTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.location = str(Path(self.tmp_dir.name) / "cache.sqlite3")
+        self.cache = SQLiteCache(self.location, {"OPTIONS": {"MAX_BYTES": 7_000}})
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_set_and_get(self):
+        self.cache.set("key", {"hours": 1})
+        self.assertEqual(self.cache.get("key"), {"hours": 1})
+        self.assertIsNone(self.cache.get("missing"))
+
+    def test_versions_are_separate_entries(self):
+        self.cache.set("key", "v1", version=1)
+        self.cache.set("key", "v2", version=2)
+        self.assertEqual(self.cache.get("key", version=1), "v1")
+        self.assertEqual(self.cache.get("key", version=2), "v2")
+
+    def test_expired_entries_are_missing(self):
+        self.cache.set("key", "value", timeout=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(self.cache.get("key"))
+        self.assertTrue(self.cache.add("key", "new value"))
+        self.assertFalse(self.cache.add("key", "ignored"))
+        self.assertEqual(self.cache.get("key"), "new value")
+
+    def test_incr(self):
+        self.cache.set("counter", 1)
+        self.assertEqual(self.cache.incr("counter", 2), 3)
+        with self.assertRaises(ValueError):
+            self.cache.incr("missing")
+
+    def test_take_counts_returns_counts_since_last_call(self):
+        self.cache.set("key", "value")
+        self.cache.get_many(["key", "missing"])
+        self.assertEqual(self.cache.take_counts(), (1, 1))
+        self.cache.get("key")
+        self.assertEqual(self.cache.take_counts(), (1, 0))
+
+    def test_least_recently_used_entries_are_evicted_over_max_bytes(self):
+        self.cache.set("first", "x" * 2000)
+        self.cache.set("second", "x" * 2000)
+        # refresh "first" so that "second" becomes the least recently used entry
+        self.cache.lru_resolution = 0
+        self.cache.get("first")
+        self.cache.set("third", "x" * 2000)
+        self.cache.set("fourth", "x" * 2000)
+
+        self.assertIsNone(self.cache.get("second"))
+        self.assertIsNotNone(self.cache.get("first"))
+        self.assertIsNotNone(self.cache.get("fourth"))
+        self.assertLessEqual(self.cache.total_size(), 7_000)
+
+    def test_entries_are_shared_between_processes(self):
+        # a fresh interpreter rather than a fork, which would inherit the test runner's state
+        script = "import sys; from tick_project.cache import SQLiteCache; SQLiteCache(sys.argv[1], {}).set('shared', 'from child')"
+        subprocess.run([sys.executable, "-c", script, self.location], cwd=settings.BASE_DIR, check=True)
+        self.assertEqual(self.cache.get("shared"), "from child")
+
+class TrackerCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.email = "test@example.com"
+        self.password = "StrongPassword123"
+        self.user = User.objects.create_user(email=self.email, password=self.password)
+        self.project = Project.objects.create(user=self.user, name="General")
+        self.task = Task.objects.create(project=self.project, name="Test task")
+
+    def test_saving_user_data_bumps_version(self):
+        version = get_data_version(self.user.pk)
+        Session.objects.create(task=self.task, start_time=timezone.now())
+        self.assertNotEqual(version, get_data_version(self.user.pk))
+
+    def test_cached_for_user_only_builds_once_per_version(self):
+        calls = []
+        build = lambda: calls.append(1) or len(calls)
+
+        self.assertEqual(cached_for_user(self.user, "test", build), 1)
+        self.assertEqual(cached_for_user(self.user, "test", build), 1)
+        self.task.save()
+        self.assertEqual(cached_for_user(self.user, "test", build), 2)
+
+    def test_weekly_summary_is_refreshed_after_new_session(self):
+        self.client.login(email=self.email, password=self.password)
+        url = reverse("tracker:weekly", kwargs={"weeks_ago": 0})
+
+        response = self.client.get(url)
+        self.assertEqual(response.context["weekly_time"], {"hours": 0, "minutes": 0})
+
+        end_time = timezone.now()
+        Session.objects.create(task=self.task, start_time=end_time - timedelta(minutes=30), end_time=end_time)
+
+        response = self.client.get(url)
+        self.assertEqual(response.context["weekly_time"], {"hours": 0, "minutes": 30})
+
+    @mock.patch("tick_project.middleware.replica_available", return_value=True)
+    @mock.patch("tick_project.routers.replica_available", return_value=True)
+    def test_cached_values_are_built_from_the_primary(self, *_):
+        # reads routed to the replica are recorded, then served by the primary (tests have no replica)
+        routes = []
+        route = ReplicaRouter.db_for_read
+        def db_for_read(router, model, **hints):
+            routes.append(route(router, model, **hints))
+            return None
+
+        self.client.login(email=self.email, password=self.password)
+        other_client = Client()
+        other_client.login(email=self.email, password=self.password)
+        url = reverse("tracker:dashboard-projects")
+
+        with mock.patch.object(ReplicaRouter, "db_for_read", db_for_read):
+            self.client.get(url)
+            # a write from another session doesn't keep this one on the primary
+            other_client.post(reverse("tracker:project-create"), {"name": "New project"})
+            response = self.client.get(url)
+        self.assertContains(response, "New project")
+        self.assertTrue(routes)
+        self.assertNotIn("replica", routes)
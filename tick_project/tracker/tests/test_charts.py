@@ -0,0 +1,42 @@
+from datetime import timedelta
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..charts import bar_chart, pie_chart
+from ..models import Task, Session
+from .test_views import AuthenticatedViewMixin
+
+class ChartsTest(SimpleTestCase):
+    def test_pie_chart_fills_percentage(self):
+        self.assertIn('stroke-dasharray="21.99 65.97"', pie_chart(25))
+        self.assertIs(pie_chart(25), pie_chart(25))
+
+    def test_bar_chart_scales_to_longest_day(self):
+        days = [
+            {"date_label": "Monday", "total_seconds_spent": 3600, "daily_time_spent_dict": {"hours": 1, "minutes": 0}},
+            {"date_label": "<Tuesday>", "total_seconds_spent": 0, "daily_time_spent_dict": {"hours": 0, "minutes": 0}},
+            {"date_label": "Wednesday", "total_seconds_spent": 1800, "daily_time_spent_dict": {"hours": 0, "minutes": 30}},
+        ]
+        svg = bar_chart(days, label_width=120, show_time=True)
+        self.assertIn('height="48"', svg)
+        self.assertIn('width="70.0%"', svg)
+        self.assertIn('width="35.0%"', svg)
+        self.assertEqual(svg.count("<rect"), 2)
+        self.assertIn("&lt;Tuesday&gt;", svg)
+        self.assertIn('<tspan class="muted">01:00</tspan>', svg)
+
+class SummaryChartViewTest(AuthenticatedViewMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("tracker:weekly", kwargs={"weeks_ago": 0})
+        self.template = "tracker/summary_weekly.html"
+        task = Task.objects.create(project=self.project, name="Task")
+        Session.objects.create(task=task, start_time=timezone.now() - timedelta(hours=2), end_time=timezone.now() - timedelta(hours=1))
+
+    def test_charts_are_rendered_on_the_server(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, '<svg class="bar-chart"')
+        self.assertContains(response, 'aria-label="100%"')
+        self.assertNotContains(response, "data-duration")
+        self.assertNotContains(response, "data-percentage")
@@ -0,0 +1,113 @@
+import gzip
+import zlib
+from unittest import mock, skipUnless
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+
+from tick_project import compression
+from tick_project.compression import accepted_encodings, negotiate
+from tick_project.middleware import CompressionMiddleware
+from ..models import Project, Task
+
+User = get_user_model()
+
+PAGE = b"<li>a task that is repeated</li>\n" * 100
+
+class NegotiationTest(SimpleTestCase):
+    def test_parses_qualities(self):
+        self.assertEqual(
+            accepted_encodings("gzip, deflate;q=0.5, br;q=0, *;q=0.1"),
+            {"gzip": 1.0, "deflate": 0.5, "br": 0.0, "*": 0.1},
+        )
+
+    def test_prefers_brotli_when_available(self):
+        with mock.patch.object(compression, "ENCODINGS", ("br", "gzip")):
+            self.assertEqual(negotiate("gzip, deflate, br"), "br")
+            self.assertEqual(negotiate("gzip, br;q=0"), "gzip")
+            self.assertEqual(negotiate("*"), "br")
+        with mock.patch.object(compression, "ENCODINGS", ("gzip",)):
+            self.assertEqual(negotiate("gzip, deflate, br"), "gzip")
+
+    def test_nothing_acceptable(self):
+        self.assertIsNone(negotiate(None))
+        self.assertIsNone(negotiate("identity"))
+        self.assertIsNone(negotiate("gzip;q=0, *;q=0"))
+
+@mock.patch.object(compression, "ENCODINGS", ("gzip",))
+class CompressionMiddlewareTest(SimpleTestCase):
+    def process(self, response, accept_encoding="gzip, deflate, br"):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_compresses_html(self):
+        response = HttpResponse(PAGE)
+        response["ETag"] = '"abc"'
+        response = self.process(response)
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(response["ETag"], 'W/"abc"')
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+        self.assertEqual(gzip.decompress(response.content), PAGE)
+
+    def test_skips_short_uncompressible_and_unaccepted_responses(self):
+        self.assertFalse(self.process(HttpResponse(b"<p>short</p>")).has_header("Content-Encoding"))
+        self.assertFalse(self.process(HttpResponse(PAGE, content_type="image/png")).has_header("Content-Encoding"))
+
+        response = self.process(HttpResponse(PAGE), accept_encoding="identity")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+    def test_streams_each_chunk_as_it_comes(self):
+        produced = []
+
+        def rows():
+            for number in range(3):
+                produced.append(number)
+                yield f"<li>row {number}</li>\n".encode() * 20
+
+        response = self.process(StreamingHttpResponse(rows(), content_type="text/csv"))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+
+        decompressor = zlib.decompressobj(wbits=31)
+        chunks = iter(response.streaming_content)
+        # the gzip header, then the first row is decodable before the second is produced
+        output = decompressor.decompress(next(chunks))
+        while not output:
+            output = decompressor.decompress(next(chunks))
+        self.assertEqual(produced, [0])
+        self.assertEqual(output, b"<li>row 0</li>\n" * 20)
+
+        rest = b"".join(decompressor.decompress(chunk) for chunk in chunks)
+        self.assertEqual(output + rest, b"".join(f"<li>row {number}</li>\n".encode() * 20 for number in range(3)))
+
+    @skipUnless(compression.brotli, "brotli is not installed")
+    def test_brotli(self):
+        brotli = compression.brotli
+        with mock.patch.object(compression, "ENCODINGS", ("br", "gzip")):
+            response = self.process(HttpResponse(PAGE))
+            streamed = self.process(StreamingHttpResponse(iter([PAGE, PAGE])))
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), PAGE)
+        self.assertEqual(brotli.decompress(b"".join(streamed.streaming_content)), PAGE * 2)
+
+class CompressedPageTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(email="test@example.com", password="StrongPassword123")
+        self.client.login(email="test@example.com", password="StrongPassword123")
+        self.project = Project.objects.create(user=user, name="General")
+        Task.objects.bulk_create(Task(project=self.project, name=f"Task {number}", is_done=True) for number in range(100))
+
+    def test_project_detail_is_compressed(self):
+        url = reverse("tracker:project-detail", kwargs={"pk": self.project.pk})
+        plain = self.client.get(url)
+        compressed = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(compressed["Content-Encoding"], "gzip")
+        self.assertLess(len(compressed.content), len(plain.content) / 4)
@@ -0,0 +1,111 @@
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.runner import run_pending
+from ..models import Project, Task, Session
+from ..services import deletion
+from ..services.deletion import mark_project_deleted, mark_task_deleted, mark_user_deleted, purge_project, purge_task, purge_user
+
+User = get_user_model()
+
+class DeletionTestMixin:
+    def setUp(self):
+        self.user = User.objects.create_user(email="test@example.com", password="StrongPassword123")
+        self.project = Project.objects.create(user=self.user, name="General")
+        self.task = Task.objects.create(project=self.project, name="Test task")
+        for _ in range(5):
+            Session.objects.create(task=self.task, start_time=timezone.now(), end_time=timezone.now())
+
+class MarkDeletedTest(DeletionTestMixin, TestCase):
+    def test_deleted_task_and_its_sessions_are_hidden(self):
+        job = mark_task_deleted(self.task)
+
+        self.assertFalse(Task.objects.filter(pk=self.task.pk).exists())
+        self.assertFalse(Session.objects.filter(task=self.task).exists())
+        # rows are still there until the purge job runs
+        self.assertEqual(Session.all_objects.filter(task=self.task).count(), 5)
+        self.assertEqual(job.name, "tracker.purge_task")
+
+        run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual((job.progress, job.total), (6, 6))
+        self.assertFalse(Session.all_objects.filter(task=self.task).exists())
+
+    def test_deleted_project_and_its_tasks_are_hidden(self):
+        job = mark_project_deleted(self.project)
+
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+        self.assertFalse(Task.objects.filter(project=self.project).exists())
+        self.assertFalse(Session.objects.filter(task__project=self.project).exists())
+        self.assertEqual(job.name, "tracker.purge_project")
+
+        run_pending()
+        self.assertFalse(Project.all_objects.filter(pk=self.project.pk).exists())
+
+    def test_deleted_user_is_deactivated(self):
+        job = mark_user_deleted(self.user)
+
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertIsNotNone(self.user.deleted_at)
+        self.assertFalse(Project.objects.filter(user=self.user).exists())
+        self.assertFalse(Task.all_objects.filter(project__user=self.user, deleted_at__isnull=True).exists())
+
+        run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.DONE)
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+
+class PurgeTest(DeletionTestMixin, TestCase):
+    def test_purge_task_deletes_task_and_sessions(self):
+        stats = purge_task(self.task.pk)
+        self.assertEqual(stats.rows, 6)
+        self.assertFalse(Task.all_objects.filter(pk=self.task.pk).exists())
+        self.assertFalse(Session.all_objects.exists())
+
+    @mock.patch.object(deletion, "BATCH_SIZE", 2)
+    def test_purge_project_deletes_in_batches(self):
+        other_project = Project.objects.create(user=self.user, name="Other")
+        other_task = Task.objects.create(project=other_project, name="Other task")
+        Session.objects.create(task=other_task, start_time=timezone.now())
+
+        stats = purge_project(self.project.pk)
+
+        self.assertEqual(stats.rows, 7)
+        self.assertGreater(stats.rows_per_second, 0)
+        self.assertFalse(Project.all_objects.filter(pk=self.project.pk).exists())
+        # other projects are untouched
+        self.assertEqual(Session.all_objects.filter(task=other_task).count(), 1)
+
+    def test_purge_user_deletes_everything(self):
+        purge_user(self.user.pk)
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(Project.all_objects.exists())
+        self.assertFalse(Task.all_objects.exists())
+        self.assertFalse(Session.all_objects.exists())
+
+class DeleteViewsTest(DeletionTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_project_delete_view_hides_project(self):
+        response = self.client.post(reverse("tracker:project-delete", kwargs={"pk": self.project.pk}))
+        job = Job.objects.get(name="tracker.purge_project")
+        job_url = reverse("jobs:detail", kwargs={"pk": job.pk})
+        self.assertRedirects(response, f"{job_url}?next={reverse('tracker:projects')}")
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+
+    def test_task_delete_view_hides_task(self):
+        response = self.client.post(reverse("tracker:task-delete", kwargs={"pk": self.task.pk}))
+        job = Job.objects.get(name="tracker.purge_task")
+        job_url = reverse("jobs:detail", kwargs={"pk": job.pk})
+        self.assertRedirects(response, f"{job_url}?next={reverse('tracker:tasks')}")
+        self.assertFalse(Task.objects.filter(pk=self.task.pk).exists())
+        response = self.client.get(reverse("tracker:task-detail", kwargs={"pk": self.task.pk}))
+        self.assertEqual(response.status_code, 404)
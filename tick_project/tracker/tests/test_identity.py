@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ..identity import identity_map
+from ..models import Project, Session, Task
+from .test_views import AuthenticatedViewMixin
+
+User = get_user_model()
+
+def project_queries(queries):
+    return [query for query in queries.captured_queries if query["sql"].startswith("SELECT") and 'FROM "tracker_project"' in query["sql"]]
+
+class IdentityMapTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="test@example.com", password="StrongPassword123")
+        self.project = Project.objects.create(user=self.user, name="General")
+        self.tasks = [Task.objects.create(project=self.project, name=f"Task {number}") for number in range(3)]
+        self.session = Session.objects.create(task=self.tasks[0], start_time=timezone.now())
+
+    def test_each_object_is_fetched_once(self):
+        with identity_map():
+            with self.assertNumQueries(2):
+                tasks = list(Task.objects.filter(project=self.project))
+                projects = {task.project for task in tasks}
+            self.assertEqual(len({id(project) for project in projects}), 1)
+
+            session = Session.objects.get(pk=self.session.pk)
+            with self.assertNumQueries(0):
+                self.assertIs(session.task, tasks[0])
+                self.assertIs(session.task.project, tasks[0].project)
+
+    def test_objects_loaded_first_are_reused(self):
+        with identity_map():
+            project = Project.objects.get(pk=self.project.pk)
+            tasks = list(Task.objects.filter(project=self.project))
+            with self.assertNumQueries(0):
+                self.assertTrue(all(task.project is project for task in tasks))
+
+    def test_nothing_is_kept_outside_requests(self):
+        with identity_map():
+            Project.objects.get(pk=self.project.pk)
+        # the task and its project, every time
+        with self.assertNumQueries(2):
+            Task.objects.get(pk=self.tasks[0].pk).project
+        with self.assertNumQueries(2):
+            Task.objects.get(pk=self.tasks[0].pk).project
+
+    def test_session_save_fetches_task_and_project_once(self):
+        with identity_map(), CaptureQueriesContext(connection) as queries:
+            session = Session.objects.get(pk=self.session.pk)
+            session.set_end_time()
+            session.save()
+            session.task.project
+        selects = [query["sql"].split(" FROM ")[1].split()[0] for query in queries.captured_queries if query["sql"].startswith("SELECT")]
+        self.assertEqual(selects, ['"tracker_session"', '"tracker_task"', '"tracker_project"'])
+
+class IdentityMapViewTest(AuthenticatedViewMixin, TestCase):
+    url = reverse("tracker:tasks")
+    template = "tracker/task_list.html"
+
+    def project_queries_for(self, url):
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        return len(project_queries(queries))
+
+    def test_task_pages_fetch_each_project_once(self):
+        other = Project.objects.create(user=self.user, name="Other")
+        for project in (self.project, other):
+            Task.objects.create(project=project, name="Pending")
+        Session.objects.create(task=Task.objects.create(project=self.project, name="Tracked"), start_time=timezone.now())
+        detail = reverse("tracker:project-detail", args=[self.project.pk])
+        few = {url: self.project_queries_for(url) for url in (self.url, detail)}
+
+        for number in range(10):
+            for project in (self.project, other):
+                Task.objects.create(project=project, name=f"Pending {number}")
+                Task.objects.create(project=project, name=f"Done {number}", is_done=True, done_at=timezone.now())
+        many = {url: self.project_queries_for(url) for url in (self.url, detail)}
+        self.assertEqual(few, many)
@@ -0,0 +1,67 @@
+import re
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+User = get_user_model()
+
+CSRF_INPUT = re.compile(r'name="csrfmiddlewaretoken" value="([A-Za-z0-9]+)"')
+
+@override_settings(PAGE_CACHE_TIMEOUT=60)
+class PageCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.index = reverse("tracker:index")
+        self.login = reverse("users:login")
+
+    def test_second_visit_is_served_from_the_cache(self):
+        first = self.client.get(self.index)
+        self.assertTemplateUsed(first, "index.html")
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.index, {"utm_source": "mail"})
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.templates, [])
+        # served before the session middleware
+        self.assertFalse(hasattr(second.wsgi_request, "session"))
+
+    def test_hosts_are_still_validated(self):
+        self.client.get(self.index)
+        response = self.client.get(self.index, headers={"host": "evil.example.com"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_forms_get_a_csrf_token_for_each_visitor(self):
+        User.objects.create_user(email="test@example.com", password="StrongPassword123")
+        Client().get(self.login)
+
+        tokens = set()
+        for _ in range(2):
+            client = Client(enforce_csrf_checks=True)
+            response = client.get(self.login)
+            self.assertEqual(response.templates, [])
+            token = CSRF_INPUT.search(response.content.decode()).group(1)
+            tokens.add(token)
+            self.assertIn("csrftoken", response.cookies)
+
+            response = client.post(self.login, {
+                "csrfmiddlewaretoken": token, "username": "test@example.com", "password": "StrongPassword123",
+            })
+            self.assertRedirects(response, reverse("tracker:dashboard"))
+        self.assertEqual(len(tokens), 2)
+
+    def test_logged_in_users_get_their_own_page(self):
+        self.client.get(self.index)
+        User.objects.create_user(email="test@example.com", password="StrongPassword123")
+        self.client.login(email="test@example.com", password="StrongPassword123")
+
+        response = self.client.get(self.index)
+        self.assertTemplateUsed(response, "index.html")
+        self.assertContains(response, reverse("users:account"))
+
+    def test_only_public_pages_are_cached(self):
+        self.client.post(self.login, {"username": "nobody@example.com", "password": "wrong"})
+        self.client.get(reverse("tracker:dashboard"))
+        self.assertIsNone(cache.get(f"page:{self.login}"))
+        self.assertIsNone(cache.get(f"page:{reverse('tracker:dashboard')}"))
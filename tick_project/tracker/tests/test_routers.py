@@ -0,0 +1,72 @@
+import time
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.test import TestCase, RequestFactory
+from django.urls import reverse
+
+from tick_project.routers import ReplicaRouter, use_replica, LAST_WRITE_SESSION_KEY
+from ..models import Project
+
+User = get_user_model()
+
+@mock.patch("tick_project.routers.replica_available", return_value=True)
+class ReplicaRouterTest(TestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.request = RequestFactory().get("/")
+        self.request.session = SessionStore()
+
+    def route_inside_view(self):
+        """Return the read and write aliases picked for tracker and users models inside a replica view."""
+        @use_replica
+        def view(request):
+            return {
+                "tracker_read": self.router.db_for_read(Project),
+                "users_read": self.router.db_for_read(User),
+                "tracker_write": self.router.db_for_write(Project),
+            }
+        return view(self.request)
+
+    def test_reads_use_primary_outside_replica_views(self, _):
+        self.assertIsNone(self.router.db_for_read(Project))
+
+    def test_tracker_reads_use_replica_inside_replica_views(self, _):
+        routes = self.route_inside_view()
+        self.assertEqual(routes["tracker_read"], "replica")
+        self.assertIsNone(routes["users_read"])
+        self.assertEqual(routes["tracker_write"], "default")
+
+    def test_recent_write_keeps_reads_on_primary(self, _):
+        self.request.session[LAST_WRITE_SESSION_KEY] = time.time()
+        routes = self.route_inside_view()
+        self.assertIsNone(routes["tracker_read"])
+
+    def test_expired_write_returns_reads_to_replica(self, _):
+        with self.settings(REPLICA_STICKY_SECONDS=5):
+            self.request.session[LAST_WRITE_SESSION_KEY] = time.time() - 10
+            routes = self.route_inside_view()
+        self.assertEqual(routes["tracker_read"], "replica")
+
+    def test_replica_is_never_migrated(self, _):
+        self.assertFalse(self.router.allow_migrate("replica", "tracker"))
+        self.assertIsNone(self.router.allow_migrate("default", "tracker"))
+
+class ReplicaStickinessMiddlewareTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="test@example.com", password="StrongPassword123")
+        self.client.force_login(self.user)
+
+    @mock.patch("tick_project.middleware.replica_available", return_value=True)
+    def test_successful_write_is_recorded_in_session(self, _):
+        self.client.post(reverse("tracker:project-create"), {"name": "New project"})
+        self.assertIn(LAST_WRITE_SESSION_KEY, self.client.session)
+
+    @mock.patch("tick_project.middleware.replica_available", return_value=True)
+    def test_reads_are_not_recorded(self, _):
+        self.client.get(reverse("tracker:projects"))
+        self.assertNotIn(LAST_WRITE_SESSION_KEY, self.client.session)
+
+    def test_nothing_is_recorded_without_replica(self):
+        self.client.post(reverse("tracker:project-create"), {"name": "New project"})
+        self.assertNotIn(LAST_WRITE_SESSION_KEY, self.client.session)
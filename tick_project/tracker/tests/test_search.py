@@ -0,0 +1,104 @@
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Project, Session, Task
+from ..services.search import icontains_search, match_query, search
+from .test_views import AuthenticatedViewMixin
+
+User = get_user_model()
+
+def index_size():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT count(*) FROM tracker_search")
+        return cursor.fetchone()[0]
+
+class MatchQueryTest(SimpleTestCase):
+    def test_every_word_is_a_quoted_prefix(self):
+        self.assertEqual(match_query("design Rev"), '"design"* "Rev"*')
+
+    def test_operators_are_searched_as_words(self):
+        self.assertEqual(match_query('a OR "b" NEAR(c)'), '"a"* "OR"* "b"* "NEAR"* "c"*')
+
+    def test_no_words(self):
+        self.assertIsNone(match_query(" -*() "))
+
+class SearchTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="test@example.com", password="StrongPassword123")
+        self.project = Project.objects.create(user=self.user, name="Website redesign")
+        self.task = Task.objects.create(project=self.project, name="Design review")
+        Task.objects.create(project=self.project, name="Write copy")
+
+        other_user = User.objects.create_user(email="other@example.com", password="StrongPassword123")
+        other_project = Project.objects.create(user=other_user, name="Design")
+        Task.objects.create(project=other_project, name="Design review")
+
+    def items(self, text):
+        return [(result.kind, result.item.pk) for result in search(self.user, text)]
+
+    def test_matches_word_prefixes_of_the_users_items(self):
+        self.assertEqual(self.items("des rev"), [("task", self.task.pk)])
+        self.assertEqual(self.items("redes"), [("project", self.project.pk)])
+        self.assertEqual(self.items("DÉSIGN review"), [("task", self.task.pk)])
+        self.assertEqual(self.items("esign"), [])
+
+    def test_ranks_closer_matches_first(self):
+        long_name = Task.objects.create(project=self.project, name="Design the review process for the team")
+        design = Task.objects.create(project=self.project, name="Design")
+        self.assertEqual(self.items("design")[:2], [("task", design.pk), ("task", self.task.pk)])
+        self.assertIn(("task", long_name.pk), self.items("design"))
+
+    def test_results_carry_time_spent(self):
+        Session.objects.create(task=self.task, start_time=timezone.now() - timedelta(minutes=30), end_time=timezone.now())
+        result, = search(self.user, "review")
+        self.assertEqual(result.item.total_time_spent_dict(), {"hours": 0, "minutes": 30})
+
+    def test_index_follows_changes(self):
+        self.task.name = "Logo sketches"
+        self.task.save()
+        self.assertEqual(self.items("review"), [])
+        self.assertEqual(self.items("logo"), [("task", self.task.pk)])
+
+        Session.objects.create(task=self.task, start_time=timezone.now())
+        self.assertEqual(self.items("logo"), [("task", self.task.pk)])
+
+        size = index_size()
+        self.task.deleted_at = timezone.now()
+        self.task.save()
+        self.assertEqual(self.items("logo"), [])
+        self.assertEqual(index_size(), size - 1)
+
+        Task.all_objects.filter(pk=self.task.pk).delete()
+        self.assertEqual(index_size(), size - 1)
+
+    def test_deleted_project_hides_its_tasks(self):
+        self.project.deleted_at = timezone.now()
+        self.project.save()
+        self.assertEqual(self.items("design"), [])
+
+    def test_icontains_fallback(self):
+        results = icontains_search(self.user, "design")
+        self.assertEqual([(result.kind, result.item.pk) for result in results], [("project", self.project.pk), ("task", self.task.pk)])
+
+class SearchViewTest(AuthenticatedViewMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("tracker:search")
+        self.template = "tracker/search.html"
+        self.pending = Task.objects.create(project=self.project, name="Pending report")
+        self.done = Task.objects.create(project=self.project, name="Done report", is_done=True)
+
+    def test_lists_results(self):
+        response = self.client.get(self.url, {"q": "report"})
+
+        self.assertEqual({result.item for result in response.context["results"]}, {self.pending, self.done})
+        self.assertContains(response, "Pending report")
+        self.assertContains(response, "Done report")
+
+    def test_no_results(self):
+        response = self.client.get(self.url, {"q": "nothing"})
+        self.assertContains(response, "No tasks or projects match")
@@ -0,0 +1,45 @@
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from ..services.summaries import ProjectSummary, summarize_sessions, build_annotated_project_summary, build_daily_summary
+
+class SummarizeSessionsTest(SimpleTestCase):
+    def test_sums_by_project_and_date(self):
+        start = datetime(2025, 3, 3, 9, tzinfo=dt_timezone.utc)
+        rows = [
+            (start, start + timedelta(minutes=30), 1, "Work"),
+            (start + timedelta(days=1), start + timedelta(days=1, minutes=15), 2, "Home"),
+            (start + timedelta(hours=2), start + timedelta(hours=3), 1, "Work"),
+            (None, None, 2, "Home"),
+        ]
+        totals = summarize_sessions(iter(rows))
+
+        self.assertEqual(totals.total_seconds, 105 * 60)
+        self.assertEqual(totals.by_project, {1: ["Work", 90 * 60], 2: ["Home", 15 * 60]})
+        self.assertEqual(totals.by_date, {date(2025, 3, 3): 90 * 60, date(2025, 3, 4): 15 * 60})
+
+    def test_running_session_counts_until_now(self):
+        totals = summarize_sessions([(timezone.now() - timedelta(minutes=10), None, 1, "Work")])
+        self.assertAlmostEqual(totals.total_seconds, 600, delta=5)
+
+    def test_dates_are_local_to_active_timezone(self):
+        # 23:30 UTC is already the next day in Tokyo
+        start = datetime(2025, 3, 3, 23, 30, tzinfo=dt_timezone.utc)
+        with timezone.override(ZoneInfo("Asia/Tokyo")):
+            totals = summarize_sessions([(start, start + timedelta(minutes=10), 1, "Work")])
+        self.assertEqual(list(totals.by_date), [date(2025, 3, 4)])
+
+class BuildSummaryTest(SimpleTestCase):
+    def test_project_summary_records(self):
+        summary = build_annotated_project_summary({1: ["Work", 2700], 2: ["Home", 900]}, 3600)
+        self.assertEqual(summary, [
+            ProjectSummary(1, "Work", 2700, {"hours": 0, "minutes": 45}, 75),
+            ProjectSummary(2, "Home", 900, {"hours": 0, "minutes": 15}, 25),
+        ])
+
+    def test_daily_summary_fills_missing_days(self):
+        days = build_daily_summary({date(2025, 3, 4): 3600}, date(2025, 3, 3), date(2025, 3, 5), "%d")
+        self.assertEqual([day["date_label"] for day in days], ["03", "04", "05"])
+        self.assertEqual([day["total_seconds_spent"] for day in days], [0, 3600, 0])
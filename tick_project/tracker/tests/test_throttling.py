@@ -0,0 +1,124 @@
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tick_project import throttling
+from tick_project.throttling import DatabaseLoad, TokenBuckets
+from ..models import Project, Task, Session
+
+User = get_user_model()
+
+class TokenBucketsTest(SimpleTestCase):
+    def test_bucket_empties_and_refills(self):
+        buckets = TokenBuckets(":memory:")
+        for _ in range(3):
+            self.assertEqual(buckets.take("write:user:1", capacity=3, rate=0.5, now=100), 0)
+        self.assertEqual(buckets.take("write:user:1", capacity=3, rate=0.5, now=100), 2)
+        # one token is back after two seconds
+        self.assertEqual(buckets.take("write:user:1", capacity=3, rate=0.5, now=102), 0)
+        # buckets are independent
+        self.assertEqual(buckets.take("write:user:2", capacity=3, rate=0.5, now=102), 0)
+
+    def test_bucket_never_exceeds_capacity(self):
+        buckets = TokenBuckets(":memory:")
+        buckets.take("key", capacity=2, rate=1, now=0)
+        self.assertEqual(buckets.take("key", capacity=2, rate=1, now=1000), 0)
+        self.assertEqual(buckets.take("key", capacity=2, rate=1, now=1000), 0)
+        self.assertEqual(buckets.take("key", capacity=2, rate=1, now=1000), 1)
+
+@override_settings(OVERLOAD_DB_LATENCY_MS=100)
+class DatabaseLoadTest(SimpleTestCase):
+    def test_overloaded_above_threshold_until_below_half(self):
+        load = DatabaseLoad()
+        for _ in range(DatabaseLoad.MIN_SAMPLES):
+            load.record(0.5)
+        self.assertTrue(load.is_overloaded())
+        load.average = 0.06
+        load.record(0.06)
+        self.assertTrue(load.is_overloaded())
+        load.average = 0.04
+        load.record(0.04)
+        self.assertFalse(load.is_overloaded())
+
+    def test_one_slow_query_on_an_idle_process_is_not_overload(self):
+        load = DatabaseLoad()
+        for _ in range(DatabaseLoad.MIN_SAMPLES):
+            load.record(0.01)
+        # idle for longer than STALE_AFTER, then one slow query
+        load.sampled_at -= DatabaseLoad.STALE_AFTER + 1
+        load.record(2)
+        self.assertFalse(load.is_overloaded())
+
+        for _ in range(DatabaseLoad.MIN_SAMPLES):
+            load.record(2)
+        self.assertTrue(load.is_overloaded())
+
+class RateLimitMiddlewareTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        throttling.get_buckets().clear()
+        self.user = User.objects.create_user(email="test@example.com", password="StrongPassword123")
+        self.client.force_login(self.user)
+        self.project = Project.objects.create(user=self.user, name="Project")
+
+    @override_settings(RATE_LIMITS={"summary": (2, 0.01)})
+    def test_summaries_are_limited_per_user(self):
+        url = reverse("tracker:monthly", kwargs={"months_ago": 0})
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "100")
+
+        # other pages and other users are not affected
+        self.assertEqual(self.client.get(reverse("tracker:dashboard")).status_code, 200)
+        other = User.objects.create_user(email="other@example.com", password="StrongPassword123")
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    @override_settings(RATE_LIMITS={"write": (1, 0.01)})
+    def test_writes_are_limited(self):
+        task = Task.objects.create(project=self.project, name="Task")
+        url = reverse("tracker:session-start", kwargs={"pk": task.pk})
+        self.assertEqual(self.client.post(url).status_code, 302)
+        self.assertEqual(self.client.post(url).status_code, 429)
+        self.assertEqual(Session.objects.count(), 1)
+
+    @override_settings(RATE_LIMITS={"write": (1, 0.01)})
+    def test_logout_is_not_limited(self):
+        self.client.post(reverse("tracker:project-create"), {"name": "Other"})
+        response = self.client.post(reverse("users:logout"))
+        self.assertNotEqual(response.status_code, 429)
+
+    @override_settings(RATE_LIMITS={"write": (1, 0.01)}, RATE_LIMIT_CLIENT_IP_HEADER="HTTP_X_FORWARDED_FOR")
+    def test_anonymous_clients_behind_a_proxy_are_limited_separately(self):
+        self.client.logout()
+        url = reverse("users:login")
+        data = {"username": "test@example.com", "password": "wrong"}
+        self.assertEqual(self.client.post(url, data, headers={"x-forwarded-for": "198.51.100.1"}).status_code, 200)
+        self.assertEqual(self.client.post(url, data, headers={"x-forwarded-for": "198.51.100.1"}).status_code, 429)
+        # a spoofed first address doesn't give the client a new bucket
+        self.assertEqual(self.client.post(url, data, headers={"x-forwarded-for": "203.0.113.9, 198.51.100.1"}).status_code, 429)
+        self.assertEqual(self.client.post(url, data, headers={"x-forwarded-for": "198.51.100.2"}).status_code, 200)
+
+    @override_settings(OVERLOAD_DB_LATENCY_MS=100)
+    def test_overload_sheds_pages_and_serves_stale_summaries(self):
+        url = reverse("tracker:monthly", kwargs={"months_ago": 0})
+        self.client.get(url)
+        task = Task.objects.create(project=self.project, name="Task")
+        Session.objects.create(task=task, start_time=timezone.now() - timedelta(hours=1), end_time=timezone.now())
+
+        with mock.patch.object(throttling.database_load, "is_overloaded", return_value=True):
+            response = self.client.get(reverse("tracker:projects"))
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response["Retry-After"], "30")
+            # the summary from before the new session
+            response = self.client.get(url)
+            self.assertEqual(response.context["monthly_time"], {"hours": 0, "minutes": 0})
+
+        response = self.client.get(url)
+        self.assertEqual(response.context["monthly_time"], {"hours": 1, "minutes": 0})
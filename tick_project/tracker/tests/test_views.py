@@ -1,5 +1,6 @@
 from datetime import timedelta
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
@@ -10,6 +11,7 @@ User = get_user_model()
 
 class AuthenticatedViewMixin:
     def setUp(self):
+        cache.clear()
         self.email = "test@example.com"
         self.password = "StrongPassword123"
         self.user = User.objects.create_user(email=self.email, password=self.password)
@@ -47,6 +49,53 @@ class TestTaskListView(AuthenticatedViewMixin, TestCase):
         self.assertIn(pending_task, context["pending_tasks"])
         self.assertIn(done_task, context["done_today"])
 
+    def test_query_count_does_not_grow_with_tasks(self):
+        for i in range(10):
+            task = Task.objects.create(project=self.project, name=f"Task {i}", is_done=i % 2 == 0)
+            Session.objects.create(task=task, start_time=timezone.now() - timedelta(minutes=90), end_time=timezone.now())
+        self.client.get(self.url)
+
+        # active session, pending tasks, done tasks and the bulk form's projects
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+        self.assertContains(response, "01:30", count=10)
+
+class TestProjectListView(AuthenticatedViewMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("tracker:projects")
+        self.template = "tracker/project_list.html"
+
+    def test_query_count_does_not_grow_with_projects(self):
+        for i in range(10):
+            project = Project.objects.create(user=self.user, name=f"Project {i}", active=i % 2 == 0)
+            task = Task.objects.create(project=project, name="Task")
+            Session.objects.create(task=task, start_time=timezone.now() - timedelta(minutes=90), end_time=timezone.now())
+        self.client.get(self.url)
+
+        # active session, active projects and archived projects
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertContains(response, "01:30", count=10)
+
+class TestProjectDetailView(AuthenticatedViewMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("tracker:project-detail", kwargs={"pk": self.project.pk})
+        self.template = "tracker/project_detail.html"
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        for i in range(10):
+            task = Task.objects.create(project=self.project, name=f"Task {i}", is_done=i % 2 == 0)
+            Session.objects.create(task=task, start_time=timezone.now() - timedelta(minutes=30), end_time=timezone.now())
+        self.client.get(self.url)
+
+        # active session, project, pending tasks, done tasks and the bulk form's projects
+        with self.assertNumQueries(5):
+            response = self.client.get(self.url)
+        self.assertContains(response, "00:30", count=10)
+        self.assertContains(response, "05:00")
+
 class TestTaskDetailView(AuthenticatedViewMixin, TestCase):
     def setUp(self):
         super().setUp()
@@ -90,7 +139,119 @@ class DailyViewTest(AuthenticatedViewMixin, TestCase):
         response = self.client.get(self.url)
         context = response.context
 
-        self.assertIn(self.project, context["projects"])
+        self.assertEqual([project.pk for project in context["projects"]], [self.project.pk])
+        self.assertEqual(context["projects"][0].percentage, 100)
         self.assertIn(today_session_1, context["sessions"])
         self.assertEqual(len(context["sessions"]), 1)
         self.assertEqual(context["daily_time"], {"hours":0, "minutes":30})
+
+class MonthlyViewTest(AuthenticatedViewMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("tracker:monthly", kwargs={"months_ago": 0})
+        self.template = "tracker/summary_monthly.html"
+
+class DashboardViewTest(AuthenticatedViewMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("tracker:dashboard")
+        self.template = "tracker/dashboard.html"
+
+        self.task = Task.objects.create(project=self.project, name="Pending task")
+        Task.objects.create(project=self.project, name="Done task", is_done=True)
+        # a finished 30 min session and a running one started 15 min ago
+        Session.objects.create(
+            task=self.task,
+            start_time=timezone.now() - timedelta(minutes=60),
+            end_time=timezone.now() - timedelta(minutes=30)
+        )
+        Session.objects.create(task=self.task, start_time=timezone.now() - timedelta(minutes=15))
+
+    def test_dashboard_context(self):
+        response = self.client.get(self.url)
+        context = response.context
+
+        self.assertEqual(context["today_time"], {"hours": 0, "minutes": 45})
+        self.assertEqual(context["today_tasks"], 1)
+        self.assertEqual(context["pending_tasks"], 1)
+        self.assertContains(response, reverse("tracker:dashboard-tasks"))
+        self.assertContains(response, reverse("tracker:dashboard-projects"))
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        for i in range(10):
+            task = Task.objects.create(project=self.project, name=f"Task {i}")
+            Session.objects.create(task=task, start_time=timezone.now(), end_time=timezone.now())
+        Project.objects.create(user=self.user, name="Other")
+        self.client.get(self.url)
+
+        # active session, task counts and today's time
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+
+class DashboardTasksViewTest(AuthenticatedViewMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("tracker:dashboard-tasks")
+        self.template = "tracker/partials/_dashboard_tasks.html"
+
+        self.task = Task.objects.create(project=self.project, name="Pending task")
+        Task.objects.create(project=self.project, name="Done task", is_done=True)
+        Session.objects.create(
+            task=self.task,
+            start_time=timezone.now() - timedelta(minutes=60),
+            end_time=timezone.now() - timedelta(minutes=30)
+        )
+
+    def test_lists_pending_tasks(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(list(response.context["tasks"]), [self.task])
+        self.assertEqual(response.context["tasks"][0].total_time_spent_dict(), {"hours": 0, "minutes": 30})
+        self.assertContains(response, "Pending task")
+        self.assertNotContains(response, "Done task")
+
+    def test_fragment_is_cached_until_data_changes(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertContains(response, "Pending task")
+
+        Task.objects.create(project=self.project, name="New task")
+        self.assertContains(self.client.get(self.url), "New task")
+
+    def test_marks_task_with_running_session(self):
+        self.client.get(self.url)
+        Session.objects.create(task=self.task, start_time=timezone.now())
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.context["current_session"].task_id, self.task.pk)
+        self.assertContains(response, "active-icon")
+
+class DashboardProjectsViewTest(AuthenticatedViewMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("tracker:dashboard-projects")
+        self.template = "tracker/partials/_dashboard_projects.html"
+
+        task = Task.objects.create(project=self.project, name="Pending task")
+        Session.objects.create(
+            task=task,
+            start_time=timezone.now() - timedelta(minutes=60),
+            end_time=timezone.now() - timedelta(minutes=15)
+        )
+
+    def test_lists_active_projects(self):
+        Project.objects.create(user=self.user, name="Archived", active=False)
+        response = self.client.get(self.url)
+
+        self.assertEqual(list(response.context["projects"]), [self.project])
+        self.assertEqual(response.context["projects"][0].total_time_spent_dict(), {"hours": 0, "minutes": 45})
+        self.assertNotContains(response, "Archived")
+
+    def test_fragment_is_cached_until_data_changes(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        Project.objects.create(user=self.user, name="Other")
+        self.assertContains(self.client.get(self.url), "Other")
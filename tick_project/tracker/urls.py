@@ -6,9 +6,13 @@ app_name = "tracker"
 urlpatterns = [
     path("", views.index, name="index"),
     path("dashboard/", views.dashboard, name="dashboard"),
+    path("dashboard/tasks/", views.dashboard_tasks, name="dashboard-tasks"),
+    path("dashboard/projects/", views.dashboard_projects, name="dashboard-projects"),
     
     path("tasks/", views.task_list, name="tasks"),
     path("task/", views.task_create, name="task-create"),
+    path("tasks/bulk/", views.task_bulk, name="task-bulk"),
+    path("task/autocomplete/", views.task_autocomplete, name="task-autocomplete"),
     path("task/<int:pk>", views.task_detail, name="task-detail"),
     path("task/<int:pk>/edit/", views.task_update, name="task-update"),
     path("task/<int:pk>/delete/", views.task_delete, name="task-delete"),
@@ -26,7 +30,12 @@ urlpatterns = [
     path("project/<int:pk>/archive/", views.project_archive, name="project-archive"),
     path("project/<int:pk>/unarchive/", views.project_unarchive, name="project-unarchive"),
 
+    path("search/", views.search, name="search"),
+
     path("daily/<int:days_ago>/", views.daily, name="daily"),
     path("weekly/<int:weeks_ago>/", views.weekly, name="weekly"),
     path("monthly/<int:months_ago>/", views.monthly, name="monthly"),
+
+    path("api/v1/changes/", views.api_changes, name="api-changes"),
+    path("api/v1/sessions/", views.api_upload_sessions, name="api-sessions"),
 ]
@@ -2,3 +2,5 @@ from .summaries import *
 from .sessions import *
 from .projects import *
 from .tasks import *
+from .search import *
+from .api import *
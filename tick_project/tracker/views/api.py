@@ -0,0 +1,97 @@
+"""
+Versioned JSON API for the desktop and mobile apps.
+
+Apps log in like the website, with the session cookie, and send the CSRF
+token in the X-CSRFToken header with POST requests. A sync is:
+
+- `GET api/v1/changes/?since=<cursor>`: the projects, tasks and sessions
+  changed after `cursor` (everything without it) and the ids of the deleted
+  ones, with the cursor to pass next time. Call again while `has_more`.
+- `POST api/v1/sessions/` with `{"sessions": [{"task", "start_time",
+  "end_time"}, ...]}`: store the sessions recorded offline, all or none.
+
+See `services/sync.py`.
+"""
+import json
+from functools import wraps
+
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET, require_POST
+
+from tick_project.routers import use_replica
+
+from ..services.sync import UPLOAD_LIMIT, changes, upload_sessions
+
+def api_login_required(view):
+    """Like `login_required`, answering 401 instead of redirecting to the login page."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({"error": "Authentication required."}, status=401)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+def project_data(project):
+    return {
+        "id": project.pk,
+        "name": project.name,
+        "color": project.color,
+        "active": project.active,
+        "created_at": project.created_at,
+    }
+
+def task_data(task):
+    return {
+        "id": task.pk,
+        "project": task.project_id,
+        "name": task.name,
+        "is_done": task.is_done,
+        "done_at": task.done_at,
+        "created_at": task.created_at,
+    }
+
+def session_data(session):
+    return {
+        "id": session.pk,
+        "task": session.task_id,
+        "start_time": session.start_time,
+        "end_time": session.end_time,
+    }
+
+@api_login_required
+@require_GET
+@use_replica
+def api_changes(request):
+    try:
+        since = int(request.GET.get("since", 0))
+    except ValueError:
+        since = -1
+    if since < 0:
+        return JsonResponse({"error": "`since` must be a cursor returned by a previous call."}, status=400)
+
+    page = changes(request.user, since)
+    return JsonResponse({
+        "cursor": page.cursor,
+        "has_more": page.has_more,
+        "projects": [project_data(project) for project in page.projects],
+        "tasks": [task_data(task) for task in page.tasks],
+        "sessions": [session_data(session) for session in page.sessions],
+        "deleted": {f"{kind}s": ids for kind, ids in page.deleted.items()},
+    })
+
+@api_login_required
+@require_POST
+def api_upload_sessions(request):
+    try:
+        items = json.loads(request.body)["sessions"]
+    except (ValueError, KeyError, TypeError):
+        items = None
+    if not isinstance(items, list):
+        return JsonResponse({"error": "Expected a JSON object with a `sessions` list."}, status=400)
+    if len(items) > UPLOAD_LIMIT:
+        return JsonResponse({"error": f"Upload at most {UPLOAD_LIMIT} sessions at once."}, status=400)
+
+    sessions, errors = upload_sessions(request.user, items)
+    if errors:
+        return JsonResponse({"errors": errors}, status=400)
+    return JsonResponse({"sessions": [session_data(session) for session in sessions]})
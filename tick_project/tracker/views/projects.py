@@ -1,26 +1,36 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 
+from tick_project.routers import use_replica
+
 from ..models import Project
-from ..forms import TaskForm, ProjectForm
+from ..forms import BulkTaskForm, TaskForm, ProjectForm
 from ..helpers import current_session_context
+from ..managers import project_time_spent, task_time_spent
+from ..services.deletion import mark_project_deleted
 
 @login_required
+@use_replica
 def project_list(request):
     context = current_session_context(request)
 
-    context["active_projects"] = Project.objects.filter(user=request.user, active=True).order_by('-last_edited')
-    context["archived_projects"] = Project.objects.filter(user=request.user, active=False).order_by('-last_edited')
+    projects = Project.objects.filter(user=request.user).order_by('-last_edited').annotate(time_spent=project_time_spent())
+    context["active_projects"] = projects.filter(active=True)
+    context["archived_projects"] = projects.filter(active=False)
     return render(request, "tracker/project_list.html", context)
 
 @login_required
 def project_detail(request, pk):
     context = current_session_context(request)
-    project = get_object_or_404(Project, pk=pk, user=request.user)
+    project = get_object_or_404(Project.objects.annotate(time_spent=project_time_spent()), pk=pk, user=request.user)
     context["project"] = project
     
-    context["pending_tasks"] = project.tasks.filter(is_done=False).order_by('-last_edited')
-    context["done_tasks"] = project.tasks.filter(is_done=True).order_by('-last_edited')
+    tasks = project.tasks.annotate(time_spent=task_time_spent()).order_by('-last_edited')
+    context["pending_tasks"] = tasks.filter(is_done=False)
+    context["done_tasks"] = tasks.filter(is_done=True)
+    context["task_count"] = len(context["pending_tasks"]) + len(context["done_tasks"])
+    context["bulk_form"] = BulkTaskForm(user=request.user)
     
     return render(request, "tracker/project_detail.html", context)
 
@@ -94,8 +104,9 @@ def project_delete(request, pk):
     )
 
     if request.method == "POST":
-        project.delete()
-        return redirect("tracker:projects")
+        job = mark_project_deleted(project)
+        # follow the purge's progress, then land back on the project list
+        return redirect(f'{reverse("jobs:detail", kwargs={"pk": job.pk})}?next={reverse("tracker:projects")}')
     else:
         return render(request, template, context)
 
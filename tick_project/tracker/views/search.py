@@ -0,0 +1,22 @@
+from django.shortcuts import render
+from django.contrib.auth.decorators import login_required
+
+from tick_project.routers import use_replica
+
+from ..helpers import current_session_context
+from ..services.search import search as search_names
+
+@login_required
+@use_replica
+def search(request):
+    """
+    Search the user's tasks and projects by name.
+
+    Every word of `q` matches the start of a word in the name, so "des rev"
+    finds "Design review". Results are ranked by relevance.
+    """
+    context = current_session_context(request)
+    query = request.GET.get("q", "").strip()
+    context["query"] = query
+    context["results"] = search_names(request.user, query) if query else []
+    return render(request, "tracker/search.html", context)
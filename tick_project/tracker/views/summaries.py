@@ -1,18 +1,29 @@
 from datetime import timedelta, date
 from calendar import monthrange
+from django.db.models import Sum
+from django.http import HttpResponse
 from django.shortcuts import render
+from django.template.loader import render_to_string
 from django.utils import timezone
 from django.contrib.auth.decorators import login_required
 
+from tick_project.page_cache import public_page
+from tick_project.routers import use_replica
+
 from ..models import Task, Project, Session
 from ..helpers import timedelta_to_dict, current_session_context
-from ..services.summaries import group_sessions_by_project, group_sessions_by_date, build_annotated_project_summary, build_daily_summary
+from ..managers import project_time_spent, session_duration, task_time_spent
+from ..cache import CURRENT_SUMMARY_TIMEOUT, cached_for_user, summary_timeout
+from ..charts import bar_chart
+from ..services.summaries import SESSION_SUMMARY_FIELDS, summarize_sessions, build_annotated_project_summary, build_daily_summary
 
+@public_page
 def index(request):
     template = "index.html"
     return render(request, template)
 
 @login_required
+@use_replica
 def dashboard(request):
     """
         Display the user's dashboard with summary of activity.
@@ -20,8 +31,10 @@ def dashboard(request):
         Shows:
         - Total time tracked today
         - Number of tasks completed today
-        - List of recent pending tasks
-        - List of recent projects
+
+        The lists of recent pending tasks and projects are loaded by the page
+        from `dashboard_tasks` and `dashboard_projects`, so the headline numbers
+        and the active timer don't wait for them.
     """
     template = "tracker/dashboard.html"
     context = current_session_context(request)
@@ -29,22 +42,57 @@ def dashboard(request):
     # Get date reference
     today = timezone.now().date()
 
-    # Fetch user-specific data
-    projects = Project.objects.filter(user=request.user, active=True).order_by('-last_edited')
-    today_tasks = Task.objects.by_user_and_done_date_within(user=request.user, date=today)
-    pending_tasks = Task.objects.by_user_and_is_active(user=request.user)
-    today_sessions = Session.objects.by_user_and_start_date_within(user=request.user, date=today)
+    # Count done and pending tasks in one query
+    task_counts = Task.objects.count_by_user(user=request.user, date=today)
 
-    # Sum duration of today's sessions
-    today_time = sum(session.duration_in_seconds() for session in today_sessions)
-    
-    context["tasks"] = pending_tasks[:5]
-    context["projects"] = projects[:5]
-    context["today_time"] = timedelta_to_dict(timedelta(seconds=today_time))
-    context ["today_tasks"] = len(today_tasks)
+    # Sum duration of today's sessions, including the running one
+    today_time = Session.objects.by_user_and_start_date_within(
+        user=request.user,
+        date=today
+        ).aggregate(total=Sum(session_duration()))["total"] or timedelta()
+
+    context["today_time"] = timedelta_to_dict(today_time)
+    context["today_tasks"] = task_counts["done"]
+    context["pending_tasks"] = task_counts["pending"]
     return render(request, template, context)
 
 @login_required
+@use_replica
+def dashboard_tasks(request):
+    """
+    Render the dashboard's list of recent pending tasks, annotated with their
+    tracked time. The rendered fragment is cached until the user's data changes.
+    """
+    template = "tracker/partials/_dashboard_tasks.html"
+
+    def build():
+        context = current_session_context(request)
+        context["tasks"] = Task.objects.by_user_and_is_active(user=request.user).select_related("project").annotate(
+            time_spent=task_time_spent()
+        )[:5]
+        return render_to_string(template, context, request)
+
+    return HttpResponse(cached_for_user(request.user, "dashboard:tasks", build, CURRENT_SUMMARY_TIMEOUT))
+
+@login_required
+@use_replica
+def dashboard_projects(request):
+    """
+    Render the dashboard's list of recent projects, annotated with their
+    tracked time. The rendered fragment is cached until the user's data changes.
+    """
+    template = "tracker/partials/_dashboard_projects.html"
+
+    def build():
+        projects = Project.objects.filter(user=request.user, active=True).order_by('-last_edited').annotate(
+            time_spent=project_time_spent()
+        )
+        return render_to_string(template, {"projects": projects[:5]}, request)
+
+    return HttpResponse(cached_for_user(request.user, "dashboard:projects", build, CURRENT_SUMMARY_TIMEOUT))
+
+@login_required
+@use_replica
 def daily(request, days_ago):
     """
     Display a summary of the user's activity for a specific day.
@@ -65,19 +113,20 @@ def daily(request, days_ago):
     
     # Fetch all tasks completed on this date
     daily_tasks = Task.objects.by_user_and_done_date_within(user=request.user, date=date)
-    # Calculate total seconds spent focused on this date
-    daily_seconds = sum(session.duration_in_seconds() for session in all_daily_sessions)
 
-    # Group sessions by project
-    sessions_by_project = group_sessions_by_project(all_daily_sessions)
+    # Sum durations by project from the sessions already fetched for the workflow list
+    totals = summarize_sessions(
+        (session.start_time, session.end_time, session.task.project_id, session.task.project.name)
+        for session in all_daily_sessions
+    )
     # Build project summaries
-    daily_projects = build_annotated_project_summary(sessions_by_project, daily_seconds)
+    daily_projects = build_annotated_project_summary(totals.by_project, totals.total_seconds)
 
     context = current_session_context(request)
     context["projects"] = daily_projects
     context["sessions"] = all_daily_sessions
-    context["daily_tasks"] = len(daily_tasks)
-    context["daily_time"] = timedelta_to_dict(timedelta(seconds=daily_seconds))
+    context["daily_tasks"] = daily_tasks.count()
+    context["daily_time"] = timedelta_to_dict(timedelta(seconds=totals.total_seconds))
     context["date"] = date.strftime("%A, %B %d")
     context["previous"] = days_ago + 1
     context["next"] = days_ago - 1 if days_ago > 0 else None
@@ -85,6 +134,7 @@ def daily(request, days_ago):
     return render(request, template, context)
 
 @login_required
+@use_replica
 def weekly(request, weeks_ago):
     template = "tracker/summary_weekly.html"
 
@@ -93,42 +143,42 @@ def weekly(request, weeks_ago):
     date_start = today - timedelta(days=(weeks_ago * 7 + 6))
     date_end = today - timedelta(days=(weeks_ago * 7))
 
-    # Fetch all tasks marked as done by the user within the last 6 days (7 total days)
-    weekly_tasks = Task.objects.by_user_and_done_date_within(user=request.user, date=date_start, extra_days=6)
-    
-    # Fetch all sessions started within week
-    all_weekly_sessions = Session.objects.by_user_and_start_date_within(
-        user=request.user, 
-        date=date_start, 
-        extra_days=6
-        ).select_related("task", "task__project")
-    
-    # Calculate total seconds focused for the week
-    weekly_seconds = sum(session.duration_in_seconds() for session in all_weekly_sessions)
-    
-    # Organize sessions by date and by project
-    sessions_by_date = group_sessions_by_date(all_weekly_sessions)
-    sessions_by_project = group_sessions_by_project(all_weekly_sessions)
+    def build_summary():
+        # Fetch all tasks marked as done by the user within the last 6 days (7 total days)
+        weekly_tasks = Task.objects.by_user_and_done_date_within(user=request.user, date=date_start, extra_days=6)
 
-    # Build daily summaries
-    week_days = build_daily_summary(sessions_by_date, date_start, date_end, "%A")
+        # Stream the sessions started within the week, summing durations by date and by project
+        totals = summarize_sessions(Session.objects.by_user_and_start_date_within(
+            user=request.user, 
+            date=date_start, 
+            extra_days=6
+            ).values_list(*SESSION_SUMMARY_FIELDS).iterator())
+
+        # Build daily summaries
+        week_days = build_daily_summary(totals.by_date, date_start, date_end, "%A")
+
+        # Build project summaries
+        weekly_projects = build_annotated_project_summary(totals.by_project, totals.total_seconds)
+
+        return {
+            "weekly_time": timedelta_to_dict(timedelta(seconds=totals.total_seconds)),
+            "weekly_tasks": weekly_tasks.count(),
+            "week_chart": bar_chart(week_days, label_width=120, show_time=True),
+            "projects": weekly_projects,
+        }
 
-    # Build project summaries
-    weekly_projects = build_annotated_project_summary(sessions_by_project, weekly_seconds)
-    
     context = current_session_context(request)
+    context.update(cached_for_user(request.user, f"weekly:{date_start}", build_summary, summary_timeout(date_end)))
     context.update({
-        "weekly_time": timedelta_to_dict(timedelta(seconds=weekly_seconds)),
-        "weekly_tasks": len(weekly_tasks),
         "week_date": f"{date_start.strftime('%A %B %d')} - {date_end.strftime('%B %d')}", 
-        "week_days": week_days,
-        "projects": weekly_projects,
         "previous": weeks_ago + 1,
         "next": weeks_ago - 1 if weeks_ago > 0 else None
     })
 
     return render(request, template, context)
 
+@login_required
+@use_replica
 def monthly(request, months_ago):
     template = "tracker/summary_monthly.html"
 
@@ -146,36 +196,34 @@ def monthly(request, months_ago):
     date_start = date(year, month, 1)
     date_end = date(year, month, month_duration)
     
-    # Fetch all tasks marked as done by the user within the last 29 days (30 total days)
-    monthly_tasks = Task.objects.by_user_and_done_date_within(user=request.user, date=date_start, extra_days=month_duration-1)
-    
-    # Fetch all sessions started within month
-    all_monthly_sessions = Session.objects.by_user_and_start_date_within(
-        user=request.user, 
-        date=date_start, 
-        extra_days=month_duration - 1
-        ).select_related("task", "task__project")
-    
-    # Calculate total seconds focused for the month
-    monthly_seconds = sum(session.duration_in_seconds() for session in all_monthly_sessions)
-    
-    # Organize sessions by date and by project
-    sessions_by_date = group_sessions_by_date(all_monthly_sessions)
-    sessions_by_project = group_sessions_by_project(all_monthly_sessions)
-
-    # Build daily summaries
-    month_days = build_daily_summary(sessions_by_date, date_start, date_end, "%d")
-
-    # Build project summaries
-    monthly_projects = build_annotated_project_summary(sessions_by_project, monthly_seconds)
+    def build_summary():
+        # Fetch all tasks marked as done by the user within the last 29 days (30 total days)
+        monthly_tasks = Task.objects.by_user_and_done_date_within(user=request.user, date=date_start, extra_days=month_duration-1)
+
+        # Stream the sessions started within the month, summing durations by date and by project
+        totals = summarize_sessions(Session.objects.by_user_and_start_date_within(
+            user=request.user, 
+            date=date_start, 
+            extra_days=month_duration - 1
+            ).values_list(*SESSION_SUMMARY_FIELDS).iterator())
+
+        # Build daily summaries
+        month_days = build_daily_summary(totals.by_date, date_start, date_end, "%d")
+
+        # Build project summaries
+        monthly_projects = build_annotated_project_summary(totals.by_project, totals.total_seconds)
+
+        return {
+            "monthly_time": timedelta_to_dict(timedelta(seconds=totals.total_seconds)),
+            "monthly_tasks": monthly_tasks.count(),
+            "month_chart": bar_chart(month_days, label_width=24),
+            "projects": monthly_projects,
+        }
 
     context = current_session_context(request)
+    context.update(cached_for_user(request.user, f"monthly:{date_start}", build_summary, summary_timeout(date_end)))
     context.update({
-        "monthly_time": timedelta_to_dict(timedelta(seconds=monthly_seconds)),
-        "monthly_tasks": len(monthly_tasks),
         "month_date": f"{date_start.strftime('%B %Y')}",
-        "month_days": month_days,
-        "projects": monthly_projects,
         "previous": months_ago + 1,
         "next": months_ago - 1 if months_ago > 0 else None
     })
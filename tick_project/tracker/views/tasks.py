@@ -1,20 +1,54 @@
 from datetime import timedelta
+from django.http import JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.utils.http import url_has_allowed_host_and_scheme, urlencode
+from django.views.decorators.http import require_POST
 from django.utils import timezone
 
+from tick_project.routers import use_replica
+
+from .. import autocomplete
 from ..models import Task
-from ..forms import TaskForm
+from ..forms import BulkTaskForm, TaskForm
 from ..helpers import current_session_context
+from ..managers import task_time_spent
+from ..services.bulk import mark_tasks_done, move_tasks
+from ..services.deletion import mark_task_deleted, mark_tasks_deleted
 
 @login_required
+@use_replica
 def task_list(request):
     context = current_session_context(request)
-    context["pending_tasks"] = Task.objects.by_user_and_is_active(request.user,is_done=False)
+    context["pending_tasks"] = Task.objects.by_user_and_is_active(request.user,is_done=False).annotate(time_spent=task_time_spent())
     today = timezone.now().date()
-    context["done_today"] = Task.objects.by_user_and_done_date_within(user=request.user, date=today)
+    context["done_today"] = Task.objects.by_user_and_done_date_within(user=request.user, date=today).annotate(
+        time_spent=task_time_spent()
+    )
+    context["bulk_form"] = BulkTaskForm(user=request.user)
     return render(request, "tracker/task_list.html", context)
 
+@login_required
+@use_replica
+def task_autocomplete(request):
+    """
+    Return the user's pending tasks matching `q` as JSON, most tracked first,
+    with the url that starts a timer for each. Served from the in-memory
+    index in `autocomplete.py`.
+    """
+    entries = autocomplete.suggest(request.user, request.GET.get("q", ""))
+    return JsonResponse([
+        {
+            "pk": entry.pk,
+            "name": entry.name,
+            "project": entry.project_name,
+            "start_url": reverse("tracker:session-start", args=[entry.pk]),
+        }
+        for entry in entries
+    ], safe=False)
+
 @login_required
 def task_create(request):
     template = "tracker/form.html"
@@ -41,7 +75,7 @@ def task_create(request):
 
 @login_required    
 def task_detail(request, pk):
-    task = get_object_or_404(Task, pk=pk, project__user=request.user)
+    task = get_object_or_404(Task.objects.annotate(time_spent=task_time_spent()), pk=pk, project__user=request.user)
     context = current_session_context(request)
     
     sessions = task.sessions.all().order_by("-start_time")
@@ -93,9 +127,44 @@ def task_delete(request, pk):
         }
     )
     if request.method == "POST":
-        task.delete()
-        return redirect("tracker:tasks")
+        job = mark_task_deleted(task)
+        # follow the purge's progress, then land back on the task list
+        return redirect(f'{reverse("jobs:detail", kwargs={"pk": job.pk})}?next={reverse("tracker:tasks")}')
     else: 
         context["task"] = task
         return render(request, template, context)
-    
\ No newline at end of file
+
+@login_required
+@require_POST
+def task_bulk(request):
+    """
+    Apply one action to the tasks selected in a list (see `BulkTaskForm`),
+    then go back to the list, whose url is posted as `next`.
+    """
+    next_url = request.POST.get("next")
+    if not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}, require_https=request.is_secure()):
+        next_url = reverse("tracker:tasks")
+
+    form = BulkTaskForm(request.POST, user=request.user)
+    if not form.is_valid():
+        for errors in form.errors.values():
+            messages.error(request, errors[0])
+        return redirect(next_url)
+
+    action = form.cleaned_data["action"]
+    tasks = form.cleaned_data["tasks"]
+    if action == BulkTaskForm.DELETE:
+        job = mark_tasks_deleted(request.user, tasks)
+        # follow the purge's progress, then land back on the list
+        return redirect(f'{reverse("jobs:detail", kwargs={"pk": job.pk})}?{urlencode({"next": next_url})}')
+
+    if action == BulkTaskForm.MOVE:
+        project = form.cleaned_data["project"]
+        changed = move_tasks(request.user, tasks, project)
+        messages.success(request, f"Moved {changed} task{'s' if changed != 1 else ''} to {project.name}.")
+    else:
+        done = action == BulkTaskForm.DONE
+        changed = mark_tasks_done(request.user, tasks, done=done)
+        messages.success(request, f"Marked {changed} task{'s' if changed != 1 else ''} as {'done' if done else 'pending'}.")
+    return redirect(next_url)
+
@@ -0,0 +1,91 @@
+"""
+Cached resolution of the logged in user and their timezone.
+
+The user behind a session is cached for USER_CACHE_TIMEOUT seconds, so most
+requests authenticate without reading the `users_user` row. Entries are
+dropped whenever the user is saved or deleted (see `signals.py`), which covers
+email, password and timezone changes as well as account deletion.
+
+The cache is a file shared by every process on the host, so the password hash
+is kept out of it: entries hold the other fields and the session hash sessions
+are checked against, and the password is loaded from the database on first use
+(password change and account deletion forms).
+"""
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+
+USER_CACHE_TIMEOUT = 60
+
+def user_cache_key(user_id):
+    return f"users:user:{user_id}"
+
+def timezone_cache_key(user_id):
+    return f"users:timezone:{user_id}"
+
+def invalidate_user(user_id):
+    cache.delete_many([user_cache_key(user_id), timezone_cache_key(user_id)])
+
+@lru_cache(maxsize=None)
+def get_zone(name):
+    """Return the ZoneInfo for `name`, built only once per process."""
+    return ZoneInfo(name)
+
+def session_user_id(request):
+    """Return the id of the user logged in the request's session, without loading the user."""
+    return request.session.get(SESSION_KEY)
+
+def get_cached_user(request):
+    if not hasattr(request, "_cached_user"):
+        request._cached_user = _load_user(request)
+    return request._cached_user
+
+def _load_user(request):
+    user_id = session_user_id(request)
+    if user_id is None or request.session.get(BACKEND_SESSION_KEY) not in settings.AUTHENTICATION_BACKENDS:
+        return AnonymousUser()
+
+    entry = cache.get(user_cache_key(user_id))
+    if entry is not None:
+        # the session must still match the cached user's password hash, exactly as in `auth.get_user`
+        session_hash = request.session.get(HASH_SESSION_KEY)
+        if session_hash and constant_time_compare(session_hash, entry["session_hash"]):
+            return _user_from_entry(entry)
+
+    # cache miss or unverified session: take Django's full path, which also handles
+    # fallback secrets and flushes invalid sessions.
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        cache.set(user_cache_key(user.pk), _entry_for_user(user), USER_CACHE_TIMEOUT)
+    return user
+
+def _entry_for_user(user):
+    fields = {field.attname: getattr(user, field.attname) for field in user._meta.concrete_fields if field.attname != "password"}
+    return {"db": user._state.db, "fields": fields, "session_hash": user.get_session_auth_hash()}
+
+def _user_from_entry(entry):
+    # the missing password field is deferred, not blank, so saving the user keeps it
+    fields = entry["fields"]
+    return get_user_model().from_db(entry["db"], list(fields), list(fields.values()))
+
+def get_user_timezone(request):
+    """Return the timezone name of the logged in user, or None for anonymous requests."""
+    user_id = session_user_id(request)
+    if user_id is None:
+        return None
+
+    key = timezone_cache_key(user_id)
+    tzname = cache.get(key)
+    if tzname is None:
+        user = get_cached_user(request)
+        if not user.is_authenticated:
+            return None
+        tzname = user.timezone
+        cache.set(key, tzname, USER_CACHE_TIMEOUT)
+    return tzname
@@ -1,8 +1,26 @@
 from django.contrib.auth.forms import UserCreationForm, UserChangeForm, AuthenticationForm, PasswordChangeForm
 from django.core.exceptions import ValidationError
 from django import forms
+from django.urls import reverse
 from .models import User
 
+class TimezoneInput(forms.TextInput):
+    """
+    Text input with a searchable list of timezones. The options are fetched from
+    `users:timezones`, which the browser caches, instead of rendering ~600
+    <option>s into every page.
+    """
+    template_name = "users/widgets/timezone_input.html"
+
+    def __init__(self, attrs=None):
+        attrs = {"list": "timezone-options", "autocomplete": "off", **(attrs or {})}
+        super().__init__(attrs)
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context["widget"]["options_url"] = reverse("users:timezones")
+        return context
+
 class UserCreationForm(UserCreationForm):
 
     class Meta:
@@ -30,6 +48,7 @@ class RegisterForm(UserCreationForm):
         fields = ['email', 'timezone']
         widgets = {
             'email': forms.EmailInput(attrs={'class': 'form-control'}),
+            'timezone': TimezoneInput(attrs={'class': 'form-control'}),
         }
 
     def clean_email(self):
@@ -116,4 +135,7 @@ class TimezoneUpdateForm(forms.ModelForm):
     class Meta:
         model = User
         fields = ('timezone',)
+        widgets = {
+            'timezone': TimezoneInput(attrs={'class': 'form-control'}),
+        }
         
\ No newline at end of file
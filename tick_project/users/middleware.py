@@ -1,15 +1,26 @@
+from django.contrib.auth.middleware import AuthenticationMiddleware
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+
+from .auth import get_cached_user, get_user_timezone, get_zone
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """`AuthenticationMiddleware` that resolves `request.user` through the user cache."""
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
 
 class TimezoneMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-        user = request.user
-        if user.is_authenticated and user.timezone:
-            timezone.activate(user.timezone)
+        # read the zone from the cache, so requests don't have to load the user for it
+        tzname = get_user_timezone(request)
+        if tzname:
+            timezone.activate(get_zone(tzname))
         else:
             timezone.deactivate()
 
         response = self.get_response(request)
-        return response
\ No newline at end of file
+        return response
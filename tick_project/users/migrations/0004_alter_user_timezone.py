@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:20
+
+import users.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_alter_user_timezone'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='timezone',
+            field=models.CharField(choices=users.models.get_timezone_choices, default='UTC', max_length=50),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from zoneinfo import available_timezones
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.db import models
@@ -6,18 +7,23 @@ from django.utils.translation import gettext_lazy as _
 
 from .managers import CustomUserManager
 
-TIMEZONES_CHOICES = [(tz, tz) for tz in sorted(available_timezones())]
+@lru_cache(maxsize=None)
+def get_timezone_choices():
+    # computed on first use rather than at import: listing the zones walks the whole tzdata tree.
+    return [(tz, tz) for tz in sorted(available_timezones())]
 
 class User(AbstractBaseUser, PermissionsMixin):
     email = models.EmailField("email address", unique=True)
     is_staff = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
     date_joined = models.DateTimeField(default=timezone.now)
+    # set when the account is deleted; its data is purged in the background
+    deleted_at = models.DateTimeField(null=True, blank=True)
 
     timezone = models.CharField(
         max_length=50,
         default="UTC",
-        choices=TIMEZONES_CHOICES,
+        choices=get_timezone_choices,
     )
 
     USERNAME_FIELD = "email"
@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ..auth import user_cache_key
+
+User = get_user_model()
+
+class CachedAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.email = "user@example.com"
+        self.password = "Securepassword123"
+        self.user = User.objects.create_user(email=self.email, password=self.password, timezone="Europe/Paris")
+        self.client.login(email=self.email, password=self.password)
+        self.url = reverse("users:account")
+
+    def get_request_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return [query["sql"] for query in queries.captured_queries]
+
+    def test_repeated_requests_skip_session_and_user_queries(self):
+        # a cold cache reads the session and the user from the database
+        cache.clear()
+        first = self.get_request_queries()
+        second = self.get_request_queries()
+
+        self.assertTrue(any("users_user" in sql for sql in first))
+        self.assertFalse(any("users_user" in sql for sql in second))
+        self.assertFalse(any("django_session" in sql for sql in second))
+        self.assertEqual(len(first) - len(second), 2)
+
+    def test_password_hash_is_not_cached(self):
+        self.get_request_queries()
+        self.assertNotIn(self.user.password, repr(cache.get(user_cache_key(self.user.pk))))
+
+        # the cached user still checks passwords, loading the hash when asked
+        response = self.client.get(self.url)
+        self.assertTrue(response.context["user"].check_password(self.password))
+
+    def test_timezone_is_activated_from_cache(self):
+        self.client.get(self.url)
+        self.assertEqual(timezone.get_current_timezone_name(), "Europe/Paris")
+
+    def test_timezone_update_invalidates_cache(self):
+        self.client.get(self.url)
+        self.client.post(reverse("users:update-timezone"), {"timezone": "America/Sao_Paulo"})
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.context["user"].timezone, "America/Sao_Paulo")
+        self.assertEqual(timezone.get_current_timezone_name(), "America/Sao_Paulo")
+
+    def test_email_update_invalidates_cache(self):
+        self.client.get(self.url)
+        self.client.post(reverse("users:update-email"), {"email": "new@example.com", "password": self.password})
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.context["user"].email, "new@example.com")
+
+    def test_password_change_elsewhere_logs_session_out(self):
+        self.client.get(self.url)
+        self.user.set_password("AnotherPassword123")
+        self.user.save()
+
+        response = self.client.get(self.url)
+        self.assertRedirects(response, f"/users/login/?next={self.url}")
+
+    def test_deleted_user_is_logged_out(self):
+        self.client.get(self.url)
+        self.user.delete()
+
+        response = self.client.get(self.url)
+        self.assertRedirects(response, f"/users/login/?next={self.url}")
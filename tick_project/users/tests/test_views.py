@@ -253,12 +253,26 @@ class UserDeleteViewTests(TestCase):
         response = self.client.post(self.url, {
             "password": self.password
         })
-        # User should no longer exist
-        user_exists = User.objects.filter(pk=self.user.pk).exists()
-        self.assertFalse(user_exists)
+        # User is deactivated right away, its data is purged in the background
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertIsNotNone(self.user.deleted_at)
+        self.assertFalse(self.client.login(email=self.email, password=self.password))
         # Should redirect to index
         self.assertRedirects(response, reverse("tracker:index"))
 
+    def test_post_with_valid_data_logs_out_other_sessions(self):
+        other_client = Client()
+        other_client.login(email=self.email, password=self.password)
+        # caches the logged in user
+        self.assertEqual(other_client.get(reverse("tracker:dashboard")).status_code, 200)
+
+        self.client.login(email=self.email, password=self.password)
+        self.client.post(self.url, {"password": self.password})
+
+        response = other_client.get(reverse("tracker:dashboard"))
+        self.assertRedirects(response, f"{reverse('users:login')}?next={reverse('tracker:dashboard')}")
+
     def test_post_with_invalid_password_shows_error(self):
         self.client.login(email=self.email, password=self.password)
         response = self.client.post(self.url, {
@@ -270,3 +284,19 @@ class UserDeleteViewTests(TestCase):
         # Form should contain an error message for password field
         self.assertIn("password", response.context["form"].errors)
 
+
+class TimezoneOptionsViewTests(TestCase):
+    def setUp(self):
+        self.url = reverse("users:timezones")
+
+    def test_returns_cacheable_list_of_timezones(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("UTC", response.json())
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("max-age", response["Cache-Control"])
+
+    def test_register_page_does_not_render_timezone_options(self):
+        response = self.client.get(reverse("users:register"))
+        self.assertNotContains(response, "<option")
+        self.assertContains(response, f'data-options-url="{self.url}"')
@@ -12,5 +12,6 @@ urlpatterns = [
     path("account/edit_password/", views.user_update_password, name="update-password"),
     path("account/edit_timezone/", views.user_update_timezone, name="update-timezone"),
     path("account/delete/", views.user_delete, name="delete"),
+    path("timezones/", views.timezone_options, name="timezones"),
 
 ]
\ No newline at end of file
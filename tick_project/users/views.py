@@ -1,16 +1,27 @@
+import json
+from functools import lru_cache
 from django.shortcuts import render
+from django.http import HttpResponse
+from django.views.decorators.cache import cache_control
 from django.contrib import messages
 from django.contrib.auth import logout, authenticate, login, get_user_model
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import redirect
 
+from tick_project.page_cache import public_page
+from .models import get_timezone_choices
 from .forms import RegisterForm, EmailAuthenticationForm, EmailUpdateForm, PasswordUpdateForm, UserDeleteForm, TimezoneUpdateForm
 from tracker.models import Project, Session
+from tracker.services.deletion import mark_user_deleted
 
 login_redirect = 'tracker:dashboard'
 logout_redirect = 'tracker:index'
 User = get_user_model()
 
+# the list only changes with the server's tzdata, so browsers may keep it for a day
+TIMEZONE_OPTIONS_MAX_AGE = 60 * 60 * 24
+
+@public_page
 def register(request):
     template = "users/register.html"
 
@@ -31,6 +42,7 @@ def register(request):
         }
         return render(request, template, context)
 
+@public_page
 def login_view(request):
     template = "users/login.html"
     if request.method == "POST":
@@ -132,7 +144,7 @@ def user_delete(request):
         if form.is_valid():
             user = request.user
             logout(request)
-            user.delete()
+            mark_user_deleted(user)
             messages.success(request, "Your account has been deleted.")
             return redirect(logout_redirect)
         else:
@@ -142,5 +154,11 @@ def user_delete(request):
         context["form"] = UserDeleteForm(user=request.user)
 
         return render(request, template, context)
-    
 
+@lru_cache(maxsize=None)
+def _timezone_options_json():
+    return json.dumps([tz for tz, _ in get_timezone_choices()])
+
+@cache_control(public=True, max_age=TIMEZONE_OPTIONS_MAX_AGE)
+def timezone_options(request):
+    return HttpResponse(_timezone_options_json(), content_type="application/json")